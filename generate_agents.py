@@ -3,6 +3,8 @@ import random
 from faker import Faker
 import os
 
+from humaniq.lifestyle import gerar_lifestyle
+
 # Inicializa o Faker
 fake = Faker()
 
@@ -34,8 +36,9 @@ def criar_agente(id_agente):
     genero = random.choice(["Masculino", "Feminino", "Não-binário"])
     nome = fake_local.name_male() if genero == "Masculino" else fake_local.name_female()
 
+    id_funcionario = f"HF{str(id_agente).zfill(3)}"
     agente = {
-        "id_funcionario": f"HF{str(id_agente).zfill(3)}",
+        "id_funcionario": id_funcionario,
         "nome": nome,
         "cargo": random.choice(CARGOS),
         "departamento": random.choice(DEPARTAMENTOS),
@@ -70,6 +73,7 @@ def criar_agente(id_agente):
             "projetos_chave_participados": random.randint(1, 10)
         },
         "objetivos_carreira": fake.sentence(nb_words=10),
+        "lifestyle": gerar_lifestyle(id_funcionario),
         "kpis_ia": {
             "risco_burnout": round(random.uniform(0, 10), 1),
             "engajamento_inferido": round(random.uniform(0, 10), 1),
@@ -0,0 +1,8 @@
+"""
+Núcleo compartilhado da plataforma HumaniQ AI.
+
+Reúne as estruturas de dados e os motores de cálculo reutilizados pelas
+páginas do Streamlit (``pages/``), que permanecem responsáveis apenas pela
+interface. A exceção é ``humaniq.ui``, com os caches e widgets repetidos em
+várias páginas.
+"""
@@ -0,0 +1,404 @@
+"""
+Agregados materializados dos KPIs executivos por departamento e cargo.
+
+Cada funcionário contribui com um vetor de somas e contagens (nota,
+eNPS, metas, Big Five, faixa de risco, classe de fit cultural); os
+agregados de cada grupo são a soma desses vetores. ``AgregadosKPI`` guarda
+a contribuição de cada arquivo de agente (com o mtime) e os agregados em
+``data/cache``: ao atualizar, só arquivos novos, alterados ou removidos
+são relidos, e a contribuição antiga é subtraída e a nova somada nos
+grupos afetados. Médias, percentuais e histogramas saem dos agregados, sem
+percorrer funcionários — o painel executivo carrega O(grupos) dados.
+O objeto é compartilhado entre sessões: atualização e consultas passam por
+uma trava.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from humaniq.performance import extrair_ultima_nota
+
+DIRETORIO_AGENTES = "data/agents"
+ARQUIVO_AGREGADOS = "data/cache/agregados_kpi.json"
+ARQUIVO_CONTRIBUICOES = "data/cache/agregados_kpi_funcionarios.json"
+
+AGRUPAMENTOS = ('departamento', 'cargo')
+GRUPO_GERAL = 'geral'
+
+# Nota usada quando o funcionário não tem avaliações
+NOTA_PADRAO = 7
+
+COLUNAS_BIG_FIVE = [
+    'perfil_big_five.abertura_a_experiencia',
+    'perfil_big_five.conscienciosidade',
+    'perfil_big_five.extroversao',
+    'perfil_big_five.amabilidade',
+    'perfil_big_five.neuroticismo'
+]
+
+# Faixa -> score mínimo (mesmos cortes da página de Turnover)
+FAIXAS_RISCO = {'baixo': 0, 'medio': 30, 'alto': 50, 'critico': 70}
+LIMIAR_EM_RISCO = 50
+
+# Classes fixas do histograma de fit cultural (0-100%)
+BORDAS_FIT = np.linspace(0, 100, 21)
+
+# Score dos top performers do painel: nota * 0.6 + eNPS * 0.4
+PESO_NOTA_TOP = 0.6
+PESO_ENPS_TOP = 0.4
+
+COLUNAS_AGREGADO = (
+    ['n', 'soma_nota', 'soma_enps', 'n_enps', 'soma_metas', 'n_metas']
+    + [f"soma.{coluna}" for coluna in COLUNAS_BIG_FIVE]
+    + [f"n.{coluna}" for coluna in COLUNAS_BIG_FIVE]
+    + [f"risco.{faixa}" for faixa in FAIXAS_RISCO]
+    + ['soma_fit', 'n_fit']
+    + [f"fit.{i}" for i in range(len(BORDAS_FIT) - 1)]
+)
+
+# Métricas derivadas de cada grupo (ver ``derivar_metricas``)
+COLUNAS_METRICAS = (['total', 'performance', 'engajamento', 'metas', 'em_risco',
+                     'percentual_risco', 'fit_cultural']
+                    + [f"risco.{faixa}" for faixa in FAIXAS_RISCO])
+
+
+def _coluna(df_funcionarios, nome, padrao=np.nan):
+    if nome in df_funcionarios:
+        return pd.to_numeric(df_funcionarios[nome], errors='coerce').to_numpy(dtype=float)
+    return np.full(len(df_funcionarios), float(padrao))
+
+
+def pontuar_risco_turnover(df_funcionarios):
+    """
+    Score de risco (0-100) do painel executivo para todos os funcionários.
+
+    Mesmas regras da versão por linha: eNPS, metas, burnout e sentimento.
+    Coluna ausente usa o valor padrão; valor ausente não soma pontos.
+    """
+    enps = _coluna(df_funcionarios, 'engajamento.enps_recente', 5)
+    metas = _coluna(df_funcionarios, 'performance.metas_atingidas_percentual', 85)
+    burnout = _coluna(df_funcionarios, 'kpis_ia.risco_burnout', 5)
+    sentimento = (df_funcionarios['engajamento.comentarios_sentimento'].to_numpy()
+                  if 'engajamento.comentarios_sentimento' in df_funcionarios
+                  else np.full(len(df_funcionarios), 'neutro'))
+
+    with np.errstate(invalid='ignore'):
+        score = (np.select([enps <= 3, enps <= 5], [25, 15], 0)
+                 + np.select([metas <= 70, metas <= 80], [20, 10], 0)
+                 + np.select([burnout >= 8, burnout >= 6], [20, 12], 0)
+                 + np.where(sentimento == 'negativo', 10, 0))
+    return np.minimum(score, 100)
+
+
+def faixa_risco(score):
+    """Índice da faixa de ``FAIXAS_RISCO`` de cada score."""
+    return np.searchsorted(list(FAIXAS_RISCO.values()), score, side='right') - 1
+
+
+def valores_funcionarios(df_funcionarios):
+    """
+    Valores por funcionário que alimentam os agregados.
+
+    DataFrame (mesmo índice) com ``nota``, ``enps``, ``metas``, as colunas
+    Big Five, ``risco``, ``fit`` e ``score_top``.
+    """
+    notas = extrair_ultima_nota(df_funcionarios, NOTA_PADRAO).to_numpy(dtype=float)
+    enps = _coluna(df_funcionarios, 'engajamento.enps_recente')
+    big_five = np.column_stack([_coluna(df_funcionarios, coluna) for coluna in COLUNAS_BIG_FIVE])
+    # Fit individual: média dos traços presentes, em %
+    presentes = np.isfinite(big_five).sum(axis=1)
+    fit = np.nansum(big_five, axis=1) / np.where(presentes > 0, presentes, np.nan) / 10 * 100
+
+    valores = pd.DataFrame(big_five, index=df_funcionarios.index, columns=COLUNAS_BIG_FIVE)
+    valores.insert(0, 'nota', notas)
+    valores.insert(1, 'enps', enps)
+    valores.insert(2, 'metas', _coluna(df_funcionarios, 'performance.metas_atingidas_percentual'))
+    valores['risco'] = pontuar_risco_turnover(df_funcionarios)
+    valores['fit'] = fit
+    valores['score_top'] = notas * PESO_NOTA_TOP + enps * PESO_ENPS_TOP
+    return valores
+
+
+def contribuicoes(valores):
+    """Matriz ``(funcionários, len(COLUNAS_AGREGADO))`` das somas e contagens de cada um."""
+    n = len(valores)
+    big_five = valores[COLUNAS_BIG_FIVE].to_numpy(dtype=float)
+    colunas = [np.ones(n)]
+    for nome in ('nota', 'enps', 'metas'):
+        valor = valores[nome].to_numpy(dtype=float)
+        colunas.append(np.nan_to_num(valor))
+        if nome != 'nota':
+            colunas.append(np.isfinite(valor).astype(float))
+    colunas.extend(np.nan_to_num(big_five).T)
+    colunas.extend(np.isfinite(big_five).astype(float).T)
+
+    faixas = faixa_risco(valores['risco'].to_numpy(dtype=float))
+    colunas.extend((faixas == i).astype(float) for i in range(len(FAIXAS_RISCO)))
+
+    fit = valores['fit'].to_numpy(dtype=float)
+    valido = np.isfinite(fit)
+    colunas.append(np.where(valido, fit, 0.0))
+    colunas.append(valido.astype(float))
+    n_classes = len(BORDAS_FIT) - 1
+    classe = np.clip(np.digitize(np.nan_to_num(fit), BORDAS_FIT) - 1, 0, n_classes - 1)
+    colunas.extend((valido & (classe == i)).astype(float) for i in range(n_classes))
+    return np.column_stack(colunas)
+
+
+def derivar_metricas(agregados):
+    """
+    Métricas derivadas de um DataFrame de agregados (um grupo por linha).
+
+    Colunas (``COLUNAS_METRICAS``): ``total``, ``performance``,
+    ``engajamento``, ``metas``, ``em_risco``, ``percentual_risco``,
+    ``fit_cultural`` (média das médias Big Five, em %) e ``risco.<faixa>``.
+    """
+    n = agregados['n']
+
+    def media(soma, contagem):
+        return (soma / contagem.where(contagem > 0)).astype(float)
+
+    medias_big_five = pd.concat(
+        [media(agregados[f"soma.{coluna}"], agregados[f"n.{coluna}"]) for coluna in COLUNAS_BIG_FIVE],
+        axis=1)
+    faixas_em_risco = [f"risco.{faixa}" for faixa, minimo in FAIXAS_RISCO.items()
+                       if minimo >= LIMIAR_EM_RISCO]
+    em_risco = agregados[faixas_em_risco].sum(axis=1).round().astype(int)
+
+    resultado = pd.DataFrame({
+        'total': n.round().astype(int),
+        'performance': agregados['soma_nota'] / n,
+        'engajamento': media(agregados['soma_enps'], agregados['n_enps']),
+        'metas': media(agregados['soma_metas'], agregados['n_metas']),
+        'em_risco': em_risco,
+        'percentual_risco': em_risco / n * 100,
+        'fit_cultural': medias_big_five.mean(axis=1) / 10 * 100,
+    }, index=agregados.index)
+    for faixa in FAIXAS_RISCO:
+        resultado[f"risco.{faixa}"] = agregados[f"risco.{faixa}"].round().astype(int)
+    return resultado
+
+
+def _nativo(valor):
+    return None if pd.isna(valor) else float(valor)
+
+
+class AgregadosKPI:
+    """KPIs por grupo mantidos incrementalmente a partir dos arquivos de agentes."""
+
+    def __init__(self, diretorio=DIRETORIO_AGENTES, caminho=ARQUIVO_AGREGADOS,
+                 caminho_funcionarios=ARQUIVO_CONTRIBUICOES):
+        self.diretorio = diretorio
+        self.caminho = caminho
+        self.caminho_funcionarios = caminho_funcionarios
+        self.assinatura = None
+        self.grupos = {}
+        self.top_por_cargo = {}
+        # Contribuições por arquivo: lidas só quando algo muda no diretório
+        self.funcionarios = None
+        self._lock = threading.Lock()
+        self._ler()
+
+    # --- Persistência ---
+
+    def _ler(self):
+        if not os.path.exists(self.caminho):
+            return
+        with open(self.caminho, 'r', encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+        # Agregados com outro layout ou de outro diretório: reconstrói
+        if (dados.get('colunas') == COLUNAS_AGREGADO
+                and dados.get('diretorio') == self.diretorio):
+            self.assinatura = dados.get('assinatura')
+            self.grupos = {agrupamento: {grupo: np.asarray(vetor, dtype=float)
+                                         for grupo, vetor in grupos.items()}
+                           for agrupamento, grupos in dados.get('grupos', {}).items()}
+            self.top_por_cargo = dados.get('top_por_cargo', {})
+
+    def _ler_funcionarios(self):
+        self.funcionarios = {}
+        if self.assinatura is not None and os.path.exists(self.caminho_funcionarios):
+            with open(self.caminho_funcionarios, 'r', encoding='utf-8') as arquivo:
+                self.funcionarios = json.load(arquivo)
+        if not self.funcionarios:
+            # Sem as contribuições não há o que subtrair: recomeça do zero
+            self.grupos = {}
+            self.top_por_cargo = {}
+
+    @staticmethod
+    def _gravar(caminho, dados):
+        os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(dados, arquivo, ensure_ascii=False)
+        os.replace(temporario, caminho)
+
+    def _salvar(self):
+        self._gravar(self.caminho_funcionarios, self.funcionarios)
+        self._gravar(self.caminho, {
+            'colunas': COLUNAS_AGREGADO,
+            'diretorio': self.diretorio,
+            'assinatura': self.assinatura,
+            'grupos': {agrupamento: {grupo: vetor.tolist() for grupo, vetor in grupos.items()}
+                       for agrupamento, grupos in self.grupos.items()},
+            'top_por_cargo': self.top_por_cargo,
+        })
+
+    # --- Manutenção incremental ---
+
+    def _varrer(self):
+        if not os.path.isdir(self.diretorio):
+            return {}
+        with os.scandir(self.diretorio) as entradas:
+            return {entrada.name: entrada.stat().st_mtime_ns
+                    for entrada in entradas if entrada.name.endswith('.json')}
+
+    def _somar(self, entrada, sinal):
+        vetor = sinal * np.asarray(entrada['contribuicao'], dtype=float)
+        chaves = {GRUPO_GERAL: GRUPO_GERAL,
+                  **{agrupamento: entrada.get(agrupamento) for agrupamento in AGRUPAMENTOS}}
+        for agrupamento, grupo in chaves.items():
+            grupos = self.grupos.setdefault(agrupamento, {})
+            grupo = str(grupo)
+            grupos[grupo] = grupos.get(grupo, 0) + vetor
+            # Grupo que ficou vazio sai da visão
+            if round(grupos[grupo][0]) <= 0:
+                del grupos[grupo]
+
+    def _recalcular_top(self, cargos):
+        melhores = {}
+        for arquivo, entrada in self.funcionarios.items():
+            cargo = str(entrada.get('cargo'))
+            score = entrada['score_top']
+            if cargo in cargos and score is not None and (
+                    cargo not in melhores or score > melhores[cargo]['score']):
+                melhores[cargo] = {'id': entrada['id'], 'nome': entrada['nome'],
+                                   'score': score, 'arquivo': arquivo}
+        for cargo in cargos:
+            if cargo in melhores:
+                self.top_por_cargo[cargo] = melhores[cargo]
+            else:
+                self.top_por_cargo.pop(cargo, None)
+
+    def atualizar(self):
+        """
+        Aplica aos agregados só o que mudou no diretório; retorna quantos
+        arquivos mudaram. Sem mudanças (mesma assinatura de nomes e mtimes)
+        nada além da varredura do diretório é feito.
+        """
+        with self._lock:
+            return self._atualizar()
+
+    def _atualizar(self):
+        atuais = self._varrer()
+        assinatura = hashlib.sha1(repr(sorted(atuais.items())).encode()).hexdigest()
+        if assinatura == self.assinatura:
+            return 0
+        if self.funcionarios is None:
+            self._ler_funcionarios()
+
+        removidos = [arquivo for arquivo in self.funcionarios if arquivo not in atuais]
+        alterados = sorted(arquivo for arquivo, mtime in atuais.items()
+                           if self.funcionarios.get(arquivo, {}).get('mtime') != mtime)
+
+        # Sai a contribuição antiga de removidos e alterados
+        cargos_sem_top = set()
+        for arquivo in removidos + [a for a in alterados if a in self.funcionarios]:
+            entrada = self.funcionarios.pop(arquivo)
+            self._somar(entrada, -1)
+            cargo = str(entrada.get('cargo'))
+            if self.top_por_cargo.get(cargo, {}).get('arquivo') == arquivo:
+                cargos_sem_top.add(cargo)
+
+        # Entra a contribuição nova dos alterados (lidos e calculados em lote)
+        if alterados:
+            registros = []
+            for arquivo in alterados:
+                with open(os.path.join(self.diretorio, arquivo), 'r', encoding='utf-8') as f:
+                    registros.append(json.load(f))
+            df = pd.json_normalize(registros)
+            df.index = alterados
+            valores = valores_funcionarios(df)
+            matriz = contribuicoes(valores)
+            for i, arquivo in enumerate(alterados):
+                registro = registros[i]
+                entrada = {
+                    'mtime': atuais[arquivo],
+                    'id': registro.get('id_funcionario', os.path.splitext(arquivo)[0]),
+                    'nome': registro.get('nome'),
+                    **{agrupamento: registro.get(agrupamento) for agrupamento in AGRUPAMENTOS},
+                    'score_top': _nativo(valores['score_top'].iloc[i]),
+                    'contribuicao': matriz[i].tolist(),
+                }
+                self.funcionarios[arquivo] = entrada
+                self._somar(entrada, +1)
+
+                cargo = str(entrada.get('cargo'))
+                score = entrada['score_top']
+                atual = self.top_por_cargo.get(cargo)
+                if cargo not in cargos_sem_top and score is not None and (
+                        atual is None or score > atual['score']):
+                    self.top_por_cargo[cargo] = {'id': entrada['id'], 'nome': entrada['nome'],
+                                                 'score': score, 'arquivo': arquivo}
+
+        # Só cargos que perderam o top são recalculados a partir das contribuições
+        if cargos_sem_top:
+            self._recalcular_top(cargos_sem_top)
+
+        self.assinatura = assinatura
+        self._salvar()
+        return len(removidos) + len(alterados)
+
+    # --- Consultas ---
+
+    def agregados(self, agrupamento=GRUPO_GERAL):
+        """Somas e contagens de cada grupo (DataFrame com ``COLUNAS_AGREGADO``)."""
+        with self._lock:
+            return self._agregados(agrupamento)
+
+    def _agregados(self, agrupamento):
+        grupos = self.grupos.get(agrupamento, {})
+        return pd.DataFrame(list(grupos.values()), index=list(grupos),
+                            columns=COLUNAS_AGREGADO, dtype=float).sort_index()
+
+    def metricas(self, agrupamento=GRUPO_GERAL):
+        """Métricas derivadas de cada grupo (ver ``derivar_metricas``)."""
+        with self._lock:
+            agregados = self._agregados(agrupamento)
+        return derivar_metricas(agregados)
+
+    def total(self):
+        with self._lock:
+            geral = self.grupos.get(GRUPO_GERAL, {}).get(GRUPO_GERAL)
+        return 0 if geral is None else int(round(geral[0]))
+
+    def histograma_fit(self, agrupamento=GRUPO_GERAL, grupo=GRUPO_GERAL):
+        """Contagens e bordas das classes de fit cultural de um grupo."""
+        with self._lock:
+            vetor = self.grupos.get(agrupamento, {}).get(grupo)
+        inicio = COLUNAS_AGREGADO.index('fit.0')
+        contagens = (np.zeros(len(BORDAS_FIT) - 1) if vetor is None
+                     else np.round(vetor[inicio:inicio + len(BORDAS_FIT) - 1]))
+        return contagens.astype(int), BORDAS_FIT
+
+    def fit_medio(self, agrupamento=GRUPO_GERAL, grupo=GRUPO_GERAL):
+        """Média do fit cultural individual do grupo (%)."""
+        with self._lock:
+            vetor = self.grupos.get(agrupamento, {}).get(grupo)
+        if vetor is None:
+            return np.nan
+        soma, n = (vetor[COLUNAS_AGREGADO.index(coluna)] for coluna in ('soma_fit', 'n_fit'))
+        return soma / n if n > 0 else np.nan
+
+    def top_performers(self):
+        """Melhor funcionário de cada cargo (``cargo``, ``id``, ``nome``, ``score``), do maior score."""
+        with self._lock:
+            linhas = [{'cargo': cargo, 'id': top['id'], 'nome': top['nome'], 'score': top['score']}
+                      for cargo, top in self.top_por_cargo.items()]
+        return pd.DataFrame(linhas, columns=['cargo', 'id', 'nome', 'score']).sort_values(
+            'score', ascending=False, ignore_index=True)
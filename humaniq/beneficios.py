@@ -0,0 +1,150 @@
+"""
+Otimização de pacotes de benefícios.
+
+Escolher benefícios flexíveis sob um budget é uma mochila 0/1: a seleção
+gulosa por relevância/custo não garante o ótimo. Aqui a mochila é resolvida
+por programação dinâmica sobre o budget discretizado, para toda a força de
+trabalho de uma vez (vetorizado nas linhas), com limite opcional de itens
+por categoria (ex.: no máximo um item de "Bem-estar").
+
+A relevância que alimenta a mochila também é calculada em lote: regras de
+lifestyle viram uma matriz funcionários × benefícios em uma multiplicação.
+"""
+
+from functools import reduce
+from itertools import combinations
+from math import gcd
+
+import numpy as np
+import pandas as pd
+
+# Tamanho máximo da grade de budget; acima disso os custos são arredondados
+# para cima (a solução nunca estoura o budget, com erro limitado a uma unidade
+# por item escolhido)
+MAX_ESTADOS_BUDGET = 4096
+
+# Linhas processadas por bloco na DP (limita a memória das decisões)
+LINHAS_POR_BLOCO = 8192
+
+
+def _unidade_budget(custos, budget, max_estados):
+    """Unidade de discretização: o MDC dos custos, se couber na grade."""
+    inteiros = np.all(np.equal(np.mod(custos, 1), 0)) and float(budget).is_integer()
+    if inteiros:
+        unidade = reduce(gcd, [int(c) for c in custos if c > 0], 0) or 1
+        if budget // unidade + 1 <= max_estados:
+            return unidade
+    return max(budget / (max_estados - 1), 1e-9)
+
+
+def _grupos(categorias, limites):
+    """
+    Agrupa itens por categoria limitada. Cada grupo é uma lista de opções
+    (tuplas de índices de itens); itens sem limite formam grupos unitários.
+    """
+    grupos = []
+    por_categoria = {}
+    for item, categoria in enumerate(categorias):
+        limite = limites.get(categoria) if categoria is not None else None
+        if limite is None:
+            grupos.append([(item,)])
+        else:
+            por_categoria.setdefault(categoria, []).append(item)
+
+    for categoria, itens in por_categoria.items():
+        limite = limites[categoria]
+        if limite <= 0:
+            continue
+        grupos.append([combo for tamanho in range(1, min(limite, len(itens)) + 1)
+                       for combo in combinations(itens, tamanho)])
+    return grupos
+
+
+def otimizar_pacotes_lote(relevancia, custos, budget, categorias=None,
+                          limites_categoria=None, max_estados=MAX_ESTADOS_BUDGET):
+    """
+    Resolve a mochila de benefícios para todas as linhas de ``relevancia``.
+
+    ``relevancia`` é ``(funcionários, itens)``, ``custos`` é ``(itens,)`` e
+    ``budget`` é o valor disponível para itens flexíveis. Retorna
+    ``(selecao, valor_total, custo_total)``, com ``selecao`` booleano
+    ``(funcionários, itens)``.
+    """
+    relevancia = np.atleast_2d(np.asarray(relevancia, dtype=float))
+    custos = np.asarray(custos, dtype=float)
+    n, m = relevancia.shape
+    selecao = np.zeros((n, m), dtype=bool)
+    if n == 0 or m == 0 or budget <= 0:
+        return selecao, np.zeros(n), np.zeros(n)
+
+    unidade = _unidade_budget(custos, budget, max_estados)
+    capacidade = int(np.floor(budget / unidade + 1e-9))
+    pesos = np.ceil(custos / unidade - 1e-9).astype(np.int64)
+
+    grupos = _grupos(categorias or [None] * m, limites_categoria or {})
+    opcoes_grupo = []
+    for opcoes in grupos:
+        itens = [list(opcao) for opcao in opcoes]
+        peso = np.array([pesos[i].sum() for i in itens], dtype=np.int64)
+        viaveis = np.flatnonzero(peso <= capacidade)
+        opcoes_grupo.append(([itens[i] for i in viaveis], peso[viaveis]))
+
+    for inicio in range(0, n, LINHAS_POR_BLOCO):
+        bloco = slice(inicio, min(n, inicio + LINHAS_POR_BLOCO))
+        valores = relevancia[bloco]
+        linhas = np.arange(len(valores))
+
+        # dp[:, b] = melhor relevância com custo <= b unidades
+        dp = np.zeros((len(valores), capacidade + 1))
+        decisoes = []
+        for itens, peso in opcoes_grupo:
+            escolha = np.full(dp.shape, -1, dtype=np.int16)
+            novo = dp.copy()
+            for opcao, (itens_opcao, w) in enumerate(zip(itens, peso)):
+                valor = valores[:, itens_opcao].sum(axis=1)[:, None]
+                candidato = dp[:, :capacidade + 1 - w] + valor
+                melhor = candidato > novo[:, w:]
+                novo[:, w:] = np.where(melhor, candidato, novo[:, w:])
+                escolha[:, w:][melhor] = opcao
+            dp = novo
+            decisoes.append(escolha)
+
+        # Reconstrução vetorizada, do último grupo para o primeiro
+        restante = np.full(len(valores), capacidade)
+        for (itens, peso), escolha in zip(reversed(opcoes_grupo), reversed(decisoes)):
+            opcao = escolha[linhas, restante]
+            for indice in np.unique(opcao[opcao >= 0]):
+                escolhidos = opcao == indice
+                selecao[np.flatnonzero(escolhidos) + inicio,
+                        np.array(itens[indice])[:, None]] = True
+                restante[escolhidos] -= peso[indice]
+
+    valor_total = (relevancia * selecao).sum(axis=1)
+    custo_total = selecao @ custos
+    return selecao, valor_total, custo_total
+
+
+def calcular_matriz_relevancia(perfis, beneficios, regras, base=50):
+    """
+    Relevância (0-100) de cada benefício para cada funcionário em uma passada.
+
+    ``regras`` é uma sequência de ``(condicao, beneficios_afetados, delta)``,
+    onde ``condicao(perfis)`` devolve um vetor booleano por funcionário. As
+    condições viram uma matriz ``(funcionários, regras)`` e os deltas uma
+    matriz ``(regras, benefícios)``; a relevância é ``base + C @ D``.
+    """
+    beneficios = list(beneficios)
+    indice = {beneficio: j for j, beneficio in enumerate(beneficios)}
+    matriz = np.full((len(perfis), len(beneficios)), float(base))
+
+    if regras:
+        condicoes = np.column_stack([np.asarray(condicao(perfis), dtype=float)
+                                     for condicao, _, _ in regras])
+        deltas = np.zeros((len(regras), len(beneficios)))
+        for r, (_, afetados, delta) in enumerate(regras):
+            for beneficio in afetados:
+                if beneficio in indice:
+                    deltas[r, indice[beneficio]] += delta
+        matriz += condicoes @ deltas
+
+    return pd.DataFrame(np.clip(matriz, 0, 100), index=perfis.index, columns=beneficios)
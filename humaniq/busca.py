@@ -0,0 +1,221 @@
+"""
+Busca textual e por facetas de funcionários.
+
+``IndiceBusca`` monta um índice invertido termo -> funcionários sobre nome,
+cargo, departamento, equipe, competências e objetivos de carreira (texto
+sem acentos, em minúsculas). As postings ficam contíguas em layout CSR com
+o vocabulário ordenado, então cada termo da consulta é um prefixo resolvido
+por busca binária — o que serve a um campo de typeahead. As facetas
+(departamento, cargo, equipe, competências) guardam pares
+(funcionário, código do valor) e são contadas com ``bincount`` sobre o
+resultado, sem montar listas completas de funcionários.
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+
+from humaniq.cultura import top_k
+
+# Campo -> peso de um termo encontrado nele
+PESOS_CAMPOS = {
+    'nome': 3.0,
+    'cargo': 2.0,
+    'competencias': 2.0,
+    'departamento': 1.0,
+    'equipe_atual': 1.0,
+    'objetivos_carreira': 0.5,
+}
+
+FACETAS = ('departamento', 'cargo', 'equipe_atual', 'competencias')
+
+# Fator do peso quando o termo só começa com o prefixo digitado
+PESO_PREFIXO = 0.5
+
+LIMITE_RESULTADOS = 20
+
+
+def normalizar(texto):
+    """Termos de um texto: minúsculas, sem acentos, só letras e dígitos (qualquer alfabeto)."""
+    if texto is None or (isinstance(texto, float) and np.isnan(texto)):
+        return []
+    if isinstance(texto, (list, tuple, set)):
+        texto = ' '.join(str(item) for item in texto)
+    decomposto = unicodedata.normalize('NFKD', str(texto).lower())
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return re.findall(r'[^\W_]+', sem_acentos)
+
+
+def _valores(valor):
+    # Faceta multivalorada (lista) ou simples; ausências não contam
+    if isinstance(valor, (list, tuple, set)):
+        return list(dict.fromkeys(v for v in valor if v is not None))
+    if valor is None or (isinstance(valor, float) and np.isnan(valor)):
+        return []
+    return [valor]
+
+
+class IndiceBusca:
+    """Índice invertido com prefixos e contagem de facetas."""
+
+    def __init__(self, ids, registros, pesos=PESOS_CAMPOS, facetas=FACETAS):
+        registros = list(registros)
+        self.ids = np.asarray(list(ids), dtype=object)
+        self.nomes = [registro.get('nome') for registro in registros]
+        self.cargos = [registro.get('cargo') for registro in registros]
+        self._posicao = {id_funcionario: i for i, id_funcionario in enumerate(self.ids)}
+
+        # --- Postings ---
+        termos_ids = {}
+        linhas, termos, pesos_postings = [], [], []
+        for linha, registro in enumerate(registros):
+            pesos_linha = {}
+            for campo, peso in pesos.items():
+                for termo in normalizar(registro.get(campo)):
+                    # Termo repetido no registro: vale o campo de maior peso
+                    if pesos_linha.get(termo, 0) < peso:
+                        pesos_linha[termo] = peso
+            for termo, peso in pesos_linha.items():
+                linhas.append(linha)
+                termos.append(termos_ids.setdefault(termo, len(termos_ids)))
+                pesos_postings.append(peso)
+
+        # Vocabulário ordenado: prefixos viram um intervalo contíguo
+        vocabulario = sorted(termos_ids)
+        self.vocabulario = np.asarray(vocabulario, dtype=str)
+        nova_ordem = np.empty(len(termos_ids), dtype=np.int64)
+        nova_ordem[[termos_ids[termo] for termo in vocabulario]] = np.arange(len(vocabulario))
+
+        termos = nova_ordem[np.asarray(termos, dtype=np.int64)]
+        ordem = np.argsort(termos, kind='stable')
+        self._linhas = np.asarray(linhas, dtype=np.int64)[ordem]
+        self._pesos = np.asarray(pesos_postings, dtype=float)[ordem]
+        contagens = np.bincount(termos, minlength=len(vocabulario))
+        self._inicio = np.concatenate([[0], np.cumsum(contagens)])
+
+        # --- Facetas: pares (linha, código do valor) ---
+        self.facetas = {}
+        for faceta in facetas:
+            codigos_valor = {}
+            pares_linha, pares_codigo = [], []
+            for linha, registro in enumerate(registros):
+                for valor in _valores(registro.get(faceta)):
+                    pares_linha.append(linha)
+                    pares_codigo.append(codigos_valor.setdefault(valor, len(codigos_valor)))
+            self.facetas[faceta] = (
+                list(codigos_valor),
+                np.asarray(pares_linha, dtype=np.int64),
+                np.asarray(pares_codigo, dtype=np.int64),
+            )
+
+    @classmethod
+    def de_dataframe(cls, df_funcionarios, **kwargs):
+        """Índice de um DataFrame de funcionários (ids = índice do DataFrame)."""
+        colunas = [coluna for coluna in set(PESOS_CAMPOS) | set(FACETAS)
+                   if coluna in df_funcionarios]
+        return cls(df_funcionarios.index, df_funcionarios[colunas].to_dict('records'), **kwargs)
+
+    @classmethod
+    def de_indice_agentes(cls, indice, **kwargs):
+        """Índice das entradas de um ``IndiceAgentes`` (sem ler os arquivos)."""
+        entradas = indice.entradas()
+        return cls(entradas, entradas.values(), **kwargs)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, id_funcionario):
+        return id_funcionario in self._posicao
+
+    def rotulo(self, id_funcionario):
+        """Texto para seletores: ``Nome (Cargo)``."""
+        linha = self._posicao[id_funcionario]
+        return f"{self.nomes[linha]} ({self.cargos[linha]})"
+
+    def _intervalo(self, prefixo):
+        inicio = np.searchsorted(self.vocabulario, prefixo, side='left')
+        fim = np.searchsorted(self.vocabulario, prefixo + '\U0010ffff', side='left')
+        return int(inicio), int(fim)
+
+    def pontuar(self, consulta):
+        """
+        Score de cada funcionário para a consulta, ou ``None`` se ela é vazia.
+
+        Cada termo da consulta é um prefixo; um funcionário precisa casar
+        todos os termos (score 0 caso contrário). Termo completo vale o peso
+        do campo, termo só por prefixo vale ``PESO_PREFIXO`` dele.
+        """
+        termos = normalizar(consulta)
+        if not termos:
+            return None
+        score = np.zeros(len(self.ids))
+        casou_todos = np.ones(len(self.ids), dtype=bool)
+        for termo in dict.fromkeys(termos):
+            inicio, fim = self._intervalo(termo)
+            if inicio == fim:
+                return np.zeros(len(self.ids))
+            de, ate = self._inicio[inicio], self._inicio[fim]
+            linhas = self._linhas[de:ate]
+            pesos = self._pesos[de:ate].copy()
+            # Postings do termo exato (se existir) são o primeiro bloco do intervalo
+            if self.vocabulario[inicio] == termo:
+                pesos[self._inicio[inicio + 1] - de:] *= PESO_PREFIXO
+            else:
+                pesos *= PESO_PREFIXO
+            score_termo = np.bincount(linhas, weights=pesos, minlength=len(self.ids))
+            casou_todos &= score_termo > 0
+            score += score_termo
+        return np.where(casou_todos, score, 0.0)
+
+    def _mascara_faceta(self, faceta, valores):
+        nomes, linhas, codigos = self.facetas[faceta]
+        valores = set(valores)
+        selecionados = [i for i, nome in enumerate(nomes) if nome in valores]
+        mascara = np.zeros(len(self.ids), dtype=bool)
+        mascara[linhas[np.isin(codigos, selecionados)]] = True
+        return mascara
+
+    def contar_facetas(self, mascara, faceta):
+        """``{valor: funcionários}`` da faceta entre as linhas de ``mascara``, do maior para o menor."""
+        nomes, linhas, codigos = self.facetas[faceta]
+        contagens = np.bincount(codigos[mascara[linhas]], minlength=len(nomes))
+        ordem = np.argsort(-contagens, kind='stable')
+        return {nomes[i]: int(contagens[i]) for i in ordem if contagens[i] > 0}
+
+    def buscar(self, consulta='', filtros=None, limite=LIMITE_RESULTADOS):
+        """
+        Funcionários que casam com a consulta e com os filtros de facetas.
+
+        ``filtros`` mapeia faceta -> valores aceitos (OU dentro da faceta, E
+        entre facetas). Retorna ``{'ids', 'total', 'facetas'}``: os
+        ``limite`` ids mais relevantes (sem consulta, na ordem do índice), o
+        total de resultados e as contagens de cada faceta — cada uma contada
+        com os demais filtros aplicados, para mostrar quantos resultados cada
+        valor daria.
+        """
+        filtros = {faceta: valores for faceta, valores in (filtros or {}).items()
+                   if valores and faceta in self.facetas}
+        score = self.pontuar(consulta)
+        por_texto = np.ones(len(self.ids), dtype=bool) if score is None else score > 0
+        mascaras = {faceta: self._mascara_faceta(faceta, valores)
+                    for faceta, valores in filtros.items()}
+
+        mascara = por_texto.copy()
+        for mascara_faceta in mascaras.values():
+            mascara &= mascara_faceta
+
+        contagens = {}
+        for faceta in self.facetas:
+            base = por_texto.copy()
+            for outra, mascara_faceta in mascaras.items():
+                if outra != faceta:
+                    base &= mascara_faceta
+            contagens[faceta] = self.contar_facetas(base, faceta)
+
+        posicoes = top_k(np.zeros(len(self.ids)) if score is None else score, limite, mascara)
+        return {
+            'ids': self.ids[posicoes].tolist(),
+            'total': int(mascara.sum()),
+            'facetas': contagens,
+        }
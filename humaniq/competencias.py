@@ -0,0 +1,238 @@
+"""
+Vocabulário de competências e codificação em bitsets.
+
+Cada competência (``"Python"``, ``"Gestão de Projetos"``, ...) é internada
+em um id inteiro e o conjunto de competências de cada funcionário vira um
+bitset de largura fixa em palavras ``uint64``. Conjuntos de requisitos
+(vagas, cargos) usam a mesma codificação, de modo que match, gaps e
+cobertura viram operações AND/popcount vetorizadas sobre toda a força de
+trabalho. Para consultas por competência (quem tem, quantos têm) há também
+um índice invertido competência -> funcionários.
+"""
+
+import numpy as np
+
+BITS_POR_PALAVRA = 64
+
+# Tabela de popcount por byte, usada quando np.bitwise_count não existe (numpy < 2.0)
+_POPCOUNT_BYTE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def contar_bits(bits):
+    """Popcount somado ao longo do último eixo (palavras) de um array uint64."""
+    bits = np.ascontiguousarray(bits, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+    por_byte = _POPCOUNT_BYTE[bits.view(np.uint8)]
+    return por_byte.reshape(bits.shape[:-1] + (-1,)).sum(axis=-1, dtype=np.int64)
+
+
+class VocabularioSkills:
+    """Interna nomes de competências em ids inteiros estáveis."""
+
+    def __init__(self, skills=()):
+        self._ids = {}
+        self._nomes = []
+        for skill in skills:
+            self.id_de(skill)
+
+    def __len__(self):
+        return len(self._nomes)
+
+    def __contains__(self, skill):
+        return skill in self._ids
+
+    def __iter__(self):
+        return iter(self._nomes)
+
+    @property
+    def n_palavras(self):
+        return max(1, -(-len(self._nomes) // BITS_POR_PALAVRA))
+
+    def id_de(self, skill):
+        """Retorna o id da competência, registrando-a se for nova."""
+        skill_id = self._ids.get(skill)
+        if skill_id is None:
+            skill_id = len(self._nomes)
+            self._ids[skill] = skill_id
+            self._nomes.append(skill)
+        return skill_id
+
+    def nome(self, skill_id):
+        return self._nomes[skill_id]
+
+    def registrar(self, listas):
+        """Registra todas as competências de uma sequência de listas."""
+        for skills in listas:
+            if isinstance(skills, (list, tuple, set)):
+                for skill in skills:
+                    self.id_de(skill)
+        return self
+
+    # --- Codificação ---
+
+    def codificar(self, skills, n_palavras=None):
+        """Codifica um conjunto de requisitos em um vetor ``uint64``.
+
+        Competências fora do vocabulário são registradas antes da codificação;
+        informe ``n_palavras`` para manter a largura de uma matriz existente.
+        """
+        ids = [self.id_de(skill) for skill in skills]
+        n_palavras = n_palavras or self.n_palavras
+        vetor = np.zeros(max(n_palavras, self.n_palavras), dtype=np.uint64)
+        for skill_id in ids:
+            vetor[skill_id // BITS_POR_PALAVRA] |= np.uint64(
+                1 << (skill_id % BITS_POR_PALAVRA))
+        return vetor
+
+    def codificar_lote(self, listas):
+        """Codifica uma sequência de listas em uma matriz ``(n, n_palavras)``."""
+        listas = [skills if isinstance(skills, (list, tuple, set)) else ()
+                  for skills in listas]
+        self.registrar(listas)
+
+        linhas, ids = [], []
+        for linha, skills in enumerate(listas):
+            for skill in skills:
+                linhas.append(linha)
+                ids.append(self._ids[skill])
+
+        matriz = np.zeros((len(listas), self.n_palavras), dtype=np.uint64)
+        if ids:
+            ids = np.asarray(ids, dtype=np.int64)
+            mascaras = np.left_shift(np.uint64(1),
+                                     (ids % BITS_POR_PALAVRA).astype(np.uint64))
+            np.bitwise_or.at(matriz, (np.asarray(linhas), ids // BITS_POR_PALAVRA),
+                             mascaras)
+        return matriz
+
+    # --- Decodificação ---
+
+    def para_indicadores(self, bits):
+        """Expande bitsets ``(..., n_palavras)`` em booleanos ``(..., len(vocabulário))``."""
+        bits = np.ascontiguousarray(bits, dtype='<u8')
+        bytes_ = bits.view(np.uint8).reshape(bits.shape[:-1] + (-1,))
+        indicadores = np.unpackbits(bytes_, axis=-1, bitorder='little')
+        return indicadores[..., :len(self._nomes)].astype(bool)
+
+    def decodificar(self, vetor):
+        """Converte um bitset de volta para a lista de nomes de competências."""
+        return [self._nomes[i] for i in np.flatnonzero(self.para_indicadores(vetor))]
+
+
+class BaseSkills:
+    """Matriz de competências de toda a força de trabalho em bitsets."""
+
+    def __init__(self, ids, bits, vocabulario):
+        self.ids = list(ids)
+        self.bits = bits
+        self.vocabulario = vocabulario
+
+    @classmethod
+    def de_listas(cls, ids, listas, vocabulario=None):
+        vocabulario = vocabulario or VocabularioSkills()
+        bits = vocabulario.codificar_lote(list(listas))
+        return cls(ids, bits, vocabulario)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def requisito(self, skills):
+        """Codifica um conjunto de requisitos na largura desta base."""
+        vetor = self.vocabulario.codificar(skills, self.bits.shape[1])
+        if vetor.shape[0] > self.bits.shape[1]:
+            # Requisito trouxe competências novas: alarga a matriz com zeros
+            extra = vetor.shape[0] - self.bits.shape[1]
+            self.bits = np.pad(self.bits, ((0, 0), (0, extra)))
+        return vetor
+
+    def contar_match(self, requisito):
+        """Quantidade de competências do requisito que cada funcionário possui."""
+        return contar_bits(self.bits & requisito)
+
+    def percentual_match(self, skills):
+        """Percentual (0-100) do requisito coberto por funcionário; 100 se vazio."""
+        requisito = self.requisito(skills)
+        total = int(contar_bits(requisito))
+        if total == 0:
+            return np.full(len(self.ids), 100.0)
+        return self.contar_match(requisito) * 100.0 / total
+
+    def gaps(self, requisito):
+        """Bitsets das competências do requisito que faltam a cada funcionário."""
+        return requisito & ~self.bits
+
+    def cobertura(self, linhas=None):
+        """Número de funcionários que possuem cada competência do vocabulário."""
+        bits = self.bits if linhas is None else self.bits[linhas]
+        return self.vocabulario.para_indicadores(bits).sum(axis=0)
+
+
+class IndiceSkills:
+    """
+    Índice invertido competência -> funcionários.
+
+    As posições dos titulares de cada competência ficam contíguas em um único
+    array (layout CSR, ordenado por id da competência), com as contagens já
+    calculadas: cobertura e existência são O(1) e a lista de titulares é
+    O(titulares), sem varrer a força de trabalho.
+    """
+
+    def __init__(self, ids, listas, vocabulario=None):
+        self.ids = np.asarray(list(ids), dtype=object)
+        self.vocabulario = vocabulario or VocabularioSkills()
+
+        linhas, skill_ids = [], []
+        for linha, skills in enumerate(listas):
+            if isinstance(skills, (list, tuple, set)):
+                # Competência repetida no registro conta uma vez
+                for skill in dict.fromkeys(skills):
+                    linhas.append(linha)
+                    skill_ids.append(self.vocabulario.id_de(skill))
+
+        skill_ids = np.asarray(skill_ids, dtype=np.int64)
+        ordem = np.argsort(skill_ids, kind='stable')
+        self._posicoes = np.asarray(linhas, dtype=np.int64)[ordem]
+        self.contagens = np.bincount(skill_ids, minlength=len(self.vocabulario))
+        self._inicio = np.concatenate([[0], np.cumsum(self.contagens)])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, skill):
+        return self.contagem(skill) > 0
+
+    def _id(self, skill):
+        # Consulta sem registrar: competências desconhecidas não alargam o índice
+        if skill not in self.vocabulario:
+            return None
+        skill_id = self.vocabulario.id_de(skill)
+        return skill_id if skill_id < len(self.contagens) else None
+
+    def contagem(self, skill):
+        """Número de funcionários com a competência."""
+        skill_id = self._id(skill)
+        return 0 if skill_id is None else int(self.contagens[skill_id])
+
+    def posicoes(self, skill):
+        """Posições (linhas) dos titulares da competência, em ordem crescente."""
+        skill_id = self._id(skill)
+        if skill_id is None:
+            return self._posicoes[:0]
+        return self._posicoes[self._inicio[skill_id]:self._inicio[skill_id + 1]]
+
+    def titulares(self, skill):
+        """Ids dos funcionários com a competência."""
+        return self.ids[self.posicoes(skill)]
+
+    def pontuar(self, pesos):
+        """
+        Soma, por funcionário, dos pesos das competências que possui.
+
+        ``pesos`` mapeia competência -> peso; o custo é proporcional ao total
+        de titulares das competências pesadas.
+        """
+        score = np.zeros(len(self.ids))
+        for skill, peso in pesos.items():
+            score[self.posicoes(skill)] += peso
+        return score
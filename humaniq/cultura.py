@@ -0,0 +1,202 @@
+"""
+Perfil cultural (Hofstede) derivado do Big Five.
+
+O mapeamento Big Five -> Hofstede usado na página de Cultural Fit é linear
+com saturação em [1, 10], então ele é expresso como uma matriz 5 × 6 mais um
+intercepto: ``clip(B @ W + b, 1, 10)`` sobre a matriz Big Five de toda a
+força de trabalho, sem percorrer linhas. Os scores de influência e de
+resistência à mudança usam as mesmas colunas e também são vetorizados.
+"""
+
+import numpy as np
+import pandas as pd
+
+from humaniq.performance import ultima_nota
+
+# Ordem das colunas da matriz Big Five (chaves achatadas do json_normalize)
+COLUNAS_BIG_FIVE = (
+    'perfil_big_five.abertura_a_experiencia',
+    'perfil_big_five.conscienciosidade',
+    'perfil_big_five.extroversao',
+    'perfil_big_five.amabilidade',
+    'perfil_big_five.neuroticismo',
+)
+
+DIMENSOES_CULTURAIS = (
+    'distancia_poder', 'individualismo', 'masculinidade',
+    'aversao_incerteza', 'orientacao_temporal', 'indulgencia',
+)
+
+# Linhas: abertura, conscienciosidade, extroversão, amabilidade, neuroticismo
+# Colunas: DIMENSOES_CULTURAIS
+PESOS_HOFSTEDE = np.array([
+    [0.0, 0.2, 0.0, 0.0, 0.3, 0.2],
+    [0.0, 0.0, 0.5, 0.4, 1.0, 0.0],
+    [-0.5, 1.0, 1.0, 0.0, 0.0, 0.4],
+    [-1.0, -0.3, -0.3, 0.0, 0.0, 0.0],
+    [0.0, 0.0, 0.0, 1.0, 0.0, -1.0],
+])
+INTERCEPTO_HOFSTEDE = np.array([15.0, 3.0, 3.0, 0.0, 0.0, 10.0])
+
+
+def matriz_big_five(df_funcionarios, padrao=5):
+    """Matriz ``(funcionários, 5)`` do Big Five; ausências viram ``padrao``."""
+    colunas = [df_funcionarios[coluna].to_numpy(dtype=float, na_value=np.nan)
+               if coluna in df_funcionarios else np.full(len(df_funcionarios), np.nan)
+               for coluna in COLUNAS_BIG_FIVE]
+    matriz = np.column_stack(colunas) if colunas else np.empty((0, 5))
+    return np.where(np.isnan(matriz), float(padrao), matriz)
+
+
+def mapear_hofstede(big_five):
+    """Dimensões de Hofstede ``(..., 6)`` a partir de Big Five ``(..., 5)``."""
+    big_five = np.asarray(big_five, dtype=float)
+    return np.clip(big_five @ PESOS_HOFSTEDE + INTERCEPTO_HOFSTEDE, 1, 10)
+
+
+def calcular_hofstede(df_funcionarios):
+    """Colunas Hofstede de cada funcionário (mesmo índice de ``df_funcionarios``)."""
+    return pd.DataFrame(mapear_hofstede(matriz_big_five(df_funcionarios)),
+                        index=df_funcionarios.index, columns=list(DIMENSOES_CULTURAIS))
+
+
+def perfis_culturais(df_funcionarios, agrupamentos=('departamento', 'equipe_atual')):
+    """
+    Perfil médio da organização e de cada grupo em uma passada.
+
+    Retorna ``(hofstede, perfil_medio, por_grupo)``: as colunas por
+    funcionário, a média organizacional (``pd.Series``) e, para cada coluna
+    de ``agrupamentos`` presente, a média por grupo com a contagem em ``n``.
+    """
+    hofstede = calcular_hofstede(df_funcionarios)
+    por_grupo = {}
+    for coluna in agrupamentos:
+        if coluna not in df_funcionarios:
+            continue
+        grupos = hofstede.groupby(df_funcionarios[coluna].to_numpy())
+        perfil = grupos.mean()
+        perfil['n'] = grupos.size()
+        por_grupo[coluna] = perfil
+    return hofstede, hofstede.mean(), por_grupo
+
+
+# --- Influência e resistência ---
+
+# Fatores de resistência independentes da mudança desejada: (rótulo, pontos)
+FATORES_RESISTENCIA = (
+    ('Baixa abertura a experiências', 25),
+    ('Alto nível de ansiedade', 20),
+    ('Funcionário muito experiente', 15),
+    ('Baixo engajamento', 20),
+    ('Performance abaixo da média', 20),
+)
+
+# Pontos por dimensão que já está no extremo pretendido pela mudança
+PONTOS_DIMENSAO_EXTREMA = 10
+
+
+def extrair_caracteristicas(df_funcionarios, hofstede=None):
+    """
+    Colunas compartilhadas pelos scores de influência e resistência.
+
+    Big Five, tempo de casa, última nota, eNPS, nível do cargo e as
+    dimensões Hofstede de cada funcionário, com os mesmos padrões usados
+    pelas funções linha a linha.
+    """
+    def coluna(nome, padrao):
+        if nome in df_funcionarios:
+            return df_funcionarios[nome].fillna(padrao).to_numpy(dtype=float)
+        return np.full(len(df_funcionarios), float(padrao))
+
+    if 'performance.avaliacoes_desempenho' in df_funcionarios:
+        notas = [ultima_nota(avaliacoes, 7) for avaliacoes
+                 in df_funcionarios['performance.avaliacoes_desempenho'].tolist()]
+    else:
+        notas = [7] * len(df_funcionarios)
+    cargos = (df_funcionarios['cargo'].fillna('').astype(str)
+              if 'cargo' in df_funcionarios else pd.Series('', index=df_funcionarios.index))
+
+    big_five = matriz_big_five(df_funcionarios)
+    if hofstede is None:
+        hofstede = calcular_hofstede(df_funcionarios)
+
+    caracteristicas = pd.DataFrame({
+        'tempo_casa': coluna('tempo_de_casa_meses', 12),
+        'nota': np.asarray(notas, dtype=float),
+        'abertura': big_five[:, 0],
+        'extroversao': big_five[:, 2],
+        'amabilidade': big_five[:, 3],
+        'neuroticismo': big_five[:, 4],
+        'enps': coluna('engajamento.enps_recente', 5),
+        'gerente': cargos.str.contains('Gerente', regex=False).to_numpy(),
+        'analista': cargos.str.contains('Analista', regex=False).to_numpy(),
+    }, index=df_funcionarios.index)
+    return pd.concat([caracteristicas, hofstede[list(DIMENSOES_CULTURAIS)]], axis=1)
+
+
+def pontuar_influencia(caracteristicas):
+    """Score de influência cultural (0-100) de cada funcionário."""
+    c = caracteristicas
+    hierarquia = np.where(c['gerente'], 15, np.where(c['analista'], 5, 10))
+    return (np.minimum(c['tempo_casa'].to_numpy() / 36, 1) * 25 +
+            c['nota'].to_numpy() / 10 * 20 +
+            c['extroversao'].to_numpy() / 10 * 15 +
+            c['amabilidade'].to_numpy() / 10 * 10 +
+            c['enps'].to_numpy() / 10 * 15 +
+            hierarquia)
+
+
+def fatores_resistencia(caracteristicas):
+    """Matriz booleana ``(funcionários, FATORES_RESISTENCIA)``."""
+    c = caracteristicas
+    return np.column_stack([
+        c['abertura'].to_numpy() < 4,
+        c['neuroticismo'].to_numpy() > 7,
+        c['tempo_casa'].to_numpy() > 48,
+        c['enps'].to_numpy() < 4,
+        c['nota'].to_numpy() < 6,
+    ])
+
+
+def pontuar_resistencia(caracteristicas, mudanca_desejada, fatores=None):
+    """
+    Score de resistência à mudança de cada funcionário.
+
+    ``mudanca_desejada`` mapeia dimensão -> ``'aumentar'``/``'diminuir'``.
+    Retorna ``(score, fatores, extremos)``: ``fatores`` como em
+    ``fatores_resistencia`` (pode ser passado pré-calculado) e ``extremos``
+    um dict dimensão -> vetor booleano de quem já está no extremo pedido.
+    """
+    if fatores is None:
+        fatores = fatores_resistencia(caracteristicas)
+    pontos = np.array([p for _, p in FATORES_RESISTENCIA], dtype=float)
+    score = fatores @ pontos
+
+    extremos = {}
+    for dimensao, direcao in mudanca_desejada.items():
+        valores = caracteristicas[dimensao].to_numpy()
+        if direcao == 'aumentar':
+            extremos[dimensao] = valores > 8
+        elif direcao == 'diminuir':
+            extremos[dimensao] = valores < 3
+        else:
+            continue
+        score = score + extremos[dimensao] * PONTOS_DIMENSAO_EXTREMA
+    return score, fatores, extremos
+
+
+def top_k(scores, k, mascara=None):
+    """
+    Índices dos ``k`` maiores scores em ordem decrescente (empates pela
+    posição), selecionados com argpartition em vez de ordenar tudo.
+    """
+    scores = np.asarray(scores, dtype=float)
+    candidatos = np.arange(len(scores)) if mascara is None else np.flatnonzero(mascara)
+    if k <= 0 or len(candidatos) == 0:
+        return candidatos[:0]
+    if len(candidatos) > k:
+        negativos = -scores[candidatos]
+        corte = negativos[np.argpartition(negativos, k - 1)[k - 1]]
+        candidatos = candidatos[negativos <= corte]
+    ordem = np.lexsort((candidatos, -scores[candidatos]))
+    return candidatos[ordem][:k]
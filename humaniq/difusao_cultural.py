@@ -0,0 +1,143 @@
+"""
+Simulação baseada em agentes da difusão cultural.
+
+Cada funcionário carrega seu vetor Hofstede (6 dimensões) e, a cada mês,
+aproxima-se da média ponderada dos seus vizinhos no grafo de influência. O
+grafo liga cada pessoa a colegas sorteados da mesma equipe e a alguns
+contatos fora dela; o peso de cada aresta é o score de influência do
+vizinho. Um passo é um produto esparso ``W @ X``, com as réplicas de um
+cenário empilhadas em colunas para que uma única multiplicação avance todas
+elas.
+"""
+
+import numpy as np
+from scipy import sparse
+
+from humaniq.paralelo import executar_blocos
+
+PERCENTIS = (5, 50, 95)
+
+# Réplicas avançadas juntas em cada bloco (colunas de X)
+REPLICAS_POR_BLOCO = 8
+
+# Fração da distância até a vizinhança percorrida por mês (suscetibilidade 1)
+TAXA_INFLUENCIA_PARES = 0.1
+
+
+def grafo_influencia(grupos, pesos, vizinhos_grupo=8, vizinhos_globais=1, semente=0):
+    """
+    Matriz esparsa ``(n, n)`` de influência, normalizada por linha.
+
+    Cada funcionário recebe ``vizinhos_grupo`` colegas sorteados do próprio
+    grupo (ex.: departamento + equipe) e ``vizinhos_globais`` contatos de
+    qualquer grupo. ``W[i, j]`` é proporcional a ``pesos[j]``.
+    """
+    grupos = np.asarray(grupos)
+    pesos = np.maximum(np.asarray(pesos, dtype=float), 1e-9)
+    n = len(grupos)
+    if n < 2:
+        return sparse.csr_matrix((n, n))
+    rng = np.random.default_rng(semente)
+
+    # Membros de cada grupo contíguos: vizinho = posição aleatória no bloco do grupo
+    _, codigos = np.unique(grupos, return_inverse=True)
+    ordem = np.argsort(codigos, kind='stable')
+    tamanhos = np.bincount(codigos)
+    inicio = np.concatenate([[0], np.cumsum(tamanhos)[:-1]])
+
+    origem = np.repeat(np.arange(n), vizinhos_grupo)
+    tamanho = tamanhos[codigos[origem]]
+    sorteio = (rng.random(len(origem)) * tamanho).astype(np.int64)
+    destino = ordem[inicio[codigos[origem]] + sorteio]
+
+    origem_global = np.repeat(np.arange(n), vizinhos_globais)
+    destino_global = rng.integers(0, n, len(origem_global))
+
+    origem = np.concatenate([origem, origem_global])
+    destino = np.concatenate([destino, destino_global])
+    sem_laco = origem != destino
+    origem, destino = origem[sem_laco], destino[sem_laco]
+
+    grafo = sparse.csr_matrix((pesos[destino], (origem, destino)), shape=(n, n))
+    grafo.sum_duplicates()
+    soma = np.asarray(grafo.sum(axis=1)).ravel()
+    inverso = np.divide(1.0, soma, out=np.zeros_like(soma), where=soma > 0)
+    # Quem ficou sem vizinhos mantém o próprio perfil (laço com peso 1)
+    return (sparse.diags(inverso) @ grafo + sparse.diags((soma == 0).astype(float))).tocsr()
+
+
+def _simular_bloco(perfis, grafo, suscetibilidade, cenario, meses, n_replicas,
+                   ruido_individual, ruido_comum, semente):
+    """Média organizacional ``(meses + 1, réplicas, 6)`` de um bloco de réplicas."""
+    rng = np.random.default_rng(semente)
+    n, d = perfis.shape
+    deriva = np.asarray(cenario.get('deriva', np.zeros(d)), dtype=np.float32)
+    alvo = cenario.get('alvo')
+    intensidade = float(cenario.get('intensidade', 0.0))
+
+    alfa = (TAXA_INFLUENCIA_PARES * suscetibilidade).astype(np.float32)[:, None, None]
+    puxao = (intensidade * suscetibilidade).astype(np.float32)[:, None, None]
+    if alvo is not None:
+        alvo = np.asarray(alvo, dtype=np.float32)[None, :, None]
+
+    x = np.repeat(perfis.astype(np.float32)[:, :, None], n_replicas, axis=2)
+    medias = np.empty((meses + 1, n_replicas, d))
+    medias[0] = x.mean(axis=0).T
+    ruido = np.empty_like(x) if ruido_individual else None
+    for mes in range(1, meses + 1):
+        # Operações in-place: x tem n × 6 × réplicas elementos
+        passo = (grafo @ x.reshape(n, -1)).reshape(n, d, n_replicas)
+        passo -= x
+        passo *= alfa
+        passo += deriva[None, :, None]
+        if alvo is not None and intensidade:
+            passo += puxao * (alvo - x)
+        if ruido is not None:
+            rng.standard_normal(out=ruido, dtype=np.float32)
+            ruido *= ruido_individual
+            passo += ruido
+        if ruido_comum:
+            passo += ruido_comum * rng.standard_normal((1, d, n_replicas), dtype=np.float32)
+        x += passo
+        np.clip(x, 1, 10, out=x)
+        medias[mes] = x.mean(axis=0).T
+    return medias
+
+
+def simular_cenarios(perfis, grafo, suscetibilidade, cenarios, meses=24, replicas=32,
+                     ruido_individual=0.2, ruido_comum=0.1, semente=0,
+                     percentis=PERCENTIS, n_processos=None):
+    """
+    Simula cada cenário em ``replicas`` trajetórias independentes.
+
+    ``perfis`` é ``(n, 6)``; ``cenarios`` mapeia nome -> dict com ``deriva``
+    (tendência mensal por dimensão), ``alvo`` (perfil pretendido) e
+    ``intensidade`` (puxão mensal rumo ao alvo). Retorna nome -> array
+    ``(len(percentis), meses + 1, 6)`` com as faixas da média organizacional.
+    Os blocos (cenário × réplicas) rodam em processos, cada um com um filho
+    de ``SeedSequence``.
+    """
+    perfis = np.asarray(perfis, dtype=float)
+    suscetibilidade = np.clip(np.asarray(suscetibilidade, dtype=float), 0, 1)
+    grafo = sparse.csr_matrix(grafo, dtype=np.float32)
+
+    nomes = list(cenarios)
+    tamanhos = [min(REPLICAS_POR_BLOCO, replicas - inicio)
+                for inicio in range(0, replicas, REPLICAS_POR_BLOCO)]
+    sementes = np.random.SeedSequence(semente).spawn(len(nomes) * len(tamanhos))
+
+    tarefas, donos = [], []
+    for c, nome in enumerate(nomes):
+        for b, tamanho in enumerate(tamanhos):
+            tarefas.append((perfis, grafo, suscetibilidade, cenarios[nome], meses, tamanho,
+                            ruido_individual, ruido_comum, sementes[c * len(tamanhos) + b]))
+            donos.append(nome)
+
+    trabalho = len(perfis) * replicas * meses * len(nomes)
+    resultados = executar_blocos(_simular_bloco, tarefas, n_processos, trabalho)
+
+    faixas = {}
+    for nome in nomes:
+        medias = np.concatenate([r for r, dono in zip(resultados, donos) if dono == nome], axis=1)
+        faixas[nome] = np.percentile(medias, percentis, axis=1)
+    return faixas
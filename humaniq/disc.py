@@ -0,0 +1,203 @@
+"""
+Pontuação DISC em lote.
+
+``QuestionarioDISC`` transforma o dicionário de palavras do questionário
+(grupo -> palavra -> pesos D/I/S/C) em uma matriz de pesos com uma linha
+por (grupo, palavra), mais uma linha de zeros para respostas ausentes ou
+desconhecidas. As respostas de N participantes viram duas matrizes de
+índices ``(N, grupos)`` — "mais" e "menos" — e a pontuação de todos é
+``W[mais].sum - W[menos].sum`` seguida da mesma normalização da versão por
+participante. Perfil dominante e Big Five estimado também são calculados
+sobre a matriz inteira; ``gravar_disc`` escreve o bloco ``disc`` de volta
+nos arquivos dos agentes correspondentes.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+DIMENSOES_DISC = ('D', 'I', 'S', 'C')
+
+# Traços do Big Five estimado -> chave em ``perfil_big_five`` dos agentes
+TRACOS_BIG_FIVE_DISC = {
+    'Abertura': 'abertura_a_experiencia',
+    'Conscienciosidade': 'conscienciosidade',
+    'Extroversão': 'extroversao',
+    'Amabilidade': 'amabilidade',
+    'Neuroticismo': 'neuroticismo',
+}
+
+# Segundo traço só conta acima deste percentual; a combinação, acima do outro
+LIMIAR_SECUNDARIO = 15
+LIMIAR_COMBINADO = 20
+
+
+def coluna_resposta(grupo, escolha):
+    """Nome da coluna do CSV de respostas: ``<grupo>.mais`` / ``<grupo>.menos``."""
+    return f"{grupo}.{escolha}"
+
+
+class QuestionarioDISC:
+    """Matriz palavra -> pesos DISC de um questionário."""
+
+    def __init__(self, palavras_disc):
+        self.grupos = list(palavras_disc)
+        linhas = []
+        self._indices = []
+        for grupo in self.grupos:
+            indices = {}
+            for palavra, pesos in palavras_disc[grupo].items():
+                indices[palavra] = len(linhas)
+                linhas.append([pesos.get(dimensao, 0) for dimensao in DIMENSOES_DISC])
+            self._indices.append(indices)
+        # Última linha: resposta ausente ou fora do grupo (não pontua)
+        self.nula = len(linhas)
+        self.pesos = np.array(linhas + [[0] * len(DIMENSOES_DISC)], dtype=float)
+
+    def colunas_respostas(self):
+        """Colunas esperadas no CSV, na ordem dos grupos."""
+        return [coluna_resposta(grupo, escolha)
+                for grupo in self.grupos for escolha in ('mais', 'menos')]
+
+    def codificar(self, df_respostas):
+        """
+        Índices ``(mais, menos)``, cada um ``(participantes, grupos)``.
+
+        ``df_respostas`` tem as colunas de ``colunas_respostas()``; colunas
+        ausentes ou palavras que não são do grupo apontam para a linha nula.
+        """
+        n = len(df_respostas)
+        matrizes = {}
+        for escolha in ('mais', 'menos'):
+            matriz = np.full((n, len(self.grupos)), self.nula, dtype=np.int64)
+            for g, grupo in enumerate(self.grupos):
+                coluna = coluna_resposta(grupo, escolha)
+                if coluna in df_respostas:
+                    palavras = df_respostas[coluna].astype(str).str.strip()
+                    matriz[:, g] = palavras.map(self._indices[g]).fillna(self.nula).to_numpy(dtype=np.int64)
+            matrizes[escolha] = matriz
+        return matrizes['mais'], matrizes['menos']
+
+    def codificar_respostas(self, respostas):
+        """Índices de um participante a partir de ``{grupo: {'mais', 'menos'}}``."""
+        linha = {coluna_resposta(grupo, escolha): palavra
+                 for grupo, escolhas in respostas.items()
+                 for escolha, palavra in escolhas.items()}
+        return self.codificar(pd.DataFrame([linha]))
+
+    def pontuar(self, mais, menos):
+        """
+        Pontuação D/I/S/C (percentuais, 1 casa) de cada participante.
+
+        Soma os pesos das palavras "mais", subtrai os das "menos", desloca
+        para não ter negativos e normaliza para somar 100.
+        """
+        bruta = self.pesos[mais].sum(axis=1) - self.pesos[menos].sum(axis=1)
+        minimo = bruta.min(axis=1, keepdims=True)
+        bruta = bruta - np.minimum(minimo, 0)
+        total = bruta.sum(axis=1, keepdims=True)
+        percentual = np.where(total > 0, bruta / np.where(total > 0, total, 1) * 100, bruta)
+        return np.round(percentual, 1)
+
+
+def perfis_dominantes(pontuacoes, combinacoes):
+    """
+    Perfil dominante, secundário e combinado de cada linha de ``pontuacoes``.
+
+    Empates seguem a ordem D, I, S, C. ``combinacoes`` mapeia
+    ``(dominante, secundario)`` -> descrição; pares sem descrição viram
+    ``"<dominante><secundario>"``. Secundário e combinado ausentes são ``None``.
+    """
+    pontuacoes = np.asarray(pontuacoes, dtype=float)
+    ordem = np.argsort(-pontuacoes, axis=1, kind='stable')
+    letras = np.array(DIMENSOES_DISC, dtype=object)
+    linhas = np.arange(len(pontuacoes))
+    dominante = letras[ordem[:, 0]]
+    segunda = pontuacoes[linhas, ordem[:, 1]]
+
+    secundario = np.where(segunda > LIMIAR_SECUNDARIO, letras[ordem[:, 1]], None)
+    combinado = np.array([combinacoes.get((d, s), f"{d}{s}") if tem else None
+                          for d, s, tem in zip(dominante, secundario, segunda > LIMIAR_COMBINADO)],
+                         dtype=object)
+    return dominante, secundario, combinado
+
+
+def _arredondar(valores, casas=1):
+    # ``round`` do Python (arredondamento exato do decimal), como na versão por linha
+    return np.frompyfunc(lambda valor: round(valor, casas), 1, 1)(valores).astype(float)
+
+
+def converter_big_five(pontuacoes):
+    """Big Five aproximado ``(participantes, 5)`` (escala 0-10) a partir do DISC."""
+    d, i, s, c = np.asarray(pontuacoes, dtype=float).T
+    # Mapeamento baseado em correlações psicológicas (mesma ordem das somas da versão por linha)
+    tracos = np.column_stack([
+        (i * 0.3 + d * 0.2) / 10,
+        (c * 0.4 + d * 0.1) / 10,
+        (i * 0.4 + d * 0.3) / 10,
+        (s * 0.4 + i * 0.2) / 10,
+        np.maximum(0, 5 - (s * 0.03 + c * 0.02)),
+    ])
+    return _arredondar(np.clip(tracos * 10, 0, 10))
+
+
+def avaliar(questionario, df_respostas, combinacoes):
+    """
+    Resultado DISC de todos os participantes (mesmo índice de ``df_respostas``).
+
+    Colunas: ``D``, ``I``, ``S``, ``C``, ``perfil_dominante``,
+    ``perfil_secundario``, ``perfil_combinado`` e os traços de
+    ``TRACOS_BIG_FIVE_DISC``.
+    """
+    pontuacoes = questionario.pontuar(*questionario.codificar(df_respostas))
+    dominante, secundario, combinado = perfis_dominantes(pontuacoes, combinacoes)
+
+    resultado = pd.DataFrame(pontuacoes, index=df_respostas.index, columns=list(DIMENSOES_DISC))
+    resultado['perfil_dominante'] = dominante
+    resultado['perfil_secundario'] = secundario
+    resultado['perfil_combinado'] = combinado
+    big_five = pd.DataFrame(converter_big_five(pontuacoes), index=df_respostas.index,
+                            columns=list(TRACOS_BIG_FIVE_DISC))
+    return resultado.join(big_five)
+
+
+def bloco_disc(linha, data_avaliacao):
+    """Bloco ``disc`` gravado no registro do agente a partir de uma linha de ``avaliar``."""
+    return {
+        'data_avaliacao': data_avaliacao,
+        'pontuacao': {dimensao: float(linha[dimensao]) for dimensao in DIMENSOES_DISC},
+        'perfil_dominante': linha['perfil_dominante'],
+        'perfil_secundario': linha['perfil_secundario'],
+        'perfil_combinado': linha['perfil_combinado'],
+        'big_five_estimado': {chave: float(linha[traco])
+                              for traco, chave in TRACOS_BIG_FIVE_DISC.items()},
+    }
+
+
+def gravar_disc(resultados, indice, data_avaliacao=None):
+    """
+    Escreve o bloco ``disc`` nos arquivos dos agentes cujos ids estão no
+    índice de ``resultados`` (um ``IndiceAgentes`` atualizado).
+
+    Cada arquivo é regravado de forma atômica. Retorna
+    ``(gravados, ids_sem_agente)``.
+    """
+    data_avaliacao = data_avaliacao or datetime.now().date().isoformat()
+    gravados, sem_agente = 0, []
+    for id_funcionario, linha in resultados.iterrows():
+        if id_funcionario not in indice:
+            sem_agente.append(id_funcionario)
+            continue
+        registro = indice.carregar(id_funcionario)
+        registro['disc'] = bloco_disc(linha, data_avaliacao)
+
+        caminho = indice.arquivo(id_funcionario)
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(registro, arquivo, ensure_ascii=False, indent=2)
+        os.replace(temporario, caminho)
+        gravados += 1
+    return gravados, sem_agente
@@ -0,0 +1,192 @@
+"""
+"DNA de sucesso": perfil dos top performers de cada cargo e departamento.
+
+Para cada grupo, o DNA reúne o Big Five médio, as competências mais comuns e
+as estatísticas de performance dos ``top_n`` maiores scores do grupo. Os
+perfis de todos os grupos são calculados juntos e persistidos com uma
+assinatura (hash) das linhas de cada grupo; ao atualizar, só os grupos cuja
+assinatura mudou são recalculados. ``gaps_para_dna`` compara toda a força de
+trabalho com o DNA do próprio grupo de uma vez.
+"""
+
+import json
+import os
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from humaniq.competencias import VocabularioSkills, contar_bits
+from humaniq.performance import COLUNA_ULTIMA_NOTA, top_por_grupo
+
+ARQUIVO_DNA = "data/cache/dna_sucesso.json"
+
+COLUNAS_BIG_FIVE = [
+    'perfil_big_five.abertura_a_experiencia',
+    'perfil_big_five.conscienciosidade',
+    'perfil_big_five.extroversao',
+    'perfil_big_five.amabilidade',
+    'perfil_big_five.neuroticismo'
+]
+
+# Estatística -> coluna de origem
+ESTATISTICAS_PERFORMANCE = {
+    'avaliacao_media': COLUNA_ULTIMA_NOTA,
+    'metas_media': 'performance.metas_atingidas_percentual',
+    'enps_medio': 'engajamento.enps_recente',
+    'feedback_360_medio': 'engajamento.feedback_360_media',
+    'risco_burnout_medio': 'kpis_ia.risco_burnout',
+}
+
+# Colunas que entram na assinatura de cada grupo
+COLUNAS_ASSINATURA = (['score_performance', 'competencias'] + COLUNAS_BIG_FIVE
+                      + list(ESTATISTICAS_PERFORMANCE.values()))
+
+N_COMPETENCIAS_CHAVE = 5
+
+
+def _valor_nativo(valor):
+    return None if pd.isna(valor) else float(valor)
+
+
+def extrair_dna(df_top):
+    """DNA (perfil, competências chave e estatísticas) de um grupo de top performers."""
+    if df_top.empty:
+        return {}
+
+    competencias = Counter(
+        competencia for lista in df_top['competencias'] if isinstance(lista, list)
+        for competencia in lista)
+
+    return {
+        'perfil_big_five': {coluna: _valor_nativo(valor)
+                            for coluna, valor in df_top[COLUNAS_BIG_FIVE].mean().items()},
+        'competencias_chave': competencias.most_common(N_COMPETENCIAS_CHAVE),
+        'performance_stats': {nome: _valor_nativo(df_top[coluna].mean())
+                              for nome, coluna in ESTATISTICAS_PERFORMANCE.items()},
+        'tamanho_amostra': len(df_top),
+        'top_ids': df_top.index.tolist(),
+    }
+
+
+def assinaturas(df_funcionarios, coluna_grupo):
+    """Hash das linhas (e ids) de cada grupo; muda se qualquer membro mudar."""
+    colunas = [coluna for coluna in COLUNAS_ASSINATURA if coluna in df_funcionarios]
+    dados = df_funcionarios[colunas].copy()
+    if 'competencias' in dados:
+        dados['competencias'] = dados['competencias'].map(
+            lambda lista: '|'.join(lista) if isinstance(lista, list) else '')
+    hashes = pd.util.hash_pandas_object(dados, index=True).to_numpy()
+    # Soma módulo 2^64: independe da ordem das linhas
+    somas = pd.Series(hashes.view(np.int64)).groupby(
+        df_funcionarios[coluna_grupo].to_numpy(), sort=False).sum()
+    return {grupo: format(int(soma) & (2 ** 64 - 1), '016x') for grupo, soma in somas.items()}
+
+
+def ler_dna(caminho=ARQUIVO_DNA):
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def salvar_dna(dados, caminho=ARQUIVO_DNA):
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+
+def atualizar_dna(df_funcionarios, top_n=3, agrupamentos=('cargo', 'departamento'),
+                  caminho=ARQUIVO_DNA):
+    """
+    DNA de todos os grupos de cada coluna de ``agrupamentos``.
+
+    ``df_funcionarios`` precisa da coluna ``score_performance``. Grupos com a
+    mesma assinatura do arquivo são reaproveitados; os demais são
+    recalculados e o arquivo é regravado só se algo mudou. Retorna
+    ``{coluna: {grupo: dna}}``.
+    """
+    persistido = ler_dna(caminho)
+    chave_top = str(top_n)
+    por_top = persistido.get(chave_top, {})
+    alterado = False
+    resultado = {}
+
+    for coluna in agrupamentos:
+        if coluna not in df_funcionarios:
+            continue
+        atuais = assinaturas(df_funcionarios, coluna)
+        salvos = por_top.get(coluna, {})
+        mudaram = [grupo for grupo, assinatura in atuais.items()
+                   if salvos.get(grupo, {}).get('assinatura') != assinatura]
+
+        grupos = {grupo: salvos[grupo] for grupo in atuais if grupo not in mudaram}
+        if mudaram:
+            membros = df_funcionarios[df_funcionarios[coluna].isin(mudaram)]
+            top = top_por_grupo(membros['score_performance'], membros[coluna], top_n)
+            for grupo in mudaram:
+                ids = top.loc[grupo].index if grupo in top.index.get_level_values(0) else []
+                grupos[grupo] = {'assinatura': atuais[grupo],
+                                 'dna': extrair_dna(df_funcionarios.loc[ids])}
+        alterado = alterado or bool(mudaram) or len(grupos) != len(salvos)
+
+        por_top[coluna] = grupos
+        resultado[coluna] = {grupo: registro['dna'] for grupo, registro in grupos.items()}
+
+    if alterado:
+        persistido[chave_top] = por_top
+        salvar_dna(persistido, caminho)
+    return resultado
+
+
+def gaps_para_dna(df_funcionarios, dna_por_grupo, coluna_grupo='cargo'):
+    """
+    Gaps de cada funcionário em relação ao DNA do próprio grupo.
+
+    Retorna um DataFrame (mesmo índice) com ``gap.<traço>`` (ideal − atual)
+    para cada coluna Big Five, ``distancia_big_five`` (euclidiana),
+    ``competencias_tem`` e ``competencias_faltam`` (contra as competências
+    chave) e ``cobertura_competencias`` (%). Funcionários de grupos sem DNA
+    ficam com NaN.
+    """
+    grupos = [grupo for grupo, dna in dna_por_grupo.items() if dna]
+    codigos = pd.Categorical(df_funcionarios[coluna_grupo], categories=grupos).codes
+    com_dna = codigos >= 0
+
+    ideal = np.array([[np.nan if dna_por_grupo[grupo]['perfil_big_five'][coluna] is None
+                       else dna_por_grupo[grupo]['perfil_big_five'][coluna]
+                       for coluna in COLUNAS_BIG_FIVE] for grupo in grupos],
+                     dtype=float).reshape(len(grupos), len(COLUNAS_BIG_FIVE))
+    atual = df_funcionarios.reindex(columns=COLUNAS_BIG_FIVE).fillna(5).to_numpy(dtype=float)
+    gaps = np.full_like(atual, np.nan)
+    gaps[com_dna] = ideal[codigos[com_dna]] - atual[com_dna]
+
+    # Competências chave de cada grupo e de cada funcionário como bitsets
+    chave = [[competencia for competencia, _ in dna_por_grupo[grupo]['competencias_chave']]
+             for grupo in grupos]
+    vocabulario = VocabularioSkills().registrar(chave)
+    bits = vocabulario.codificar_lote(df_funcionarios['competencias'].tolist()
+                                      if 'competencias' in df_funcionarios
+                                      else [()] * len(df_funcionarios))
+    requisitos = np.zeros((len(grupos), bits.shape[1]), dtype=np.uint64)
+    for i, competencias in enumerate(chave):
+        requisitos[i] = vocabulario.codificar(competencias, bits.shape[1])
+
+    tem = np.full(len(df_funcionarios), np.nan)
+    faltam = np.full(len(df_funcionarios), np.nan)
+    requisito = requisitos[codigos[com_dna]]
+    tem[com_dna] = contar_bits(requisito & bits[com_dna])
+    faltam[com_dna] = contar_bits(requisito & ~bits[com_dna])
+    total = tem + faltam
+
+    resultado = pd.DataFrame(gaps, index=df_funcionarios.index,
+                             columns=[f"gap.{coluna}" for coluna in COLUNAS_BIG_FIVE])
+    resultado['distancia_big_five'] = np.sqrt(np.square(gaps).sum(axis=1))
+    resultado['competencias_tem'] = tem
+    resultado['competencias_faltam'] = faltam
+    # Grupo sem competências chave: cobertura total
+    resultado['cobertura_competencias'] = np.where(
+        total > 0, tem * 100 / np.where(total > 0, total, 1), np.where(com_dna, 100.0, np.nan))
+    return resultado
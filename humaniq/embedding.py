@@ -0,0 +1,178 @@
+"""
+Embedding 2-D (PCA) dos perfis de funcionários, mantido incrementalmente.
+
+``EmbeddingAgentes`` guarda, para cada arquivo de agente, o mtime, as
+features numéricas e os campos exibidos no gráfico — não o registro
+inteiro. A cada ``atualizar()`` só arquivos novos ou alterados são lidos:
+eles são projetados com o ``StandardScaler`` + ``PCA`` já ajustados, e o
+modelo é reajustado quando os registros novos passam de
+``FRACAO_REAJUSTE`` da base. Acima de ``LIMIAR_INCREMENTAL`` registros o
+modelo é um ``IncrementalPCA``, atualizado com ``partial_fit`` só com os
+arquivos novos (o ``StandardScaler`` fica congelado até o próximo ajuste
+completo); a alteração de um registro que o modelo já viu provoca um
+reajuste completo. O objeto é compartilhado entre sessões: ``atualizar``
+passa por uma trava.
+"""
+
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.preprocessing import StandardScaler
+
+FEATURES_EMBEDDING = [
+    'tempo_de_casa_meses',
+    'perfil_big_five.abertura_a_experiencia',
+    'perfil_big_five.conscienciosidade',
+    'perfil_big_five.extroversao',
+    'perfil_big_five.amabilidade',
+    'perfil_big_five.neuroticismo',
+    'performance.metas_atingidas_percentual',
+    'engajamento.enps_recente',
+    'engajamento.feedback_360_media'
+]
+
+# Campos mantidos para o gráfico (hover, cor)
+CAMPOS_EXIBICAO = {
+    'id_funcionario': 'id_funcionario',
+    'nome': 'nome',
+    'cargo': 'cargo',
+    'demografia.pais_origem': 'pais_origem',
+}
+
+# Fração de registros novos desde o último ajuste que dispara um reajuste completo
+FRACAO_REAJUSTE = 0.2
+
+# A partir deste tamanho o modelo passa a ser um IncrementalPCA
+LIMIAR_INCREMENTAL = 100_000
+TAMANHO_LOTE = 10_000
+
+
+def ler_agentes(caminhos):
+    """Features e campos de exibição de uma lista de arquivos de agente."""
+    registros = []
+    for caminho in caminhos:
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            registros.append(json.load(arquivo))
+    df = pd.json_normalize(registros)
+    features = df.reindex(columns=FEATURES_EMBEDDING).to_numpy(dtype=float, na_value=np.nan)
+    exibicao = df.reindex(columns=list(CAMPOS_EXIBICAO)).rename(columns=CAMPOS_EXIBICAO)
+    exibicao.index = [os.path.splitext(os.path.basename(c))[0] for c in caminhos]
+    return features, exibicao
+
+
+class EmbeddingAgentes:
+    """Coordenadas PCA de todos os agentes de ``diretorio``."""
+
+    def __init__(self, diretorio):
+        self.diretorio = diretorio
+        self.mtimes = {}
+        self.features = pd.DataFrame(columns=FEATURES_EMBEDDING, dtype=float)
+        self.exibicao = pd.DataFrame(columns=list(CAMPOS_EXIBICAO.values()), dtype=object)
+        self.scaler = None
+        self.pca = None
+        self.n_ajuste = 0
+        self.novos_desde_ajuste = 0
+        self._df_pca = None
+        self._lock = threading.Lock()
+
+    def _varrer(self):
+        with os.scandir(self.diretorio) as entradas:
+            return {os.path.splitext(entrada.name)[0]: entrada.stat().st_mtime_ns
+                    for entrada in entradas if entrada.name.endswith('.json')}
+
+    def _escalar(self, matriz):
+        # Ausências viram a média do ajuste (0 depois da padronização)
+        matriz = np.where(np.isnan(matriz), self.scaler.mean_, matriz)
+        return self.scaler.transform(matriz)
+
+    def _ajustar(self):
+        matriz = self.features.to_numpy(dtype=float)
+        if len(matriz) < 2:
+            # PCA com 2 componentes precisa de ao menos 2 registros
+            self.pca = None
+            return
+        medias = np.nanmean(matriz, axis=0)
+        matriz = np.where(np.isnan(matriz), np.nan_to_num(medias), matriz)
+        self.scaler = StandardScaler().fit(matriz)
+        escalada = self.scaler.transform(matriz)
+        if len(matriz) > LIMIAR_INCREMENTAL:
+            self.pca = IncrementalPCA(n_components=2, batch_size=TAMANHO_LOTE).fit(escalada)
+        else:
+            self.pca = PCA(n_components=2).fit(escalada)
+        self.n_ajuste = len(matriz)
+        self.novos_desde_ajuste = 0
+
+    def _acrescentar_ao_modelo(self, matriz):
+        """
+        Atualiza o IncrementalPCA com os registros novos, sem reajuste completo.
+
+        A padronização é a do último ajuste: mover o scaler aqui deslocaria
+        os componentes já ajustados sob a escala antiga.
+        """
+        escalada = self._escalar(matriz)
+        for inicio in range(0, len(escalada), TAMANHO_LOTE):
+            lote = escalada[inicio:inicio + TAMANHO_LOTE]
+            if len(lote) >= 2:
+                self.pca.partial_fit(lote)
+
+    def atualizar(self):
+        """
+        Relê só arquivos novos/alterados e devolve o DataFrame do gráfico
+        (o mesmo objeto enquanto nada mudar no diretório).
+
+        Colunas: ``PC1``, ``PC2`` e os campos de ``CAMPOS_EXIBICAO``; o
+        índice é o nome do arquivo (sem ``.json``).
+        """
+        with self._lock:
+            return self._atualizar()
+
+    def _atualizar(self):
+        atuais = self._varrer()
+        removidos = [agente for agente in self.mtimes if agente not in atuais]
+        alterados = sorted(agente for agente, mtime in atuais.items()
+                           if self.mtimes.get(agente) != mtime)
+
+        if removidos:
+            self.features = self.features.drop(index=removidos)
+            self.exibicao = self.exibicao.drop(index=removidos)
+            for agente in removidos:
+                del self.mtimes[agente]
+
+        if alterados:
+            editados = [agente for agente in alterados if agente in self.mtimes]
+            caminhos = [os.path.join(self.diretorio, f"{agente}.json") for agente in alterados]
+            features, exibicao = ler_agentes(caminhos)
+            novos = pd.DataFrame(features, index=exibicao.index, columns=FEATURES_EMBEDDING)
+            self.features = pd.concat([self.features.drop(index=alterados, errors='ignore'), novos])
+            self.exibicao = pd.concat([self.exibicao.drop(index=alterados, errors='ignore'),
+                                       exibicao])
+            self.mtimes.update({agente: atuais[agente] for agente in alterados})
+
+            self.novos_desde_ajuste += len(alterados)
+            if self.pca is None:
+                self._ajustar()
+            elif isinstance(self.pca, IncrementalPCA):
+                if editados:
+                    # partial_fit contaria de novo registros que o modelo já viu
+                    self._ajustar()
+                else:
+                    self._acrescentar_ao_modelo(features)
+                    self.novos_desde_ajuste = 0
+            elif self.novos_desde_ajuste > FRACAO_REAJUSTE * self.n_ajuste:
+                self._ajustar()
+            # Caso contrário os novos são só projetados com o ajuste atual
+
+        if removidos or alterados or self._df_pca is None:
+            self._df_pca = self._projetar()
+        return self._df_pca
+
+    def _projetar(self):
+        if self.pca is None or self.features.empty:
+            return pd.DataFrame(columns=['PC1', 'PC2'] + list(self.exibicao.columns))
+        coordenadas = self.pca.transform(self._escalar(self.features.to_numpy(dtype=float)))
+        df_pca = pd.DataFrame(coordenadas, index=self.features.index, columns=['PC1', 'PC2'])
+        return df_pca.join(self.exibicao)
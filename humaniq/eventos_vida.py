@@ -0,0 +1,107 @@
+"""
+Simulação Monte Carlo de eventos de vida e demanda de benefícios.
+
+Cada funcionário tem uma taxa mensal por tipo de evento (casamento, filho,
+migração para remoto, ...). Em cada trajetória, o mês do primeiro evento é
+sorteado de uma geométrica com essa taxa; a partir dele o funcionário passa
+a demandar o custo mensal do evento. Os sorteios são vetorizados em blocos
+``(trajetórias, funcionários, eventos)`` e os blocos rodam em processos
+separados, cada um com um filho independente de ``SeedSequence`` — o
+resultado depende só da semente, não do número de processos.
+"""
+
+import numpy as np
+
+from humaniq.paralelo import executar_blocos
+
+# Trajetórias por bloco (unidade de trabalho de cada processo)
+TRAJETORIAS_POR_BLOCO = 250
+
+# Elementos (trajetórias × funcionários × eventos) sorteados por vez dentro de um bloco
+ELEMENTOS_POR_SORTEIO = 4_000_000
+
+PERCENTIS = (5, 50, 95)
+
+
+def taxa_mensal(probabilidade, meses):
+    """Taxa mensal equivalente a ``probabilidade`` de ocorrer em ``meses`` meses."""
+    probabilidade = np.clip(np.asarray(probabilidade, dtype=float), 0.0, 1.0)
+    return 1.0 - (1.0 - probabilidade) ** (1.0 / meses)
+
+
+def probabilidade_no_horizonte(taxas, horizonte_meses):
+    """Probabilidade analítica de cada evento ocorrer até ``horizonte_meses``."""
+    return 1.0 - (1.0 - np.asarray(taxas, dtype=float)) ** horizonte_meses
+
+
+def _simular_bloco(taxas, custos, horizonte, n_trajetorias, semente):
+    """Custo mensal e contagem de eventos de ``n_trajetorias`` trajetórias."""
+    rng = np.random.default_rng(semente)
+    n, k = taxas.shape
+    ativos = taxas > 0
+    taxas_ativas = taxas[ativos]
+    evento_ativo = np.nonzero(ativos)[1]
+
+    custo_mensal = np.zeros((n_trajetorias, horizonte))
+    eventos = np.zeros((n_trajetorias, k), dtype=np.int64)
+    if taxas_ativas.size == 0:
+        return custo_mensal, eventos
+
+    # Inversão da geométrica: mês = ceil(E / -log(1 - taxa)), E ~ Exp(1)
+    escala = (-1.0 / np.log1p(-np.minimum(taxas_ativas, 1 - 1e-12))).astype(np.float32)
+    passo = max(1, ELEMENTOS_POR_SORTEIO // taxas_ativas.size)
+    for inicio in range(0, n_trajetorias, passo):
+        fim = min(n_trajetorias, inicio + passo)
+        # Mês (1..) do primeiro evento de cada par funcionário × evento elegível
+        exponencial = rng.standard_exponential((fim - inicio, taxas_ativas.size), dtype=np.float32)
+        mes = np.maximum(np.ceil(exponencial * escala), 1)
+        trajetoria, par = np.nonzero(mes <= horizonte)
+
+        # Novos eventos por (trajetória, tipo, mês) -> acumulado = funcionários afetados
+        celula = ((trajetoria * k + evento_ativo[par]) * horizonte
+                  + mes[trajetoria, par].astype(np.int64) - 1)
+        novos = np.bincount(celula, minlength=(fim - inicio) * k * horizonte)
+        afetados = np.cumsum(novos.reshape(fim - inicio, k, horizonte), axis=2)
+
+        custo_mensal[inicio:fim] = np.einsum('tkm,k->tm', afetados, custos)
+        eventos[inicio:fim] = afetados[:, :, -1]
+    return custo_mensal, eventos
+
+
+def simular_demanda(taxas, custos, horizonte_meses=12, n_trajetorias=2000,
+                    semente=0, n_processos=None):
+    """
+    Roda ``n_trajetorias`` trajetórias para toda a força de trabalho.
+
+    ``taxas`` é ``(funcionários, eventos)`` com taxas mensais e ``custos`` o
+    custo mensal adicional de cada evento. Retorna ``(custo_mensal,
+    eventos)``: custo ``(trajetórias, meses)`` e número de eventos
+    ``(trajetórias, tipos)``. ``n_processos=1`` roda tudo no processo atual.
+    """
+    taxas = np.atleast_2d(np.asarray(taxas, dtype=float))
+    custos = np.asarray(custos, dtype=float)
+
+    tamanhos = [min(TRAJETORIAS_POR_BLOCO, n_trajetorias - inicio)
+                for inicio in range(0, n_trajetorias, TRAJETORIAS_POR_BLOCO)]
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+    tarefas = [(taxas, custos, horizonte_meses, tamanho, filho)
+               for tamanho, filho in zip(tamanhos, sementes)]
+
+    trabalho = taxas.shape[0] * n_trajetorias * horizonte_meses
+    resultados = executar_blocos(_simular_bloco, tarefas, n_processos, trabalho)
+    custo_mensal = np.concatenate([r[0] for r in resultados])
+    eventos = np.concatenate([r[1] for r in resultados])
+    return custo_mensal, eventos
+
+
+def resumir_percentis(custo_mensal, eventos, percentis=PERCENTIS):
+    """Percentis do custo total, das faixas mensais e das contagens de eventos."""
+    custo_total = custo_mensal.sum(axis=1)
+    return {
+        'percentis': list(percentis),
+        'custo_total': np.percentile(custo_total, percentis),
+        'custo_total_medio': float(custo_total.mean()),
+        'custo_mensal': np.percentile(custo_mensal, percentis, axis=0),
+        'eventos': np.percentile(eventos, percentis, axis=0),
+        'eventos_medios': eventos.mean(axis=0),
+    }
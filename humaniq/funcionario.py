@@ -0,0 +1,215 @@
+"""
+Registro compacto de funcionário.
+
+As funções de score das páginas recebem linhas do ``iterrows()`` e chamam
+``.get('perfil_big_five.extroversao', 5)`` repetidas vezes, o que é caro em
+um ``pd.Series``. ``Funcionario`` guarda os mesmos campos em ``__slots__``
+tipados e expõe um ``get`` compatível com as chaves achatadas do
+``pd.json_normalize``, de modo que essas funções rodam sem alteração.
+
+Como no ``Series``, o padrão de ``get`` só vale para colunas que não existem
+na origem; coluna presente com valor ausente devolve NaN (comparações com
+NaN são falsas, então o valor não pontua como o padrão pontuaria).
+"""
+
+import math
+
+# Chave achatada (json_normalize) -> slot
+COLUNAS_FUNCIONARIO = {
+    'id_funcionario': 'id',
+    'nome': 'nome',
+    'cargo': 'cargo',
+    'departamento': 'departamento',
+    'equipe_atual': 'equipe_atual',
+    'tempo_de_casa_meses': 'tempo_de_casa_meses',
+    'perfil_big_five.abertura_a_experiencia': 'abertura',
+    'perfil_big_five.conscienciosidade': 'conscienciosidade',
+    'perfil_big_five.extroversao': 'extroversao',
+    'perfil_big_five.amabilidade': 'amabilidade',
+    'perfil_big_five.neuroticismo': 'neuroticismo',
+    'competencias': 'competencias',
+    'performance.avaliacoes_desempenho': 'avaliacoes_desempenho',
+    'performance.metas_atingidas_percentual': 'metas_atingidas_percentual',
+    'engajamento.enps_recente': 'enps_recente',
+    'engajamento.feedback_360_media': 'feedback_360_media',
+    'engajamento.comentarios_sentimento': 'comentarios_sentimento',
+    'kpis_ia.risco_burnout': 'risco_burnout',
+    'kpis_ia.engajamento_inferido': 'engajamento_inferido',
+    'kpis_ia.sentimento_medio': 'sentimento_medio',
+    'objetivos_carreira': 'objetivos_carreira',
+}
+
+CAMPOS_BIG_FIVE = ('abertura', 'conscienciosidade', 'extroversao',
+                   'amabilidade', 'neuroticismo')
+
+
+def _valor(valor):
+    """Normaliza ausências (None/NaN) para None."""
+    if valor is None:
+        return None
+    if isinstance(valor, float) and math.isnan(valor):
+        return None
+    return valor
+
+
+def _numero(valor):
+    valor = _valor(valor)
+    return None if valor is None else float(valor)
+
+
+class Funcionario:
+    """Registro de funcionário com campos tipados em ``__slots__``."""
+
+    __slots__ = (
+        'id', 'nome', 'cargo', 'departamento', 'equipe_atual',
+        'tempo_de_casa_meses',
+        'abertura', 'conscienciosidade', 'extroversao', 'amabilidade',
+        'neuroticismo',
+        'competencias',
+        'avaliacoes_desempenho', 'ultima_nota', 'metas_atingidas_percentual',
+        'enps_recente', 'feedback_360_media', 'comentarios_sentimento',
+        'risco_burnout', 'engajamento_inferido', 'sentimento_medio',
+        'objetivos_carreira',
+        '_presentes',
+    )
+
+    def __init__(self, id=None, nome=None, cargo=None, departamento=None,
+                 equipe_atual=None, tempo_de_casa_meses=None,
+                 abertura=None, conscienciosidade=None, extroversao=None,
+                 amabilidade=None, neuroticismo=None, competencias=None,
+                 avaliacoes_desempenho=None, metas_atingidas_percentual=None,
+                 enps_recente=None, feedback_360_media=None,
+                 comentarios_sentimento=None, risco_burnout=None,
+                 engajamento_inferido=None, sentimento_medio=None,
+                 objetivos_carreira=None, presentes=()):
+        # Slots cuja coluna existe na origem (DataFrame/linha achatada)
+        self._presentes = frozenset(presentes)
+        self.id = _valor(id)
+        self.nome = _valor(nome)
+        self.cargo = _valor(cargo)
+        self.departamento = _valor(departamento)
+        self.equipe_atual = _valor(equipe_atual)
+        self.tempo_de_casa_meses = _numero(tempo_de_casa_meses)
+
+        self.abertura = _numero(abertura)
+        self.conscienciosidade = _numero(conscienciosidade)
+        self.extroversao = _numero(extroversao)
+        self.amabilidade = _numero(amabilidade)
+        self.neuroticismo = _numero(neuroticismo)
+
+        self.competencias = tuple(competencias) if isinstance(
+            competencias, (list, tuple)) else ()
+
+        avaliacoes = avaliacoes_desempenho if isinstance(
+            avaliacoes_desempenho, list) else None
+        self.avaliacoes_desempenho = avaliacoes
+        self.ultima_nota = _numero(
+            avaliacoes[-1].get('nota')) if avaliacoes else None
+        self.metas_atingidas_percentual = _numero(metas_atingidas_percentual)
+
+        self.enps_recente = _numero(enps_recente)
+        self.feedback_360_media = _numero(feedback_360_media)
+        self.comentarios_sentimento = _valor(comentarios_sentimento)
+
+        self.risco_burnout = _numero(risco_burnout)
+        self.engajamento_inferido = _numero(engajamento_inferido)
+        self.sentimento_medio = _numero(sentimento_medio)
+
+        self.objetivos_carreira = _valor(objetivos_carreira)
+
+    # --- Construtores ---
+
+    @classmethod
+    def de_linha(cls, linha, id=None):
+        """Cria o registro a partir de um dict/Series achatado (json_normalize)."""
+        campos = {slot: linha.get(coluna)
+                  for coluna, slot in COLUNAS_FUNCIONARIO.items()}
+        if id is not None:
+            campos['id'] = id
+        presentes = [slot for coluna, slot in COLUNAS_FUNCIONARIO.items() if coluna in linha]
+        return cls(**campos, presentes=presentes)
+
+    @classmethod
+    def de_dict(cls, dados):
+        """Cria o registro a partir do JSON aninhado gerado por generate_agents.py."""
+        big_five = dados.get('perfil_big_five') or {}
+        performance = dados.get('performance') or {}
+        engajamento = dados.get('engajamento') or {}
+        kpis = dados.get('kpis_ia') or {}
+        return cls(
+            id=dados.get('id_funcionario'),
+            nome=dados.get('nome'),
+            cargo=dados.get('cargo'),
+            departamento=dados.get('departamento'),
+            equipe_atual=dados.get('equipe_atual'),
+            tempo_de_casa_meses=dados.get('tempo_de_casa_meses'),
+            abertura=big_five.get('abertura_a_experiencia'),
+            conscienciosidade=big_five.get('conscienciosidade'),
+            extroversao=big_five.get('extroversao'),
+            amabilidade=big_five.get('amabilidade'),
+            neuroticismo=big_five.get('neuroticismo'),
+            competencias=dados.get('competencias'),
+            avaliacoes_desempenho=performance.get('avaliacoes_desempenho'),
+            metas_atingidas_percentual=performance.get(
+                'metas_atingidas_percentual'),
+            enps_recente=engajamento.get('enps_recente'),
+            feedback_360_media=engajamento.get('feedback_360_media'),
+            comentarios_sentimento=engajamento.get('comentarios_sentimento'),
+            risco_burnout=kpis.get('risco_burnout'),
+            engajamento_inferido=kpis.get('engajamento_inferido'),
+            sentimento_medio=kpis.get('sentimento_medio'),
+            objetivos_carreira=dados.get('objetivos_carreira'),
+        )
+
+    # --- Acesso compatível com pd.Series / dict ---
+
+    def get(self, chave, padrao=None):
+        """Equivalente a ``Series.get`` usando as chaves achatadas."""
+        slot = COLUNAS_FUNCIONARIO.get(chave)
+        if slot is None:
+            return padrao
+        valor = getattr(self, slot)
+        if valor is not None:
+            return valor
+        return math.nan if slot in self._presentes else padrao
+
+    def __getitem__(self, chave):
+        slot = COLUNAS_FUNCIONARIO.get(chave)
+        if slot is None:
+            raise KeyError(chave)
+        valor = getattr(self, slot)
+        return math.nan if valor is None and slot in self._presentes else valor
+
+    def __contains__(self, chave):
+        return chave in COLUNAS_FUNCIONARIO
+
+    @property
+    def big_five(self):
+        """Tupla (abertura, conscienciosidade, extroversão, amabilidade, neuroticismo)."""
+        return tuple(5.0 if getattr(self, campo) is None else getattr(self, campo)
+                     for campo in CAMPOS_BIG_FIVE)
+
+    def __repr__(self):
+        return f"Funcionario(id={self.id!r}, nome={self.nome!r}, cargo={self.cargo!r})"
+
+
+def funcionarios_de_dataframe(df):
+    """
+    Converte um DataFrame achatado (index = id_funcionario) em uma lista de
+    ``Funcionario``, lendo coluna a coluna em vez de linha a linha.
+    """
+    n = len(df)
+    colunas = {}
+    for coluna, slot in COLUNAS_FUNCIONARIO.items():
+        if coluna in df.columns:
+            colunas[slot] = df[coluna].tolist()
+        else:
+            colunas[slot] = [None] * n
+    presentes = frozenset(slot for coluna, slot in COLUNAS_FUNCIONARIO.items()
+                          if coluna in df.columns)
+    if 'id_funcionario' not in df.columns:
+        colunas['id'] = df.index.tolist()
+
+    slots = list(colunas)
+    return [Funcionario(**dict(zip(slots, valores)), presentes=presentes)
+            for valores in zip(*colunas.values())]
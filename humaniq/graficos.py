@@ -0,0 +1,111 @@
+"""
+Gráficos Plotly para bases grandes.
+
+Dispersões com um ponto por funcionário viram JSON proporcional a N no
+navegador. ``grafico_dispersao`` escolhe o modo pelo tamanho: SVG até
+``LIMIAR_WEBGL`` pontos, WebGL (``Scattergl``) até ``LIMIAR_AGREGACAO`` e,
+acima disso, uma grade de contagens agregada no servidor (heatmap de
+densidade) com só os pontos destacados desenhados individualmente.
+``grafico_histograma`` sempre envia as contagens das classes, não os valores;
+``grafico_classes`` desenha contagens que já chegam agregadas.
+"""
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+LIMIAR_WEBGL = 5_000
+LIMIAR_AGREGACAO = 50_000
+
+# Células por eixo da grade de densidade
+BINS_GRADE = 150
+
+
+def contagem_em_grade(x, y, bins=BINS_GRADE):
+    """Contagens ``(bins_y, bins_x)`` e centros das células de uma nuvem de pontos."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    validos = np.isfinite(x) & np.isfinite(y)
+    contagens, bordas_x, bordas_y = np.histogram2d(x[validos], y[validos], bins=bins)
+    centros_x = (bordas_x[:-1] + bordas_x[1:]) / 2
+    centros_y = (bordas_y[:-1] + bordas_y[1:]) / 2
+    return contagens.T, centros_x, centros_y
+
+
+def histograma_agregado(valores, nbins=20):
+    """Contagens e bordas das classes (valores ausentes ignorados)."""
+    valores = np.asarray(valores, dtype=float)
+    return np.histogram(valores[np.isfinite(valores)], bins=nbins)
+
+
+def modo_dispersao(n_pontos):
+    """``'svg'``, ``'webgl'`` ou ``'agregado'`` conforme o número de pontos."""
+    if n_pontos > LIMIAR_AGREGACAO:
+        return 'agregado'
+    if n_pontos > LIMIAR_WEBGL:
+        return 'webgl'
+    return 'svg'
+
+
+def grafico_dispersao(df, x, y, color=None, hover_name=None, hover_data=None,
+                      destaque=None, title=None, labels=None):
+    """
+    Dispersão de ``df`` no modo adequado ao tamanho (ver ``modo_dispersao``).
+
+    ``destaque`` é um DataFrame (subconjunto de ``df``) desenhado por cima
+    como estrelas, em qualquer modo — é o que permite ver os selecionados
+    mesmo quando o resto vira densidade.
+    """
+    modo = modo_dispersao(len(df))
+    if modo == 'agregado':
+        contagens, centros_x, centros_y = contagem_em_grade(df[x], df[y])
+        fig = go.Figure(go.Heatmap(
+            x=centros_x,
+            y=centros_y,
+            # Células vazias ficam transparentes
+            z=np.where(contagens > 0, contagens, np.nan),
+            colorscale='Blues',
+            colorbar=dict(title='Funcionários'),
+            hovertemplate=f"{x}: %{{x:.2f}}<br>{y}: %{{y:.2f}}<br>Funcionários: %{{z:.0f}}<extra></extra>"
+        ))
+        fig.update_layout(title=title)
+    else:
+        fig = px.scatter(df, x=x, y=y, color=color, hover_name=hover_name,
+                         hover_data=hover_data, title=title, labels=labels,
+                         render_mode='webgl' if modo == 'webgl' else 'svg')
+
+    if destaque is not None and not destaque.empty:
+        trace = go.Scattergl if modo != 'svg' else go.Scatter
+        fig.add_trace(trace(
+            x=destaque[x],
+            y=destaque[y],
+            mode='markers',
+            marker=dict(symbol='star', size=18, color='black'),
+            name='Selecionado' if len(destaque) > 1 or hover_name is None
+            else f"Selecionado: {destaque[hover_name].iloc[0]}",
+            text=destaque[hover_name] if hover_name else None,
+            hoverinfo='text+name' if hover_name else 'name'
+        ))
+    return fig
+
+
+def grafico_histograma(valores, nbins=20, title=None, rotulo_x=None,
+                       rotulo_y='Número de Funcionários', cor='#1f77b4'):
+    """Histograma com as classes calculadas no servidor (barras contíguas)."""
+    contagens, bordas = histograma_agregado(valores, nbins)
+    return grafico_classes(contagens, bordas, title, rotulo_x, rotulo_y, cor)
+
+
+def grafico_classes(contagens, bordas, title=None, rotulo_x=None,
+                    rotulo_y='Número de Funcionários', cor='#1f77b4'):
+    """Histograma de contagens já agregadas (``bordas`` tem uma entrada a mais)."""
+    bordas = np.asarray(bordas, dtype=float)
+    fig = go.Figure(go.Bar(
+        x=(bordas[:-1] + bordas[1:]) / 2,
+        y=contagens,
+        width=np.diff(bordas),
+        marker_color=cor,
+        hovertemplate="%{x:.1f}: %{y}<extra></extra>"
+    ))
+    fig.update_layout(title=title, xaxis_title=rotulo_x, yaxis_title=rotulo_y, bargap=0)
+    return fig
@@ -0,0 +1,91 @@
+"""
+Histórico de KPIs em séries temporais só de acréscimo.
+
+Cada série (``executivo``, ``turnover``) é uma ``SerieTemporal`` em
+``data/historico_kpi/<nome>``. ``registrar_snapshot`` grava no máximo um
+snapshot por período (dia, semana...), no início do período, e é chamado
+tanto pelo job ``snapshot_kpis.py`` quanto pelas páginas, que registram o
+período corrente se ele ainda estiver faltando. ``tendencia`` lê uma faixa
+e a reamostra para no máximo ``PONTOS_MAX_GRAFICO`` pontos, então gráficos
+de históricos de vários anos continuam leves.
+"""
+
+import os
+
+import pandas as pd
+
+from humaniq.agregados_kpi import COLUNAS_METRICAS
+from humaniq.serie_temporal import SerieTemporal
+
+DIRETORIO_HISTORICO_KPI = "data/historico_kpi"
+
+SERIE_EXECUTIVO = 'executivo'
+
+# Métricas gerais dos agregados executivos gravadas a cada snapshot; métricas
+# novas ou renomeadas viram colunas novas da série (vazias nos snapshots antigos)
+COLUNAS_EXECUTIVO = COLUNAS_METRICAS
+
+# Indicadores de risco da página de Turnover (``humaniq.turnover.indicadores_turnover``)
+SERIE_TURNOVER = 'turnover'
+COLUNAS_TURNOVER = ['score_medio', 'criticos', 'alto_mais', 'monitoramento', 'total']
+
+PERIODO_PADRAO = 'D'
+
+PONTOS_MAX_GRAFICO = 60
+
+# Frequência de reamostragem -> dias cobertos por ponto (da mais fina à mais grossa)
+FREQUENCIAS_TENDENCIA = {None: 1, 'W': 7, 'MS': 30, 'QS': 91, 'YS': 365}
+
+
+def serie_kpi(nome, colunas, diretorio=DIRETORIO_HISTORICO_KPI):
+    """
+    Série ``nome`` do histórico, com pelo menos ``colunas``.
+
+    Criada se ainda não existir; se já existe sem alguma das ``colunas``,
+    elas são incluídas (NaN nos snapshots antigos), então o snapshot grava
+    todas as métricas atuais e a leitura de qualquer uma delas não falha.
+    """
+    return SerieTemporal(os.path.join(diretorio, nome), colunas)
+
+
+def snapshot_pendente(serie, instante=None, periodo=PERIODO_PADRAO):
+    """Se o período de ``instante`` (agora, por padrão) ainda não tem snapshot."""
+    instante = pd.Timestamp.now() if instante is None else pd.Timestamp(instante)
+    ultimo = serie.ultimo_tempo()
+    return ultimo is None or ultimo.to_period(periodo) < instante.to_period(periodo)
+
+
+def registrar_snapshot(serie, valores, instante=None, periodo=PERIODO_PADRAO):
+    """
+    Grava ``valores`` (dict ou Series) no início do período de ``instante``
+    (agora, por padrão), se esse período ainda não tem snapshot.
+
+    Retorna ``True`` se gravou. Períodos anteriores ao último gravado são
+    ignorados: a série é só de acréscimo.
+    """
+    instante = pd.Timestamp.now() if instante is None else pd.Timestamp(instante)
+    if not snapshot_pendente(serie, instante, periodo):
+        return False
+    inicio = instante.to_period(periodo).start_time
+    linha = pd.DataFrame([dict(valores)], index=pd.DatetimeIndex([inicio], name='data'))
+    return serie.acrescentar(linha) > 0
+
+
+def frequencia_para(inicio, fim, pontos_max=PONTOS_MAX_GRAFICO):
+    """Frequência mais fina que cobre ``[inicio, fim]`` com até ``pontos_max`` pontos."""
+    dias = max((pd.Timestamp(fim) - pd.Timestamp(inicio)).days, 0) + 1
+    for frequencia, dias_por_ponto in FREQUENCIAS_TENDENCIA.items():
+        if dias / dias_por_ponto <= pontos_max:
+            return frequencia
+    return list(FREQUENCIAS_TENDENCIA)[-1]
+
+
+def tendencia(serie, inicio=None, fim=None, pontos_max=PONTOS_MAX_GRAFICO):
+    """Faixa ``[inicio, fim]`` da série, reamostrada (média) para o gráfico."""
+    faixa = serie.consultar(inicio, fim)
+    if faixa.empty:
+        return faixa
+    frequencia = frequencia_para(faixa.index[0], faixa.index[-1], pontos_max)
+    if frequencia is None:
+        return faixa
+    return faixa.resample(frequencia).mean().dropna(how='all')
@@ -0,0 +1,154 @@
+"""
+Índice leve id -> arquivo/nome/cargo dos agentes.
+
+Seletores e buscas só precisam de poucos campos de cada funcionário, não
+do registro inteiro. O índice guarda esses campos e o mtime de cada arquivo
+em ``data/indice_agentes.json``; ao atualizar, só arquivos novos ou
+alterados são relidos. O registro completo (aninhado, como no JSON) é lido
+sob demanda, um arquivo por vez, com ``carregar``.
+
+O índice é compartilhado entre sessões (e cada tecla no typeahead é um
+rerun): a varredura do diretório roda no máximo uma vez a cada
+``INTERVALO_VARREDURA_SEGUNDOS``, e atualização e leituras passam por uma
+trava.
+"""
+
+import json
+import os
+import threading
+import time
+
+DIRETORIO_AGENTES = "data/agents"
+ARQUIVO_INDICE = "data/indice_agentes.json"
+
+# Campos de seleção e os textos indexados pela busca (``humaniq.busca``)
+CAMPOS_INDICE = ('nome', 'cargo', 'departamento', 'equipe_atual',
+                 'competencias', 'objetivos_carreira')
+
+# Intervalo mínimo entre varreduras do diretório em ``atualizar``
+INTERVALO_VARREDURA_SEGUNDOS = 10
+
+
+def _campos(registro, campos):
+    return {campo: registro.get(campo) for campo in campos}
+
+
+class IndiceAgentes:
+    """Campos de seleção de todos os agentes, mantidos por mtime de arquivo."""
+
+    def __init__(self, diretorio=DIRETORIO_AGENTES, caminho=ARQUIVO_INDICE,
+                 campos=CAMPOS_INDICE, intervalo=INTERVALO_VARREDURA_SEGUNDOS):
+        self.diretorio = diretorio
+        self.caminho = caminho
+        self.campos = tuple(campos)
+        self.arquivos = {}
+        self._por_id = {}
+        # Incrementada a cada mudança: chave de caches derivados do índice
+        self.versao = 0
+        self.intervalo = intervalo
+        self._ultima_varredura = None
+        self._lock = threading.Lock()
+        self._ler()
+
+    def _ler(self):
+        if not os.path.exists(self.caminho):
+            return
+        with open(self.caminho, 'r', encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+        # Índice gravado com outros campos ou de outro diretório: reconstrói
+        if (tuple(dados.get('campos', ())) == self.campos
+                and dados.get('diretorio') == self.diretorio):
+            self.arquivos = dados.get('arquivos', {})
+            self._reindexar()
+
+    def _salvar(self):
+        os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+        temporario = self.caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump({'campos': list(self.campos), 'diretorio': self.diretorio,
+                       'arquivos': self.arquivos}, arquivo, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
+
+    def _reindexar(self):
+        self._por_id = {entrada['id']: arquivo for arquivo, entrada in self.arquivos.items()}
+
+    def atualizar(self, forcar=False):
+        """
+        Relê arquivos novos/alterados; retorna quantas entradas mudaram.
+
+        Dentro de ``intervalo`` segundos da última varredura não faz nada,
+        a menos que ``forcar``.
+        """
+        with self._lock:
+            agora = time.monotonic()
+            if (not forcar and self._ultima_varredura is not None
+                    and agora - self._ultima_varredura < self.intervalo):
+                return 0
+            self._ultima_varredura = agora
+            return self._atualizar()
+
+    def _atualizar(self):
+        if not os.path.isdir(self.diretorio):
+            atuais = {}
+        else:
+            with os.scandir(self.diretorio) as entradas:
+                atuais = {entrada.name: entrada.stat().st_mtime_ns
+                          for entrada in entradas if entrada.name.endswith('.json')}
+
+        removidos = [arquivo for arquivo in self.arquivos if arquivo not in atuais]
+        alterados = [arquivo for arquivo, mtime in atuais.items()
+                     if self.arquivos.get(arquivo, {}).get('mtime') != mtime]
+        for arquivo in removidos:
+            del self.arquivos[arquivo]
+        for arquivo in alterados:
+            with open(os.path.join(self.diretorio, arquivo), 'r', encoding='utf-8') as f:
+                registro = json.load(f)
+            self.arquivos[arquivo] = {
+                'mtime': atuais[arquivo],
+                'id': registro.get('id_funcionario', os.path.splitext(arquivo)[0]),
+                **_campos(registro, self.campos),
+            }
+
+        if removidos or alterados:
+            self._reindexar()
+            self._salvar()
+            self.versao += 1
+        return len(removidos) + len(alterados)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._por_id)
+
+    def __contains__(self, id_funcionario):
+        with self._lock:
+            return id_funcionario in self._por_id
+
+    def ids(self):
+        """Ids ordenados."""
+        with self._lock:
+            return sorted(self._por_id)
+
+    def entrada(self, id_funcionario):
+        """Campos indexados de um funcionário (sem ler o arquivo)."""
+        with self._lock:
+            return self.arquivos[self._por_id[id_funcionario]]
+
+    def entradas(self):
+        """``{id: campos indexados}`` de todos os funcionários, ordenado por id (cópia consistente)."""
+        with self._lock:
+            return {id_funcionario: self.arquivos[self._por_id[id_funcionario]]
+                    for id_funcionario in sorted(self._por_id)}
+
+    def rotulo(self, id_funcionario):
+        """Texto para seletores: ``Nome (Cargo)``."""
+        entrada = self.entrada(id_funcionario)
+        return f"{entrada.get('nome')} ({entrada.get('cargo')})"
+
+    def arquivo(self, id_funcionario):
+        with self._lock:
+            return os.path.join(self.diretorio, self._por_id[id_funcionario])
+
+    def carregar(self, id_funcionario):
+        """Registro completo (aninhado) de um funcionário, lido sob demanda."""
+        with open(self.arquivo(id_funcionario), 'r', encoding='utf-8') as arquivo:
+            return json.load(arquivo)
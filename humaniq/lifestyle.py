@@ -0,0 +1,122 @@
+"""
+Perfis de lifestyle dos funcionários.
+
+Idade, filhos, modalidade de trabalho e transporte não vêm nos registros
+gerados por versões antigas do generate_agents.py. Em vez de sortear esses
+atributos a cada execução, cada funcionário recebe uma semente estável
+derivada do seu id; os perfis gerados ficam persistidos em
+``data/lifestyle_profiles.json``, ao lado dos agentes. Quando o registro do
+agente já traz um bloco ``lifestyle``, ele tem precedência.
+"""
+
+import json
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+ARQUIVO_LIFESTYLE = "data/lifestyle_profiles.json"
+
+MODALIDADES_TRABALHO = ['Presencial', 'Híbrido', 'Remoto']
+MEIOS_TRANSPORTE = ['Carro', 'Transporte Público', 'Bicicleta', 'Caminhada']
+
+# Colunas persistidas (as preferências derivam da personalidade e não são guardadas)
+CAMPOS_LIFESTYLE = ('idade', 'tem_filhos', 'modalidade_trabalho', 'transporte')
+
+
+def semente_funcionario(id_funcionario, contexto='lifestyle'):
+    """Semente determinística por funcionário (CRC32 de ``contexto:id``)."""
+    return zlib.crc32(f"{contexto}:{id_funcionario}".encode('utf-8'))
+
+
+def gerar_lifestyle(id_funcionario):
+    """Sorteia o lifestyle de um funcionário com a semente do seu id."""
+    rng = np.random.default_rng(semente_funcionario(id_funcionario))
+    return {
+        'idade': int(rng.integers(22, 56)),
+        'tem_filhos': bool(rng.random() < 0.5),
+        'modalidade_trabalho': str(rng.choice(MODALIDADES_TRABALHO)),
+        'transporte': str(rng.choice(MEIOS_TRANSPORTE)),
+    }
+
+
+def _booleano(valor):
+    if isinstance(valor, str):
+        return valor.strip().lower() in ('true', '1', 'sim')
+    return bool(valor)
+
+
+def _normalizar(perfil):
+    """Garante os tipos dos campos (JSON e pandas podem trazer strings ou floats)."""
+    return {
+        'idade': int(perfil['idade']),
+        'tem_filhos': _booleano(perfil['tem_filhos']),
+        'modalidade_trabalho': str(perfil['modalidade_trabalho']),
+        'transporte': str(perfil['transporte']),
+    }
+
+
+def _completo(perfil):
+    return all(campo in perfil and not pd.isna(perfil[campo]) for campo in CAMPOS_LIFESTYLE)
+
+
+def ler_perfis(caminho=ARQUIVO_LIFESTYLE):
+    """Lê os perfis persistidos (id -> dict); vazio se o arquivo não existe."""
+    if not os.path.exists(caminho):
+        return {}
+    try:
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
+    return {id_: perfil for id_, perfil in dados.items()
+            if isinstance(perfil, dict) and _completo(perfil)}
+
+
+def salvar_perfis(perfis, caminho=ARQUIVO_LIFESTYLE):
+    """Grava os perfis de forma atômica (arquivo temporário + rename)."""
+    diretorio = os.path.dirname(caminho)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(perfis, arquivo, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(temporario, caminho)
+
+
+def carregar_lifestyle(df_funcionarios, caminho=ARQUIVO_LIFESTYLE):
+    """
+    Lifestyle de todos os funcionários (index = id_funcionario).
+
+    Ordem de precedência: colunas ``lifestyle.*`` dos registros dos agentes,
+    perfis persistidos em ``caminho`` e, por fim, geração determinística. Os
+    perfis gerados são acrescentados ao arquivo para as próximas execuções.
+    """
+    persistidos = ler_perfis(caminho)
+    colunas_registro = {campo: f"lifestyle.{campo}" for campo in CAMPOS_LIFESTYLE}
+    tem_registro = all(coluna in df_funcionarios.columns for coluna in colunas_registro.values())
+
+    perfis, novos = {}, {}
+    for posicao, id_funcionario in enumerate(df_funcionarios.index):
+        chave = str(id_funcionario)
+        if tem_registro:
+            registro = {campo: df_funcionarios[coluna].iat[posicao]
+                        for campo, coluna in colunas_registro.items()}
+            if _completo(registro):
+                perfis[chave] = _normalizar(registro)
+                continue
+        if chave in persistidos:
+            perfis[chave] = _normalizar(persistidos[chave])
+        else:
+            perfis[chave] = novos[chave] = gerar_lifestyle(chave)
+
+    if novos:
+        try:
+            salvar_perfis({**persistidos, **novos}, caminho)
+        except OSError:
+            # Sem permissão de escrita: os perfis continuam determinísticos
+            pass
+
+    return pd.DataFrame([perfis[str(id_)] for id_ in df_funcionarios.index],
+                        index=df_funcionarios.index, columns=list(CAMPOS_LIFESTYLE))
@@ -0,0 +1,164 @@
+"""
+Marketplace interno de trocas de benefícios.
+
+Cada funcionário tem benefícios que possui (``posse``) e uma relevância por
+benefício. Quem possui ``x`` com baixa relevância e não possui ``y`` com alta
+relevância publica a oferta ``x -> y``. As ofertas são arestas de um grafo
+cujos nós são os benefícios; uma troca viável é um ciclo nesse grafo (2
+pessoas trocam entre si, 3 ou mais trocam em roda). As ofertas ficam em filas
+indexadas por ``(dá, recebe)``, ordenadas por ganho, e os ciclos do grafo de
+benefícios (poucos nós) são enumerados uma vez; o casamento consome as filas
+sem comparar pares de funcionários.
+"""
+
+import numpy as np
+import pandas as pd
+
+from humaniq.lifestyle import semente_funcionario
+
+# Relevância abaixo da qual o funcionário aceita abrir mão do benefício
+LIMIAR_OFERTA = 45
+
+# Ganho mínimo de relevância (pontos) para uma oferta valer a troca
+GANHO_MINIMO = 20
+
+# Ofertas por funcionário mantidas no índice (as de maior ganho)
+OFERTAS_POR_FUNCIONARIO = 3
+
+# Funcionários processados por bloco ao montar as ofertas
+LINHAS_POR_BLOCO = 8192
+
+
+def matriz_posse(ids, beneficios, atuais=None, proporcao=0.5):
+    """
+    Matriz booleana ``(funcionários, benefícios)`` dos benefícios atuais.
+
+    ``atuais`` mapeia id -> lista de benefícios (ex.: ``beneficios_atuais``
+    do registro do agente). Quem não tem registro recebe uma adesão sorteada
+    com a semente do próprio id, estável entre execuções.
+    """
+    beneficios = list(beneficios)
+    indice = {beneficio: j for j, beneficio in enumerate(beneficios)}
+    posse = np.zeros((len(ids), len(beneficios)), dtype=bool)
+    atuais = atuais if atuais is not None else {}
+
+    for i, id_funcionario in enumerate(ids):
+        registro = atuais.get(id_funcionario)
+        if isinstance(registro, (list, tuple, set)):
+            for beneficio in registro:
+                if beneficio in indice:
+                    posse[i, indice[beneficio]] = True
+        else:
+            rng = np.random.default_rng(semente_funcionario(id_funcionario, 'beneficios'))
+            posse[i] = rng.random(len(beneficios)) < proporcao
+    return posse
+
+
+def listar_ofertas(posse, relevancia, custos=None, tolerancia_custo=None,
+                   limiar_oferta=LIMIAR_OFERTA, ganho_minimo=GANHO_MINIMO,
+                   ofertas_por_funcionario=OFERTAS_POR_FUNCIONARIO):
+    """
+    Ofertas ``(funcionário, dá, recebe, ganho)`` de toda a força de trabalho.
+
+    Com ``custos`` e ``tolerancia_custo``, o benefício recebido pode custar no
+    máximo ``(1 + tolerancia_custo)`` vezes o benefício cedido.
+    """
+    posse = np.asarray(posse, dtype=bool)
+    relevancia = np.asarray(relevancia, dtype=float)
+    custo_ok = None
+    if custos is not None and tolerancia_custo is not None:
+        custos = np.asarray(custos, dtype=float)
+        custo_ok = custos[None, :] <= custos[:, None] * (1 + tolerancia_custo)
+
+    # Tensor [funcionário, dá, recebe] montado em blocos para limitar a memória
+    partes = []
+    for inicio in range(0, len(posse), LINHAS_POR_BLOCO):
+        bloco = slice(inicio, inicio + LINHAS_POR_BLOCO)
+        rel = relevancia[bloco]
+        cede = posse[bloco] & (rel < limiar_oferta)
+        ganho = rel[:, None, :] - rel[:, :, None]
+        validas = cede[:, :, None] & ~posse[bloco][:, None, :] & (ganho >= ganho_minimo)
+        if custo_ok is not None:
+            validas &= custo_ok[None]
+        pessoa, da, recebe = np.nonzero(validas)
+        partes.append((pessoa + inicio, da, recebe, ganho[pessoa, da, recebe]))
+
+    if not partes or not sum(len(parte[0]) for parte in partes):
+        return pd.DataFrame(columns=['pessoa', 'da', 'recebe', 'ganho'])
+    pessoa, da, recebe, ganho = (np.concatenate(coluna) for coluna in zip(*partes))
+
+    # Mantém as ofertas de maior ganho de cada funcionário
+    ordem = np.lexsort((-ganho, pessoa))
+    pessoa, da, recebe, ganho = pessoa[ordem], da[ordem], recebe[ordem], ganho[ordem]
+    inicio = np.flatnonzero(np.r_[True, pessoa[1:] != pessoa[:-1]])
+    posicao = np.arange(len(pessoa)) - np.repeat(inicio, np.diff(np.r_[inicio, len(pessoa)]))
+    manter = posicao < ofertas_por_funcionario
+
+    return pd.DataFrame({'pessoa': pessoa[manter], 'da': da[manter],
+                         'recebe': recebe[manter], 'ganho': ganho[manter]})
+
+
+def _ciclos(arestas, n_nos, tamanho_maximo):
+    """Ciclos simples do grafo de benefícios até ``tamanho_maximo`` arestas."""
+    vizinhos = {}
+    for origem, destino in arestas:
+        vizinhos.setdefault(origem, []).append(destino)
+
+    ciclos = []
+    for inicio in range(n_nos):
+        # Cada ciclo é gerado uma única vez, a partir do seu menor nó
+        pilha = [(inicio, [inicio])]
+        while pilha:
+            no, caminho = pilha.pop()
+            for proximo in vizinhos.get(no, ()):
+                if proximo == inicio:
+                    ciclos.append(tuple(caminho))
+                elif proximo > inicio and proximo not in caminho and len(caminho) < tamanho_maximo:
+                    pilha.append((proximo, caminho + [proximo]))
+    return sorted(ciclos, key=len)
+
+
+def casar_trocas(ofertas, tamanho_maximo=3):
+    """
+    Casa ofertas em ciclos de troca; cada funcionário entra em no máximo uma.
+
+    Ciclos mais curtos são preenchidos primeiro (2 pessoas antes de 3) e,
+    em cada aresta, as ofertas de maior ganho têm prioridade. Retorna uma
+    lista de trocas, cada uma uma lista de ``(pessoa, dá, recebe, ganho)``.
+    """
+    if ofertas.empty:
+        return []
+
+    # Índice (dá, recebe) -> ofertas ordenadas por ganho
+    filas = {}
+    ordenadas = ofertas.sort_values('ganho', ascending=False, kind='stable')
+    for oferta in ordenadas.itertuples(index=False):
+        filas.setdefault((oferta.da, oferta.recebe), []).append(
+            (int(oferta.pessoa), int(oferta.da), int(oferta.recebe), float(oferta.ganho)))
+    cursores = dict.fromkeys(filas, 0)
+
+    usados = set()
+
+    def proxima(aresta):
+        fila = filas[aresta]
+        cursor = cursores[aresta]
+        while cursor < len(fila) and fila[cursor][0] in usados:
+            cursor += 1
+        cursores[aresta] = cursor
+        return fila[cursor] if cursor < len(fila) else None
+
+    n_nos = int(max(ofertas['da'].max(), ofertas['recebe'].max())) + 1
+    trocas = []
+    for ciclo in _ciclos(filas.keys(), n_nos, tamanho_maximo):
+        arestas = list(zip(ciclo, ciclo[1:] + ciclo[:1]))
+        while True:
+            participantes = [proxima(aresta) for aresta in arestas]
+            if any(p is None for p in participantes):
+                break
+            if len({p[0] for p in participantes}) < len(participantes):
+                # Em ciclos com 4+ benefícios a mesma pessoa pode ocupar duas arestas
+                break
+            usados.update(p[0] for p in participantes)
+            trocas.append(participantes)
+
+    return trocas
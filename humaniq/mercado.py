@@ -0,0 +1,108 @@
+"""
+Benchmarking salarial contra dados de mercado.
+
+A tabela de mercado ``cargo -> senioridade -> faixa`` vira arrays
+``(cargos, senioridades)``; cada funcionário é ligado à sua faixa pelos
+códigos categóricos de cargo e senioridade (um join por indexação, sem
+lookup por linha) e gap, posição na faixa e custo de substituição são
+calculados como colunas.
+"""
+
+import numpy as np
+import pandas as pd
+
+from humaniq.lifestyle import semente_funcionario
+
+SENIORIDADES = ('junior', 'pleno', 'senior')
+
+# Limites (meses de casa) entre júnior/pleno e pleno/sênior
+LIMITES_SENIORIDADE = (12, 36)
+
+CAMPOS_FAIXA = ('min', 'max', 'medio', 'crescimento_anual')
+
+# Custo de substituição em múltiplos do salário mensal de mercado
+MULTIPLICADORES_SUBSTITUICAO = {
+    'recrutamento': 0.5,
+    'onboarding': 1.0,
+    'treinamento': 0.8,
+    'produtividade_perdida': 2.0,
+    'knowledge_loss': 0.7,
+}
+
+SALARIO_MERCADO_PADRAO = 8000
+
+
+def classificar_senioridade(tempo_casa):
+    """Senioridade (júnior até 12 meses, pleno até 36, sênior acima) em lote."""
+    tempo_casa = np.asarray(tempo_casa, dtype=float)
+    codigos = np.searchsorted(LIMITES_SENIORIDADE, tempo_casa, side='left')
+    return pd.Categorical.from_codes(codigos, categories=list(SENIORIDADES))
+
+
+def tabela_mercado(salarios_por_cargo):
+    """Achata ``cargo -> senioridade -> faixa`` em um DataFrame longo."""
+    return pd.DataFrame([
+        {'cargo': cargo, 'senioridade': senioridade, **faixa}
+        for cargo, faixas in salarios_por_cargo.items()
+        for senioridade, faixa in faixas.items()
+    ])
+
+
+def variacao_estavel(ids, amplitude, contexto='salario'):
+    """Variação uniforme em ``[-amplitude, amplitude)`` fixa por funcionário."""
+    sorteio = np.array([semente_funcionario(id_, contexto) for id_ in ids],
+                       dtype=float) / 2 ** 32
+    return (2 * sorteio - 1) * amplitude
+
+
+def benchmark_salarial(cargos, tempo_casa, salarios_por_cargo, salario_interno):
+    """
+    Faixa de mercado, gap e posição na faixa de cada funcionário.
+
+    ``cargos``, ``tempo_casa`` e ``salario_interno`` são alinhados (mesmo
+    índice, se forem ``pd.Series``). Funcionários cujo cargo não está na
+    tabela de mercado ficam de fora. Retorna um DataFrame com ``cargo``,
+    ``senioridade``, ``salario_interno``, ``salario_mercado``,
+    ``gap_salarial`` (%), ``min_mercado``, ``max_mercado``,
+    ``crescimento_anual`` e ``percentil_faixa`` (0 = mínimo, 100 = máximo).
+    """
+    cargos = pd.Series(cargos)
+    indice = cargos.index
+    nomes_cargos = list(salarios_por_cargo)
+
+    # Tabela (cargo, senioridade, campo) indexada pelos códigos categóricos
+    valores = np.full((len(nomes_cargos), len(SENIORIDADES), len(CAMPOS_FAIXA)), np.nan)
+    for i, cargo in enumerate(nomes_cargos):
+        for j, senioridade in enumerate(SENIORIDADES):
+            faixa = salarios_por_cargo[cargo].get(senioridade)
+            if faixa:
+                valores[i, j] = [faixa[campo] for campo in CAMPOS_FAIXA]
+
+    codigo_cargo = pd.Categorical(cargos, categories=nomes_cargos).codes
+    senioridade = classificar_senioridade(tempo_casa)
+    presentes = codigo_cargo >= 0
+    faixas = valores[codigo_cargo[presentes], senioridade.codes[presentes]]
+
+    interno = np.asarray(salario_interno, dtype=float)[presentes]
+    minimo, maximo, medio, crescimento = faixas.T
+    amplitude = np.where(maximo > minimo, maximo - minimo, np.nan)
+
+    return pd.DataFrame({
+        'cargo': cargos.to_numpy()[presentes],
+        'senioridade': np.asarray(senioridade)[presentes],
+        'salario_interno': np.round(interno, 0),
+        'salario_mercado': medio,
+        'gap_salarial': np.round((interno - medio) / medio * 100, 1),
+        'min_mercado': minimo,
+        'max_mercado': maximo,
+        'crescimento_anual': crescimento,
+        'percentil_faixa': np.clip((interno - minimo) / amplitude * 100, 0, 100),
+    }, index=indice[presentes])
+
+
+def custo_substituicao(salario_mercado):
+    """Componentes e total do custo de substituição (escalar ou vetor)."""
+    salario_mercado = np.asarray(salario_mercado, dtype=float)
+    custos = {componente: salario_mercado * fator
+              for componente, fator in MULTIPLICADORES_SUBSTITUICAO.items()}
+    return custos, sum(custos.values())
@@ -0,0 +1,73 @@
+"""
+Alocação ótima de remanejamentos internos.
+
+Cada candidato (pessoa, cargo sugerido, benefício) vira uma aresta de um
+grafo bipartido esparso pessoas × vagas. A soma de ``beneficio_estimado`` é
+maximizada respeitando as vagas de cada cargo e no máximo um movimento por
+pessoa, via emparelhamento de custo mínimo (LAPJV esparso do SciPy).
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+
+def alocar_remanejamentos(candidatos, vagas_por_cargo, coluna_pessoa='id',
+                          coluna_cargo='cargo_sugerido', coluna_beneficio='beneficio_estimado'):
+    """
+    Escolhe o conjunto de movimentos de maior benefício total.
+
+    ``candidatos`` é um DataFrame com uma linha por par (pessoa, cargo);
+    ``vagas_por_cargo`` mapeia cargo -> número de vagas. Retorna as linhas
+    escolhidas de ``candidatos``, ordenadas pelo benefício.
+    """
+    candidatos = candidatos[
+        (candidatos[coluna_beneficio] > 0) &
+        (candidatos[coluna_cargo].map(vagas_por_cargo).fillna(0) > 0)
+    ].sort_values(coluna_beneficio, ascending=False, kind='stable')
+    candidatos = candidatos.drop_duplicates([coluna_pessoa, coluna_cargo]).reset_index(drop=True)
+    if candidatos.empty:
+        return candidatos
+
+    pessoas, linha_pessoa = np.unique(candidatos[coluna_pessoa].astype(str).to_numpy(),
+                                      return_inverse=True)
+    cargos, indice_cargo = np.unique(candidatos[coluna_cargo].astype(str).to_numpy(),
+                                     return_inverse=True)
+
+    # Vagas além do número de candidatos do cargo nunca seriam usadas
+    vagas = np.minimum([int(vagas_por_cargo.get(cargo, 0)) for cargo in cargos],
+                       np.bincount(indice_cargo, minlength=len(cargos)))
+    primeira_vaga = np.concatenate([[0], np.cumsum(vagas)[:-1]])
+    total_vagas = int(vagas.sum())
+
+    # Arestas pessoa -> cada vaga do cargo sugerido
+    repeticoes = vagas[indice_cargo]
+    linhas = np.repeat(linha_pessoa, repeticoes)
+    arestas = np.repeat(np.arange(len(candidatos)), repeticoes)
+    deslocamento = np.arange(len(linhas)) - np.repeat(np.cumsum(repeticoes) - repeticoes,
+                                                      repeticoes)
+    colunas = primeira_vaga[indice_cargo][arestas] + deslocamento
+
+    # Custos positivos (zero = sem aresta); "não mover" custa o máximo
+    beneficio = candidatos[coluna_beneficio].to_numpy(dtype=float)
+    teto = beneficio.max() + 1.0
+    custos = teto - beneficio[arestas]
+
+    n_pessoas = len(pessoas)
+    fica = np.arange(n_pessoas)
+    grafo = sparse.csr_matrix(
+        (np.concatenate([custos, np.full(n_pessoas, teto)]),
+         (np.concatenate([linhas, fica]), np.concatenate([colunas, total_vagas + fica]))),
+        shape=(n_pessoas, total_vagas + n_pessoas))
+
+    _, coluna_escolhida = min_weight_full_bipartite_matching(grafo)
+
+    # Recupera o candidato de cada pessoa alocada a uma vaga real
+    movidos = np.flatnonzero(coluna_escolhida < total_vagas)
+    cargo_da_vaga = np.repeat(np.arange(len(cargos)), vagas)
+    escolhidos = {(p, c) for p, c in zip(movidos, cargo_da_vaga[coluna_escolhida[movidos]])}
+    selecao = [i for i, (p, c) in enumerate(zip(linha_pessoa, indice_cargo))
+               if (p, c) in escolhidos]
+
+    return candidatos.iloc[selecao].sort_values(
+        coluna_beneficio, ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,72 @@
+"""
+Execução de blocos de simulação em processos.
+
+Os simuladores Monte Carlo dividem o trabalho em blocos independentes, cada
+um com sua própria semente; aqui esses blocos são distribuídos em um
+``ProcessPoolExecutor`` persistente, criado uma vez por processo com o
+contexto ``forkserver`` (ou ``spawn``) — o servidor do Streamlit tem várias
+threads, e ``fork`` de um processo com threads pode travar. Trabalhos
+pequenos (abaixo de ``LIMIAR_PROCESSOS``) rodam no processo atual, onde o
+custo de serializar os dados para os workers não compensa. Se o ambiente não
+permitir criar processos, os blocos também rodam no processo atual, com o
+mesmo resultado.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Unidades de trabalho (ex.: funcionário × trajetória × mês) abaixo das quais
+# os blocos rodam no processo atual
+LIMIAR_PROCESSOS = 5_000_000
+
+_lock = threading.Lock()
+_executores = {}
+
+
+def _contexto():
+    metodos = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in metodos else 'spawn')
+
+
+def _executor(n_processos):
+    """Pool persistente com ``n_processos`` workers (``None``: um por CPU)."""
+    with _lock:
+        executor = _executores.get(n_processos)
+        if executor is None:
+            try:
+                executor = ProcessPoolExecutor(max_workers=n_processos, mp_context=_contexto())
+            except (OSError, ValueError, NotImplementedError):
+                return None
+            _executores[n_processos] = executor
+        return executor
+
+
+def _descartar(n_processos, executor):
+    with _lock:
+        if _executores.get(n_processos) is executor:
+            del _executores[n_processos]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def executar_blocos(funcao, tarefas, n_processos=None, trabalho=None):
+    """
+    Aplica ``funcao(*tarefa)`` a cada tarefa, preservando a ordem.
+
+    ``funcao`` precisa ser importável (nível de módulo). Com ``trabalho``
+    abaixo de ``LIMIAR_PROCESSOS``, ou ``n_processos=1``, tudo roda no
+    processo atual.
+    """
+    tarefas = list(tarefas)
+    if trabalho is not None and trabalho < LIMIAR_PROCESSOS:
+        n_processos = 1
+    if n_processos != 1 and len(tarefas) > 1:
+        executor = _executor(n_processos)
+        if executor is not None:
+            try:
+                return list(executor.map(funcao, *zip(*tarefas)))
+            except (BrokenProcessPool, OSError):
+                # Workers indisponíveis: o pool é recriado na próxima chamada
+                _descartar(n_processos, executor)
+    return [funcao(*tarefa) for tarefa in tarefas]
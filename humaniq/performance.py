@@ -0,0 +1,82 @@
+"""
+Score de performance e ranking de top performers.
+
+O score combina última avaliação, metas, eNPS, feedback 360, risco de
+burnout e tempo de casa. A última nota é extraída uma única vez da lista
+``performance.avaliacoes_desempenho`` (``COLUNA_ULTIMA_NOTA``) e o score é
+calculado como coluna sobre o DataFrame inteiro; os top performers de todos
+os cargos saem de um único ``groupby`` + ``nlargest``.
+"""
+
+import numpy as np
+import pandas as pd
+
+COLUNA_ULTIMA_NOTA = 'performance.ultima_nota'
+
+# coluna -> (valor padrão, normalização, peso)
+COMPONENTES_PERFORMANCE = {
+    COLUNA_ULTIMA_NOTA: (5, 10, 0.30),
+    'performance.metas_atingidas_percentual': (75, 100, 0.25),
+    'engajamento.enps_recente': (5, 10, 0.15),
+    # O feedback 360 (escala 1-5) entra normalizado duas vezes, como no score original
+    'engajamento.feedback_360_media': (3, 25, 0.05),
+}
+PESO_BAIXO_BURNOUT = 0.15
+PESO_TEMPO_CASA = 0.10
+
+# Tempo de casa (meses) a partir do qual a estabilidade conta integralmente
+TEMPO_CASA_ESTAVEL = 36
+
+
+def ultima_nota(avaliacoes, padrao):
+    """Nota da avaliação mais recente de uma lista de avaliações."""
+    if isinstance(avaliacoes, list) and avaliacoes:
+        nota = avaliacoes[-1].get('nota', padrao)
+        return padrao if nota is None else nota
+    return padrao
+
+
+def extrair_ultima_nota(df_funcionarios, padrao=5):
+    """Coluna com a última nota de cada funcionário (uma passada pela lista)."""
+    if 'performance.avaliacoes_desempenho' not in df_funcionarios:
+        return pd.Series(float(padrao), index=df_funcionarios.index)
+    notas = [ultima_nota(avaliacoes, padrao) for avaliacoes
+             in df_funcionarios['performance.avaliacoes_desempenho'].tolist()]
+    return pd.Series(notas, index=df_funcionarios.index, dtype=float)
+
+
+def _coluna(df_funcionarios, nome, padrao):
+    if nome in df_funcionarios:
+        return df_funcionarios[nome].fillna(padrao).to_numpy(dtype=float)
+    return np.full(len(df_funcionarios), float(padrao))
+
+
+def calcular_score_performance(df_funcionarios):
+    """
+    Score de performance (0-100) de cada funcionário.
+
+    Usa ``COLUNA_ULTIMA_NOTA`` se já estiver no DataFrame; senão extrai a
+    última nota na hora.
+    """
+    if COLUNA_ULTIMA_NOTA not in df_funcionarios:
+        df_funcionarios = df_funcionarios.assign(
+            **{COLUNA_ULTIMA_NOTA: extrair_ultima_nota(df_funcionarios)})
+
+    score = np.zeros(len(df_funcionarios))
+    for coluna, (padrao, escala, peso) in COMPONENTES_PERFORMANCE.items():
+        score += _coluna(df_funcionarios, coluna, padrao) / escala * peso
+    score += (1 - _coluna(df_funcionarios, 'kpis_ia.risco_burnout', 5) / 10) * PESO_BAIXO_BURNOUT
+    score += np.minimum(_coluna(df_funcionarios, 'tempo_de_casa_meses', 12)
+                        / TEMPO_CASA_ESTAVEL, 1) * PESO_TEMPO_CASA
+
+    return pd.Series(np.round(score * 100, 2), index=df_funcionarios.index)
+
+
+def top_por_grupo(score, grupos, n):
+    """
+    Ids dos ``n`` maiores scores de cada grupo.
+
+    Retorna uma ``pd.Series`` de scores com índice ``(grupo, id)``, em ordem
+    decrescente dentro de cada grupo.
+    """
+    return score.groupby(grupos, sort=False).nlargest(n)
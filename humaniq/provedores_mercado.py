@@ -0,0 +1,279 @@
+"""
+Provedores de dados de mercado, com cache em disco e histórico incremental.
+
+Um provedor entrega quatro recursos: ``salarios_por_cargo``,
+``demanda_skills``, ``employer_branding`` e ``historico`` (métricas
+mensais). Há duas implementações: arquivos CSV/Parquet depositados em um
+diretório (``ProvedorArquivos``) e um feed HTTP com os mesmos recursos em
+JSON (``ProvedorHTTP``); ``servidor_local`` expõe qualquer provedor nesse
+formato, servindo de substituto local para o feed de um fornecedor.
+
+``CacheMercado`` guarda cada recurso em disco com TTL. Recursos vencidos são
+devolvidos como estão enquanto uma thread em segundo plano busca a versão
+nova, de modo que a página não espera pelo provedor; só a primeira carga é
+bloqueante. O histórico é acrescentado a uma ``SerieTemporal`` apenas com as
+linhas posteriores à última gravada.
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from humaniq.serie_temporal import SerieTemporal
+
+RECURSOS = ('salarios_por_cargo', 'demanda_skills', 'employer_branding')
+
+# Linha de employer_branding com os dados da própria empresa
+NOSSA_EMPRESA = 'nossa_empresa'
+
+TTL_PADRAO_SEGUNDOS = 24 * 3600
+
+
+# --- Conversão tabela -> estrutura usada pelas páginas ---
+
+def _registros(tabela, chave):
+    """Linhas da tabela como dict ``chave -> demais colunas`` (tipos nativos)."""
+    tabela = tabela.set_index(chave)
+    return {indice: {coluna: valor for coluna, valor in linha.items() if pd.notna(valor)}
+            for indice, linha in zip(tabela.index, tabela.to_dict('records'))}
+
+
+def _salarios_por_cargo(tabela):
+    salarios = {}
+    for (cargo, senioridade), faixa in _registros(tabela, ['cargo', 'senioridade']).items():
+        salarios.setdefault(cargo, {})[senioridade] = faixa
+    return salarios
+
+
+def _employer_branding(tabela):
+    empresas = _registros(tabela, 'empresa')
+    return {
+        'nossa_empresa': empresas.pop(NOSSA_EMPRESA, {}),
+        'concorrentes': empresas,
+    }
+
+
+CONVERSORES = {
+    'salarios_por_cargo': _salarios_por_cargo,
+    'demanda_skills': lambda tabela: _registros(tabela, 'skill'),
+    'employer_branding': _employer_branding,
+}
+
+
+# --- Provedores ---
+
+class ProvedorMercado(ABC):
+    """Interface: subclasses implementam ``tabela(recurso, desde=None)``."""
+
+    @abstractmethod
+    def tabela(self, recurso, desde=None):
+        """Recurso em formato longo (``pd.DataFrame``), como no arquivo/feed."""
+
+    def obter(self, recurso):
+        """Recurso convertido para a estrutura aninhada usada pelas páginas."""
+        return CONVERSORES[recurso](self.tabela(recurso))
+
+    def historico(self, desde=None):
+        """Métricas mensais (coluna ``data``) posteriores a ``desde``."""
+        historico = self.tabela('historico', desde=desde)
+        if 'data' not in historico:
+            return pd.DataFrame(columns=['data'])
+        historico['data'] = pd.to_datetime(historico['data'])
+        if desde is not None:
+            historico = historico[historico['data'] > pd.Timestamp(desde)]
+        return historico.sort_values('data', kind='stable')
+
+
+class ProvedorArquivos(ProvedorMercado):
+    """Lê ``<diretorio>/<recurso>.parquet`` ou ``<recurso>.csv``."""
+
+    def __init__(self, diretorio):
+        self.diretorio = diretorio
+
+    def tabela(self, recurso, desde=None):
+        base = os.path.join(self.diretorio, recurso)
+        if os.path.exists(base + '.parquet'):
+            try:
+                return pd.read_parquet(base + '.parquet')
+            except ImportError:
+                # Sem pyarrow/fastparquet: usa o CSV, se houver
+                if not os.path.exists(base + '.csv'):
+                    raise
+        if os.path.exists(base + '.csv'):
+            return pd.read_csv(base + '.csv')
+        raise FileNotFoundError(f"Recurso '{recurso}' não encontrado em '{self.diretorio}'")
+
+
+class ProvedorHTTP(ProvedorMercado):
+    """Busca ``GET <url_base>/<recurso>[?desde=AAAA-MM-DD]`` (lista JSON de registros)."""
+
+    def __init__(self, url_base, timeout=10):
+        self.url_base = url_base.rstrip('/')
+        self.timeout = timeout
+
+    def tabela(self, recurso, desde=None):
+        url = f"{self.url_base}/{recurso}"
+        if desde is not None:
+            url += '?' + urllib.parse.urlencode({'desde': pd.Timestamp(desde).date().isoformat()})
+        with urllib.request.urlopen(url, timeout=self.timeout) as resposta:
+            return pd.DataFrame(json.load(resposta))
+
+
+def provedor_de_fonte(fonte):
+    """Provedor HTTP para URLs, de arquivos para diretórios."""
+    if fonte.startswith(('http://', 'https://')):
+        return ProvedorHTTP(fonte)
+    return ProvedorArquivos(fonte)
+
+
+def servidor_local(provedor, porta=8765, host='127.0.0.1'):
+    """
+    Servidor HTTP que expõe ``provedor`` no formato lido por ``ProvedorHTTP``.
+
+    Retorna o ``ThreadingHTTPServer`` sem iniciá-lo; chame
+    ``serve_forever()`` (em uma thread, se necessário).
+    """
+    class Manipulador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urllib.parse.urlsplit(self.path)
+            recurso = url.path.strip('/')
+            desde = urllib.parse.parse_qs(url.query).get('desde', [None])[0]
+            if recurso not in RECURSOS + ('historico',):
+                self.send_error(404, f"Recurso desconhecido: {recurso}")
+                return
+            try:
+                if recurso == 'historico':
+                    tabela = provedor.historico(desde)
+                    tabela['data'] = tabela['data'].dt.strftime('%Y-%m-%d')
+                else:
+                    tabela = provedor.tabela(recurso)
+            except (OSError, ValueError) as erro:
+                self.send_error(503, str(erro))
+                return
+            corpo = tabela.to_json(orient='records', force_ascii=False).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            pass
+
+    return ThreadingHTTPServer((host, porta), Manipulador)
+
+
+# --- Cache com TTL e atualização em segundo plano ---
+
+class CacheMercado:
+    """
+    Cache em disco dos recursos de ``provedor``.
+
+    Cada recurso fica em ``<diretorio>/<recurso>.json``; a idade é o mtime
+    do arquivo. O histórico vai para a série ``<diretorio>/historico`` e a
+    hora da última sincronização para ``historico.sincronizado``.
+    """
+
+    def __init__(self, provedor, diretorio, ttl_segundos=TTL_PADRAO_SEGUNDOS):
+        self.provedor = provedor
+        self.diretorio = diretorio
+        self.ttl_segundos = ttl_segundos
+        self.serie = None
+        self.ultimo_erro = None
+        self._trava = threading.Lock()
+        self._em_andamento = set()
+
+    def _caminho(self, recurso):
+        return os.path.join(self.diretorio, f"{recurso}.json")
+
+    def _vencido(self, caminho):
+        return time.time() - os.path.getmtime(caminho) > self.ttl_segundos
+
+    def _em_segundo_plano(self, chave, funcao):
+        """Roda ``funcao`` em uma thread, no máximo uma por ``chave``."""
+        with self._trava:
+            if chave in self._em_andamento:
+                return
+            self._em_andamento.add(chave)
+
+        def executar():
+            try:
+                funcao()
+                self.ultimo_erro = None
+            except (OSError, ValueError, KeyError) as erro:
+                # Mantém a cópia vencida; a próxima leitura tenta de novo
+                self.ultimo_erro = erro
+            finally:
+                with self._trava:
+                    self._em_andamento.discard(chave)
+
+        threading.Thread(target=executar, name=f"mercado-{chave}", daemon=True).start()
+
+    def _buscar(self, recurso):
+        dados = self.provedor.obter(recurso)
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho = self._caminho(recurso)
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+        os.replace(temporario, caminho)
+        return dados
+
+    def obter(self, recurso):
+        """Recurso do cache; se vencido, dispara a atualização e devolve o atual."""
+        caminho = self._caminho(recurso)
+        if not os.path.exists(caminho):
+            return self._buscar(recurso)
+        if self._vencido(caminho):
+            self._em_segundo_plano(recurso, lambda: self._buscar(recurso))
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+
+    def _sincronizar_historico(self):
+        serie = self.serie
+        novos = self.provedor.historico(serie.ultimo_tempo() if serie else None)
+        if serie is None:
+            colunas = [coluna for coluna in novos.columns if coluna != 'data']
+            if not colunas:
+                # Fonte sem histórico: nada a criar; a próxima leitura tenta de novo
+                return
+            serie = SerieTemporal(os.path.join(self.diretorio, 'historico'), colunas)
+        serie.acrescentar(novos)
+        self.serie = serie
+        os.makedirs(self.diretorio, exist_ok=True)
+        with open(os.path.join(self.diretorio, 'historico.sincronizado'), 'w') as arquivo:
+            arquivo.write(pd.Timestamp.now().isoformat())
+
+    def historico(self, inicio=None, fim=None, frequencia=None, meses=None):
+        """
+        Faixa do histórico; a sincronização incremental roda em segundo plano.
+
+        Com ``meses`` (e sem ``inicio``), devolve os últimos ``meses`` meses
+        até o registro mais recente. Se a sincronização bloqueante falha, o
+        erro fica em ``ultimo_erro`` e a faixa vem do que já está gravado
+        (vazia, se nada foi gravado ainda).
+        """
+        marcador = os.path.join(self.diretorio, 'historico.sincronizado')
+        if self.serie is None and os.path.exists(os.path.join(self.diretorio, 'historico')):
+            self.serie = SerieTemporal(os.path.join(self.diretorio, 'historico'))
+        if self.serie is None or not len(self.serie) or not os.path.exists(marcador):
+            try:
+                self._sincronizar_historico()
+                self.ultimo_erro = None
+            except (OSError, ValueError, KeyError) as erro:
+                self.ultimo_erro = erro
+        elif self._vencido(marcador):
+            self._em_segundo_plano('historico', self._sincronizar_historico)
+
+        if self.serie is None:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name='data'))
+        if meses is not None and inicio is None and len(self.serie):
+            inicio = self.serie.ultimo_tempo() - pd.DateOffset(months=meses)
+        return self.serie.consultar(inicio, fim, frequencia)
@@ -0,0 +1,163 @@
+"""
+Armazenamento compacto, só de acréscimo, para séries temporais.
+
+Cada série é um diretório com três arquivos: ``colunas.json`` (nomes das
+métricas), ``tempos.i8`` (instantes em segundos, int64, crescentes) e
+``valores.f8`` (uma linha float64 por instante). Acrescentar é um append
+binário nos dois arquivos; consultar um intervalo é uma busca binária sobre
+os tempos mapeados em memória, lendo do disco só as linhas do intervalo.
+
+Métricas novas (pedidas ao abrir a série ou presentes nos dados
+acrescentados) viram colunas novas: ``valores.f8`` é regravado com NaN nas
+linhas antigas. Colunas nunca são removidas.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+ARQUIVO_COLUNAS = 'colunas.json'
+ARQUIVO_TEMPOS = 'tempos.i8'
+ARQUIVO_VALORES = 'valores.f8'
+
+
+def _segundos(tempos):
+    """Converte datas (str, datetime, Timestamp) em segundos desde a época."""
+    indice = pd.DatetimeIndex(pd.to_datetime(np.atleast_1d(tempos)))
+    return indice.as_unit('s').asi8
+
+
+class SerieTemporal:
+    """Série ``instante -> métricas`` persistida em ``diretorio``."""
+
+    def __init__(self, diretorio, colunas=None):
+        self.diretorio = diretorio
+        caminho_colunas = os.path.join(diretorio, ARQUIVO_COLUNAS)
+        if os.path.exists(caminho_colunas):
+            with open(caminho_colunas, 'r', encoding='utf-8') as arquivo:
+                self.colunas = json.load(arquivo)
+            if colunas:
+                self.incluir_colunas(colunas)
+        elif colunas:
+            self.colunas = list(colunas)
+            os.makedirs(diretorio, exist_ok=True)
+            self._gravar_colunas()
+        else:
+            raise ValueError(f"Série inexistente em '{diretorio}' e nenhuma coluna informada")
+
+    def _caminho(self, nome):
+        return os.path.join(self.diretorio, nome)
+
+    def _gravar_colunas(self):
+        caminho = self._caminho(ARQUIVO_COLUNAS)
+        with open(caminho + '.tmp', 'w', encoding='utf-8') as arquivo:
+            json.dump(self.colunas, arquivo, ensure_ascii=False)
+        os.replace(caminho + '.tmp', caminho)
+
+    def incluir_colunas(self, colunas):
+        """
+        Acrescenta à série as ``colunas`` que ela ainda não tem.
+
+        As linhas já gravadas recebem NaN nas colunas novas. Retorna a lista
+        de colunas incluídas.
+        """
+        novas = [coluna for coluna in dict.fromkeys(colunas) if coluna not in self.colunas]
+        if not novas:
+            return []
+        n, k = len(self), len(self.colunas)
+        if n:
+            antigos = np.fromfile(self._caminho(ARQUIVO_VALORES), dtype=np.float64,
+                                  count=n * k).reshape(n, k)
+            valores = np.hstack([antigos, np.full((n, len(novas)), np.nan)])
+            caminho = self._caminho(ARQUIVO_VALORES)
+            with open(caminho + '.tmp', 'wb') as arquivo:
+                arquivo.write(np.ascontiguousarray(valores).tobytes())
+            os.replace(caminho + '.tmp', caminho)
+        self.colunas = self.colunas + novas
+        self._gravar_colunas()
+        return novas
+
+    def __len__(self):
+        # Linhas completas: uma escrita interrompida pode deixar um arquivo mais longo
+        tempos = self._tamanho(ARQUIVO_TEMPOS) // 8
+        valores = self._tamanho(ARQUIVO_VALORES) // (8 * len(self.colunas))
+        return min(tempos, valores)
+
+    def _tamanho(self, nome):
+        caminho = self._caminho(nome)
+        return os.path.getsize(caminho) if os.path.exists(caminho) else 0
+
+    def _tempos(self):
+        n = len(self)
+        if n == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.memmap(self._caminho(ARQUIVO_TEMPOS), dtype=np.int64, mode='r', shape=(n,))
+
+    def ultimo_tempo(self):
+        """Instante mais recente gravado (``pd.Timestamp``) ou ``None``."""
+        tempos = self._tempos()
+        return pd.Timestamp(int(tempos[-1]), unit='s') if len(tempos) else None
+
+    def acrescentar(self, dados):
+        """
+        Acrescenta as linhas de ``dados`` posteriores ao último instante.
+
+        ``dados`` é um DataFrame indexado por data (ou com coluna ``data``);
+        colunas ausentes viram NaN e colunas que a série não tem são
+        incluídas (``incluir_colunas``). Retorna o número de linhas gravadas.
+        """
+        if 'data' in dados.columns:
+            dados = dados.set_index('data')
+        if dados.empty:
+            return 0
+        self.incluir_colunas(dados.columns)
+        tempos = _segundos(dados.index)
+        valores = dados.reindex(columns=self.colunas).to_numpy(dtype=np.float64, na_value=np.nan)
+
+        ordem = np.argsort(tempos, kind='stable')
+        tempos, valores = tempos[ordem], valores[ordem]
+        # Só de acréscimo: descarta o que não é posterior ao último instante (e repetidos)
+        ultimo = self._tempos()[-1] if len(self) else np.iinfo(np.int64).min
+        novos = (tempos > ultimo) & np.r_[True, tempos[1:] != tempos[:-1]]
+        tempos, valores = tempos[novos], valores[novos]
+        if len(tempos) == 0:
+            return 0
+
+        n = len(self)
+        os.makedirs(self.diretorio, exist_ok=True)
+        with open(self._caminho(ARQUIVO_TEMPOS), 'r+b' if n else 'wb') as arquivo:
+            arquivo.seek(n * 8)
+            arquivo.truncate()
+            arquivo.write(np.ascontiguousarray(tempos, dtype=np.int64).tobytes())
+        with open(self._caminho(ARQUIVO_VALORES), 'r+b' if n else 'wb') as arquivo:
+            arquivo.seek(n * 8 * len(self.colunas))
+            arquivo.truncate()
+            arquivo.write(np.ascontiguousarray(valores).tobytes())
+        return len(tempos)
+
+    def consultar(self, inicio=None, fim=None, frequencia=None, agregacao='mean'):
+        """
+        Linhas com ``inicio <= data <= fim`` como DataFrame indexado por ``data``.
+
+        Com ``frequencia`` (ex.: ``'W'``, ``'MS'``) a faixa é reamostrada com
+        ``agregacao``, para gráficos de históricos longos.
+        """
+        tempos = self._tempos()
+        a = 0 if inicio is None else int(np.searchsorted(tempos, _segundos(inicio)[0], 'left'))
+        b = len(tempos) if fim is None else int(np.searchsorted(tempos, _segundos(fim)[0], 'right'))
+        b = max(a, b)
+
+        if b > a:
+            k = len(self.colunas)
+            valores = np.fromfile(self._caminho(ARQUIVO_VALORES), dtype=np.float64,
+                                  count=(b - a) * k, offset=a * k * 8).reshape(b - a, k)
+        else:
+            valores = np.empty((0, len(self.colunas)))
+        indice = pd.DatetimeIndex(pd.to_datetime(np.asarray(tempos[a:b]), unit='s'), name='data')
+        serie = pd.DataFrame(valores, index=indice, columns=self.colunas)
+
+        if frequencia and not serie.empty:
+            serie = serie.resample(frequencia).agg(agregacao).dropna(how='all')
+        return serie
@@ -0,0 +1,441 @@
+"""
+Motor vetorizado de Skill Gap Intelligence.
+
+Competências dos funcionários e requisitos dos cargos são matrizes de
+bitsets (``humaniq.competencias``). O match contra o próprio cargo é um AND +
+popcount por linha; a busca de talentos ocultos em todos os pares
+funcionário × cargo usa um produto de matrizes esparsas, que só materializa
+os pares com alguma competência em comum. Isso mantém 100k funcionários ×
+500 cargos em tempo interativo, sem montar ``set()`` por linha.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from humaniq.competencias import BaseSkills, VocabularioSkills, contar_bits
+
+CATEGORIAS_REQUISITO = ('obrigatorias', 'desejaveis', 'futuras')
+
+# Limite de palavras uint64 materializadas por bloco no cálculo par a par
+_PALAVRAS_POR_BLOCO = 1 << 22
+
+
+def _alargar(bits, n_palavras):
+    if bits.shape[-1] >= n_palavras:
+        return bits
+    return np.pad(bits, [(0, 0)] * (bits.ndim - 1) + [(0, n_palavras - bits.shape[-1])])
+
+
+def _percentual(contagem, total):
+    """Percentual de match; requisito vazio conta como 100%."""
+    total = np.asarray(total)
+    return np.where(total > 0, contagem * 100.0 / np.maximum(total, 1), 100.0)
+
+
+def decodificar_conjuntos(vocabulario, bits):
+    """Converte linhas de bitsets em ``frozenset`` decodificando cada padrão distinto uma vez."""
+    if len(bits) == 0:
+        return []
+    unicos, inverso = np.unique(bits, axis=0, return_inverse=True)
+    conjuntos = [frozenset(vocabulario.decodificar(linha)) for linha in unicos]
+    return [conjuntos[i] for i in np.ravel(inverso)]
+
+
+class MotorSkillGap:
+    """Requisitos de cargos codificados como matrizes ``(cargos, palavras)``."""
+
+    def __init__(self, cargos_skills, vocabulario=None):
+        self.cargos = list(cargos_skills)
+        self.indice_cargo = {cargo: i for i, cargo in enumerate(self.cargos)}
+        self.vocabulario = vocabulario or VocabularioSkills()
+        self._requisitos = {
+            categoria: self.vocabulario.codificar_lote(
+                [cargos_skills[cargo].get(categoria, []) for cargo in self.cargos])
+            for categoria in CATEGORIAS_REQUISITO
+        }
+
+    def base(self, ids, listas):
+        """Codifica as competências dos funcionários com o vocabulário do motor."""
+        return BaseSkills.de_listas(ids, listas, self.vocabulario)
+
+    def requisitos(self, categoria):
+        """Matriz de requisitos da categoria, na largura atual do vocabulário."""
+        bits = _alargar(self._requisitos[categoria], self.vocabulario.n_palavras)
+        self._requisitos[categoria] = bits
+        return bits
+
+    def _bits(self, base):
+        base.bits = _alargar(base.bits, self.vocabulario.n_palavras)
+        return base.bits
+
+    def indices_cargos(self, cargos):
+        """Índice de cada cargo no catálogo (-1 se não catalogado)."""
+        return np.array([self.indice_cargo.get(cargo, -1) for cargo in cargos],
+                        dtype=np.int64)
+
+    # --- Funcionário vs próprio cargo ---
+
+    def analisar_cargo_atual(self, base, cargos):
+        """
+        Match e gaps de cada funcionário em relação ao próprio cargo.
+
+        Retorna dict de arrays alinhados a ``base.ids``; linhas com cargo fora
+        do catálogo têm ``indice_cargo`` = -1 e valores zerados.
+        """
+        bits = self._bits(base)
+        indice = self.indices_cargos(cargos)
+        validos = indice >= 0
+        alvo = np.where(validos, indice, 0)
+
+        resultado = {'indice_cargo': indice}
+        necessarias = np.zeros_like(bits)
+        for categoria in CATEGORIAS_REQUISITO:
+            requisito = self.requisitos(categoria)[alvo]
+            requisito[~validos] = 0
+            necessarias |= requisito
+            resultado[f'match_{categoria}'] = np.where(
+                validos, _percentual(contar_bits(bits & requisito),
+                                     contar_bits(requisito)), 0.0)
+            resultado[f'gap_{categoria}'] = requisito & ~bits
+
+        resultado['extras'] = np.where(validos[:, None], bits & ~necessarias, np.uint64(0))
+        resultado['score_geral'] = (resultado['match_obrigatorias'] * 0.6 +
+                                    resultado['match_desejaveis'] * 0.3 +
+                                    resultado['match_futuras'] * 0.1)
+        return resultado
+
+    # --- Todos os pares funcionário × cargo ---
+
+    def _blocos(self, n):
+        tamanho = max(1, _PALAVRAS_POR_BLOCO //
+                      max(1, len(self.cargos) * self.vocabulario.n_palavras))
+        for inicio in range(0, n, tamanho):
+            yield slice(inicio, min(n, inicio + tamanho))
+
+    def _match_bloco(self, bits, categoria):
+        requisitos = self.requisitos(categoria)
+        contagem = contar_bits(bits[:, None, :] & requisitos[None, :, :])
+        return _percentual(contagem, contar_bits(requisitos)[None, :]).astype(np.float32)
+
+    def matriz_match(self, base, categoria):
+        """Percentual de match ``(funcionários, cargos)`` para uma categoria."""
+        bits = self._bits(base)
+        matriz = np.empty((len(bits), len(self.cargos)), dtype=np.float32)
+        for bloco in self._blocos(len(bits)):
+            matriz[bloco] = self._match_bloco(bits[bloco], categoria)
+        return matriz
+
+    def _esparsa(self, bits):
+        """Matriz esparsa ``(linhas, vocabulário)`` a partir de bitsets."""
+        return sparse.csr_matrix(self.vocabulario.para_indicadores(bits), dtype=np.int32)
+
+    def _requisitos_esparsos(self, categoria):
+        return self._esparsa(self.requisitos(categoria)).T.tocsc()
+
+    def talentos_ocultos(self, base, cargos, limiar_obrigatorias=60,
+                         limiar_score=70, top_k=1):
+        """
+        Candidatos a outros cargos: match de obrigatórias >= ``limiar_obrigatorias``
+        e média (obrigatórias + desejáveis) >= ``limiar_score``, mantendo os
+        ``top_k`` melhores cargos por funcionário.
+        """
+        indice = self.indices_cargos(cargos)
+        k = max(1, min(top_k, len(self.cargos)))
+        total_obrigatorias = contar_bits(self.requisitos('obrigatorias'))
+
+        if limiar_obrigatorias > 0 and (total_obrigatorias > 0).all():
+            talentos = self._talentos_esparso(
+                base, indice, limiar_obrigatorias, limiar_score, k)
+        else:
+            talentos = self._talentos_denso(
+                base, indice, limiar_obrigatorias, limiar_score, k)
+
+        talentos['cargo_sugerido'] = [self.cargos[i] for i in talentos['indice_cargo']]
+        return talentos.sort_values('score_total', ascending=False,
+                                    kind='stable').reset_index(drop=True)
+
+    def _talentos_esparso(self, base, indice, limiar_obrigatorias, limiar_score, k):
+        """
+        Só pares com ao menos uma obrigatória em comum podem passar do limiar,
+        então um único produto esparso gera os candidatos. Obrigatórias e
+        desejáveis vão no mesmo produto: contagem = obrigatórias * K + desejáveis.
+        """
+        total_obrigatorias = contar_bits(self.requisitos('obrigatorias'))
+        total_desejaveis = contar_bits(self.requisitos('desejaveis'))
+        fator = int(total_desejaveis.max(initial=0)) + 1
+
+        requisitos = (self._requisitos_esparsos('obrigatorias') * fator +
+                      self._requisitos_esparsos('desejaveis'))
+        pares = (self._esparsa(self._bits(base)) @ requisitos).tocoo()
+
+        # Pré-filtro inteiro antes de calcular percentuais sobre todos os pares
+        contagem_obrigatorias = pares.data // fator
+        passa = contagem_obrigatorias * 100 >= limiar_obrigatorias * total_obrigatorias[pares.col]
+        linhas = pares.row[passa].astype(np.int64)
+        colunas = pares.col[passa].astype(np.int64)
+        obrigatorias = _percentual(contagem_obrigatorias[passa], total_obrigatorias[colunas])
+        desejaveis = _percentual(pares.data[passa] % fator, total_desejaveis[colunas])
+        score = (obrigatorias + desejaveis) / 2
+
+        elegivel = ((obrigatorias >= limiar_obrigatorias) & (score >= limiar_score) &
+                    (colunas != indice[linhas]))
+        linhas, colunas = linhas[elegivel], colunas[elegivel]
+        obrigatorias, desejaveis, score = (
+            obrigatorias[elegivel], desejaveis[elegivel], score[elegivel])
+
+        # Top-k por funcionário: ordena por (linha, -score, cargo) e corta no rank k
+        ordem = np.lexsort((colunas, -score, linhas))
+        linhas_ordenadas = linhas[ordem]
+        inicio_grupo = np.r_[0, np.flatnonzero(np.diff(linhas_ordenadas)) + 1]
+        rank = np.arange(len(ordem)) - np.repeat(
+            inicio_grupo, np.diff(np.r_[inicio_grupo, len(ordem)]))
+        ordem = ordem[rank < k] if len(ordem) else ordem
+
+        return pd.DataFrame({
+            'linha': linhas[ordem],
+            'indice_cargo': colunas[ordem],
+            'match_obrigatorias': obrigatorias[ordem],
+            'match_desejaveis': desejaveis[ordem],
+            'score_total': score[ordem],
+        })
+
+    def _talentos_denso(self, base, indice, limiar_obrigatorias, limiar_score, k):
+        """Varredura completa em blocos (limiar zero ou cargo sem obrigatórias)."""
+        bits = self._bits(base)
+        partes = []
+
+        for bloco in self._blocos(len(bits)):
+            obrigatorias = self._match_bloco(bits[bloco], 'obrigatorias')
+            desejaveis = self._match_bloco(bits[bloco], 'desejaveis')
+            score = (obrigatorias + desejaveis) / 2
+
+            elegivel = (obrigatorias >= limiar_obrigatorias) & (score >= limiar_score)
+            proprio = indice[bloco]
+            linhas_bloco = np.arange(len(proprio))
+            elegivel[linhas_bloco[proprio >= 0], proprio[proprio >= 0]] = False
+
+            candidato = np.where(elegivel, score, -np.inf)
+            if k == 1:
+                top = candidato.argmax(axis=1)[:, None]
+            else:
+                top = np.argpartition(-candidato, k - 1, axis=1)[:, :k]
+
+            linhas = np.repeat(linhas_bloco, top.shape[1])
+            colunas = top.ravel()
+            validos = np.isfinite(candidato[linhas, colunas])
+            linhas, colunas = linhas[validos], colunas[validos]
+
+            partes.append(pd.DataFrame({
+                'linha': linhas + bloco.start,
+                'indice_cargo': colunas,
+                'match_obrigatorias': obrigatorias[linhas, colunas].astype(float),
+                'match_desejaveis': desejaveis[linhas, colunas].astype(float),
+                'score_total': score[linhas, colunas].astype(float),
+            }))
+
+        if not partes:
+            return pd.DataFrame(columns=['linha', 'indice_cargo', 'match_obrigatorias',
+                                         'match_desejaveis', 'score_total'])
+        return pd.concat(partes, ignore_index=True)
+
+    def skills_relevantes(self, base, linhas, indices_cargo):
+        """Bitsets das competências de cada funcionário que atendem ao cargo indicado."""
+        bits = self._bits(base)
+        relevantes = self.requisitos('obrigatorias') | self.requisitos('desejaveis')
+        return bits[linhas] & relevantes[indices_cargo]
+
+
+class AgregadoGaps:
+    """
+    Contadores organizacionais de gaps mantidos incrementalmente.
+
+    Guarda o gap (obrigatórias ∪ desejáveis ∪ futuras) de cada funcionário e
+    os totais por competência e por departamento. Entradas, saídas e
+    mudanças de competências só ajustam as linhas afetadas; os dashboards
+    leem os totais sem varrer a força de trabalho.
+    """
+
+    def __init__(self):
+        self.vocabulario = VocabularioSkills()
+        self._lock = threading.Lock()
+        self._origem = None
+        self._linha = {}               # id -> linha em _gaps/_departamento
+        self._gaps = np.zeros((0, 0), dtype=bool)
+        self._departamento = np.zeros(0, dtype=np.int64)
+        self._livres = []
+        self._departamentos = {}       # nome -> código
+        self.contagem = np.zeros(0, dtype=np.int64)
+        self.contagem_departamento = np.zeros((0, 0), dtype=np.int64)
+        self.pessoas_departamento = np.zeros(0, dtype=np.int64)
+
+    @property
+    def total_pessoas(self):
+        return len(self._linha)
+
+    # --- Capacidade ---
+
+    def _garantir_skills(self, n_skills):
+        extra = n_skills - self._gaps.shape[1]
+        if extra > 0:
+            self._gaps = np.pad(self._gaps, ((0, 0), (0, extra)))
+            self.contagem = np.pad(self.contagem, (0, extra))
+            self.contagem_departamento = np.pad(self.contagem_departamento,
+                                                ((0, 0), (0, extra)))
+
+    def _codigo_departamento(self, departamento):
+        codigo = self._departamentos.get(departamento)
+        if codigo is None:
+            codigo = len(self._departamentos)
+            self._departamentos[departamento] = codigo
+            self.contagem_departamento = np.pad(self.contagem_departamento,
+                                                ((0, 1), (0, 0)))
+            self.pessoas_departamento = np.pad(self.pessoas_departamento, (0, 1))
+        return codigo
+
+    def _reservar_linhas(self, n):
+        reutilizadas = [self._livres.pop() for _ in range(min(n, len(self._livres)))]
+        faltam = n - len(reutilizadas)
+        if faltam:
+            inicio = len(self._gaps)
+            self._gaps = np.pad(self._gaps, ((0, faltam), (0, 0)))
+            self._departamento = np.pad(self._departamento, (0, faltam))
+            reutilizadas.extend(range(inicio, inicio + faltam))
+        return np.asarray(reutilizadas, dtype=np.int64)
+
+    # --- Atualizações ---
+
+    def _aplicar(self, linhas, sinal):
+        """Soma (sinal=+1) ou retira (sinal=-1) as linhas dos totais."""
+        if len(linhas) == 0:
+            return
+        gaps = self._gaps[linhas].astype(np.int64)
+        departamentos = self._departamento[linhas]
+        self.contagem += sinal * gaps.sum(axis=0)
+        np.add.at(self.contagem_departamento, departamentos, sinal * gaps)
+        np.add.at(self.pessoas_departamento, departamentos, sinal)
+
+    def _traduzir(self, gaps_bits, vocabulario):
+        """Converte bitsets de outro vocabulário em indicadores deste agregado."""
+        destino = np.array([self.vocabulario.id_de(skill) for skill in vocabulario],
+                           dtype=np.int64)
+        self._garantir_skills(len(self.vocabulario))
+        origem = vocabulario.para_indicadores(gaps_bits)
+        indicadores = np.zeros((len(origem), len(self.vocabulario)), dtype=bool)
+        indicadores[:, destino] = origem
+        return indicadores
+
+    def atualizar(self, id_funcionario, departamento, gaps):
+        """Registra a entrada ou mudança de um funcionário (``gaps``: nomes)."""
+        with self._lock:
+            ids = [self.vocabulario.id_de(skill) for skill in gaps]
+            self._garantir_skills(len(self.vocabulario))
+            linha = self._linha.get(id_funcionario)
+            if linha is None:
+                linha = int(self._reservar_linhas(1)[0])
+                self._linha[id_funcionario] = linha
+            else:
+                self._aplicar([linha], -1)
+            self._gaps[linha] = False
+            self._gaps[linha, ids] = True
+            self._departamento[linha] = self._codigo_departamento(departamento)
+            self._aplicar([linha], +1)
+
+    def remover(self, id_funcionario):
+        """Retira um funcionário desligado dos totais."""
+        with self._lock:
+            linha = self._linha.pop(id_funcionario, None)
+            if linha is not None:
+                self._aplicar([linha], -1)
+                self._gaps[linha] = False
+                self._livres.append(linha)
+
+    def sincronizar(self, ids, departamentos, gaps_bits, vocabulario, origem=None):
+        """
+        Alinha o agregado a um snapshot completo, aplicando só as diferenças.
+
+        ``gaps_bits`` são bitsets no ``vocabulario`` informado. Se ``origem``
+        for o mesmo objeto da última sincronização, nada é feito.
+        """
+        with self._lock:
+            if origem is not None and origem is self._origem:
+                return
+            ids = list(ids)
+            indicadores = self._traduzir(gaps_bits, vocabulario)
+            codigos = np.array([self._codigo_departamento(d) for d in departamentos],
+                               dtype=np.int64)
+
+            presentes = set(ids)
+            saidas = [i for i in self._linha if i not in presentes]
+            self._aplicar(np.array([self._linha[i] for i in saidas], dtype=np.int64), -1)
+            for i in saidas:
+                linha = self._linha.pop(i)
+                self._gaps[linha] = False
+                self._livres.append(linha)
+
+            linhas = np.array([self._linha.get(i, -1) for i in ids], dtype=np.int64)
+            novos = linhas < 0
+            existentes = np.flatnonzero(~novos)
+            mudou = existentes[
+                (self._gaps[linhas[existentes]] != indicadores[existentes]).any(axis=1) |
+                (self._departamento[linhas[existentes]] != codigos[existentes])]
+
+            self._aplicar(linhas[mudou], -1)
+            posicoes_novas = np.flatnonzero(novos)
+            linhas[posicoes_novas] = self._reservar_linhas(len(posicoes_novas))
+            for posicao in posicoes_novas:
+                self._linha[ids[posicao]] = int(linhas[posicao])
+
+            alteradas = np.concatenate([mudou, posicoes_novas])
+            self._gaps[linhas[alteradas]] = indicadores[alteradas]
+            self._departamento[linhas[alteradas]] = codigos[alteradas]
+            self._aplicar(linhas[alteradas], +1)
+            self._origem = origem
+
+    # --- Leitura ---
+
+    def gaps_criticos(self, catalogo):
+        """Gaps por competência com score de criticidade, do mais crítico ao menos."""
+        # Cópia sob a trava: ``sincronizar`` de outra sessão pode crescer os arrays
+        with self._lock:
+            total = self.total_pessoas
+            contagem = self.contagem.copy()
+            nomes = list(self.vocabulario)
+        if total == 0:
+            return []
+        gaps = []
+        for skill_id in np.argsort(-contagem, kind='stable'):
+            count = int(contagem[skill_id])
+            if count <= 0:
+                break
+            skill = nomes[skill_id]
+            dados = catalogo.get(skill, {})
+            percentual = count / total * 100
+            demanda_mercado = dados.get('demanda_mercado', 50)
+            impacto_salarial = dados.get('salario_impacto', 0)
+            gaps.append({
+                'skill': skill,
+                'pessoas_afetadas': count,
+                'percentual_organizacao': percentual,
+                'demanda_mercado': demanda_mercado,
+                'impacto_salarial': impacto_salarial,
+                'criticidade': percentual * 0.4 + demanda_mercado * 0.4 + impacto_salarial * 0.2,
+                'categoria': dados.get('categoria', 'Outros')
+            })
+        return sorted(gaps, key=lambda x: x['criticidade'], reverse=True)
+
+    def por_departamento(self):
+        """Percentual de pessoas com gap em cada competência, por departamento."""
+        with self._lock:
+            nomes = sorted(self._departamentos, key=self._departamentos.get)
+            contagem = self.contagem.copy()
+            contagem_departamento = self.contagem_departamento.copy()
+            pessoas_departamento = self.pessoas_departamento.copy()
+            skills = list(self.vocabulario)
+        pessoas = np.maximum(pessoas_departamento, 1)[:, None]
+        tabela = pd.DataFrame(contagem_departamento * 100.0 / pessoas,
+                              index=nomes, columns=skills)
+        ativos = pessoas_departamento > 0
+        return tabela.loc[ativos, contagem > 0]
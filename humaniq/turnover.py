@@ -0,0 +1,127 @@
+"""
+Score de risco de turnover da página de Predictive Turnover.
+
+``calcular_risco_turnover`` pontua um funcionário e lista os fatores de
+risco. ``indicadores_turnover`` resume os scores no snapshot diário da série
+``turnover``, gravado tanto pela página quanto pelo job ``snapshot_kpis.py``
+(``indicadores_turnover_agentes``), para o histórico não depender de visitas.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from humaniq.agregados_kpi import DIRETORIO_AGENTES, FAIXAS_RISCO
+from humaniq.funcionario import funcionarios_de_dataframe
+
+
+def calcular_risco_turnover(funcionario):
+    """
+    Calcula score de risco de turnover (0-100) baseado em múltiplos fatores
+    Score alto = maior risco de saída
+    """
+    risk_score = 0
+    fatores_risco = []
+
+    # 1. ENGAJAMENTO (peso 25%)
+    enps = funcionario.get('engajamento.enps_recente', 5)
+    if enps <= 3:
+        risk_score += 25
+        fatores_risco.append("eNPS muito baixo")
+    elif enps <= 5:
+        risk_score += 15
+        fatores_risco.append("eNPS baixo")
+    elif enps <= 7:
+        risk_score += 5
+
+    # 2. PERFORMANCE (peso 20%)
+    ultima_avaliacao = funcionario.get(
+        'performance.avaliacoes_desempenho', [{}])
+    if isinstance(ultima_avaliacao, list) and ultima_avaliacao:
+        nota = ultima_avaliacao[-1].get('nota', 7)
+    else:
+        nota = 7
+
+    metas = funcionario.get('performance.metas_atingidas_percentual', 85)
+
+    if nota <= 6 or metas <= 70:
+        risk_score += 20
+        fatores_risco.append("Performance abaixo da média")
+    elif nota <= 7 or metas <= 80:
+        risk_score += 10
+        fatores_risco.append("Performance em declínio")
+
+    # 3. BURNOUT E STRESS (peso 20%)
+    burnout_risk = funcionario.get('kpis_ia.risco_burnout', 5)
+    if burnout_risk >= 8:
+        risk_score += 20
+        fatores_risco.append("Alto risco de burnout")
+    elif burnout_risk >= 6:
+        risk_score += 12
+        fatores_risco.append("Sinais de stress")
+    elif burnout_risk >= 4:
+        risk_score += 5
+
+    # 4. TEMPO DE CASA (peso 15%)
+    tempo_casa = funcionario.get('tempo_de_casa_meses', 12)
+    if tempo_casa <= 6:
+        risk_score += 15
+        fatores_risco.append("Funcionário muito novo")
+    elif tempo_casa >= 48:
+        risk_score += 10
+        fatores_risco.append("Funcionário muito experiente")
+
+    # 5. SENTIMENTO GERAL (peso 10%)
+    sentimento = funcionario.get(
+        'engajamento.comentarios_sentimento', 'neutro')
+    if sentimento == 'negativo':
+        risk_score += 10
+        fatores_risco.append("Sentimento negativo")
+    elif sentimento == 'neutro':
+        risk_score += 3
+
+    # 6. FEEDBACK 360 (peso 10%)
+    feedback_360 = funcionario.get('engajamento.feedback_360_media', 3.5)
+    if feedback_360 <= 2.5:
+        risk_score += 10
+        fatores_risco.append("Feedback 360 muito baixo")
+    elif feedback_360 <= 3.0:
+        risk_score += 5
+        fatores_risco.append("Feedback 360 baixo")
+
+    # Capear o score em 100
+    risk_score = min(risk_score, 100)
+
+    return risk_score, fatores_risco
+
+
+def indicadores_turnover(scores):
+    """Snapshot da série ``turnover``: score médio e funcionários por corte de risco."""
+    scores = np.asarray(scores, dtype=float)
+    return {
+        'score_medio': scores.mean(),
+        'criticos': int((scores >= FAIXAS_RISCO['critico']).sum()),
+        'alto_mais': int((scores >= FAIXAS_RISCO['alto']).sum()),
+        'monitoramento': int((scores >= FAIXAS_RISCO['medio']).sum()),
+        'total': len(scores),
+    }
+
+
+def indicadores_turnover_agentes(diretorio=DIRETORIO_AGENTES):
+    """``indicadores_turnover`` de todos os agentes de ``diretorio`` (``None`` se não há agentes)."""
+    if not os.path.isdir(diretorio):
+        return None
+    registros = []
+    for nome in sorted(os.listdir(diretorio)):
+        if nome.endswith('.json'):
+            with open(os.path.join(diretorio, nome), 'r', encoding='utf-8') as arquivo:
+                registros.append(json.load(arquivo))
+    if not registros:
+        return None
+
+    df = pd.json_normalize(registros).set_index('id_funcionario')
+    scores = [calcular_risco_turnover(funcionario)[0]
+              for funcionario in funcionarios_de_dataframe(df)]
+    return indicadores_turnover(scores)
@@ -0,0 +1,66 @@
+"""
+Peças de interface compartilhadas pelas páginas.
+
+Único módulo do pacote que usa o Streamlit: os caches dos índices de
+agentes/busca (um por processo, reaproveitados entre páginas e reruns) e o
+seletor de funcionário com busca e filtros por faceta.
+"""
+
+import streamlit as st
+
+from humaniq.busca import IndiceBusca
+from humaniq.indice_agentes import DIRETORIO_AGENTES, IndiceAgentes
+
+# Facetas oferecidas como filtro no seletor de funcionário
+FACETAS_SELETOR = {
+    'departamento': 'Departamento',
+    'cargo': 'Cargo',
+    'competencias': 'Competências',
+}
+
+
+@st.cache_resource
+def indice_agentes(diretorio=DIRETORIO_AGENTES):
+    """Índice id -> nome/cargo; registros completos são lidos sob demanda"""
+    return IndiceAgentes(diretorio)
+
+
+@st.cache_resource
+def busca_agentes(versao, diretorio=DIRETORIO_AGENTES):
+    """Índice de busca sobre as entradas do índice de agentes (refeito quando ``versao`` muda)"""
+    return IndiceBusca.de_indice_agentes(indice_agentes(diretorio))
+
+
+@st.cache_resource
+def indice_busca(df):
+    """Índice de busca textual/facetas sobre os funcionários carregados"""
+    return IndiceBusca.de_dataframe(df)
+
+
+def selecionar_funcionario(busca, rotulo, chave, area=st):
+    """
+    Typeahead: consulta + filtros por faceta; o seletor mostra só os
+    melhores resultados, não a lista inteira de funcionários.
+    """
+    consulta = area.text_input("🔎 Buscar funcionário", key=f"{chave}_consulta",
+                               placeholder="Nome, cargo, equipe, competência...")
+    # Filtros escolhidos na execução anterior (guardados pelos widgets)
+    filtros = {faceta: st.session_state.get(f"{chave}_{faceta}", [])
+               for faceta in FACETAS_SELETOR}
+    resultado = busca.buscar(consulta, filtros)
+
+    with area.expander("Filtros"):
+        for faceta, titulo in FACETAS_SELETOR.items():
+            contagens = resultado['facetas'][faceta]
+            st.multiselect(titulo, options=list(dict.fromkeys([*filtros[faceta], *contagens])),
+                           format_func=lambda valor, c=contagens: f"{valor} ({c.get(valor, 0)})",
+                           key=f"{chave}_{faceta}")
+
+    if not resultado['ids']:
+        area.warning("Nenhum funcionário encontrado para a busca.")
+        return None
+    selecionado = area.selectbox(rotulo, options=resultado['ids'],
+                                 format_func=busca.rotulo, key=chave)
+    if resultado['total'] > len(resultado['ids']):
+        area.caption(f"Mostrando {len(resultado['ids'])} de {resultado['total']} — refine a busca.")
+    return selecionado
@@ -8,6 +8,9 @@ from datetime import datetime
 import anthropic
 from dotenv import load_dotenv
 import os
+from humaniq.disc import (DIMENSOES_DISC, TRACOS_BIG_FIVE_DISC, QuestionarioDISC, avaliar,
+                          converter_big_five, gravar_disc, perfis_dominantes)
+from humaniq.ui import indice_agentes
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -201,85 +204,48 @@ PERFIS_DISC = {
     }
 }
 
+# Combinações comuns (dominante, secundário)
+COMBINACOES_DISC = {
+    ("D", "I"): "Promotor - Direto e influente",
+    ("D", "C"): "Reformador - Direto e analítico",
+    ("I", "S"): "Conselheiro - Influente e estável",
+    ("I", "D"): "Promotor - Influente e direto",
+    ("S", "C"): "Especialista - Estável e detalhista",
+    ("S", "I"): "Conselheiro - Estável e sociável",
+    ("C", "D"): "Reformador - Analítico e direto",
+    ("C", "S"): "Especialista - Analítico e estável"
+}
+
+# Palavras codificadas como matriz de pesos (pontuação de um ou de milhares)
+QUESTIONARIO_DISC = QuestionarioDISC(PALAVRAS_DISC)
+
 # --- Funções de Análise ---
 
 
 def calcular_pontuacao_disc(respostas):
     """Calcula pontuação DISC baseada nas respostas"""
-    pontuacao = {"D": 0, "I": 0, "S": 0, "C": 0}
-
-    for grupo, escolhas in respostas.items():
-        mais_escolha = escolhas.get("mais", "")
-        menos_escolha = escolhas.get("menos", "")
-
-        if grupo in PALAVRAS_DISC:
-            # Adicionar pontos da palavra MAIS escolhida
-            if mais_escolha in PALAVRAS_DISC[grupo]:
-                for dim, valor in PALAVRAS_DISC[grupo][mais_escolha].items():
-                    pontuacao[dim] += valor
-
-            # Subtrair pontos da palavra MENOS escolhida
-            if menos_escolha in PALAVRAS_DISC[grupo]:
-                for dim, valor in PALAVRAS_DISC[grupo][menos_escolha].items():
-                    pontuacao[dim] -= valor
-
-    # Normalizar para valores positivos e percentuais
-    min_val = min(pontuacao.values())
-    if min_val < 0:
-        for dim in pontuacao:
-            pontuacao[dim] += abs(min_val)
-
-    total = sum(pontuacao.values())
-    if total > 0:
-        for dim in pontuacao:
-            pontuacao[dim] = round((pontuacao[dim] / total) * 100, 1)
-
-    return pontuacao
+    mais, menos = QUESTIONARIO_DISC.codificar_respostas(respostas)
+    pontuacao = QUESTIONARIO_DISC.pontuar(mais, menos)[0]
+    return dict(zip(DIMENSOES_DISC, pontuacao.tolist()))
 
 
 def identificar_perfil_dominante(pontuacao):
     """Identifica perfil dominante e combinações"""
-    sorted_scores = sorted(pontuacao.items(), key=lambda x: x[1], reverse=True)
-
-    dominante = sorted_scores[0][0]
-    secundario = sorted_scores[1][0] if sorted_scores[1][1] > 15 else None
-
-    # Combinações comuns
-    combinacoes = {
-        ("D", "I"): "Promotor - Direto e influente",
-        ("D", "C"): "Reformador - Direto e analítico",
-        ("I", "S"): "Conselheiro - Influente e estável",
-        ("I", "D"): "Promotor - Influente e direto",
-        ("S", "C"): "Especialista - Estável e detalhista",
-        ("S", "I"): "Conselheiro - Estável e sociável",
-        ("C", "D"): "Reformador - Analítico e direto",
-        ("C", "S"): "Especialista - Analítico e estável"
-    }
-
-    perfil_combinado = None
-    if secundario and sorted_scores[1][1] > 20:
-        perfil_combinado = combinacoes.get(
-            (dominante, secundario), f"{dominante}{secundario}")
-
-    return dominante, secundario, perfil_combinado
+    dominante, secundario, perfil_combinado = perfis_dominantes(
+        [[pontuacao[dim] for dim in DIMENSOES_DISC]], COMBINACOES_DISC)
+    return dominante[0], secundario[0], perfil_combinado[0]
 
 
 def converter_disc_para_big_five(pontuacao_disc):
     """Converte DISC para Big Five aproximado"""
-    # Mapeamento baseado em correlações psicológicas
-    big_five = {
-        "Abertura": (pontuacao_disc["I"] * 0.3 + pontuacao_disc["D"] * 0.2) / 10,
-        "Conscienciosidade": (pontuacao_disc["C"] * 0.4 + pontuacao_disc["D"] * 0.1) / 10,
-        "Extroversão": (pontuacao_disc["I"] * 0.4 + pontuacao_disc["D"] * 0.3) / 10,
-        "Amabilidade": (pontuacao_disc["S"] * 0.4 + pontuacao_disc["I"] * 0.2) / 10,
-        "Neuroticismo": max(0, 5 - (pontuacao_disc["S"] * 0.03 + pontuacao_disc["C"] * 0.02))
-    }
+    big_five = converter_big_five([[pontuacao_disc[dim] for dim in DIMENSOES_DISC]])[0]
+    return dict(zip(TRACOS_BIG_FIVE_DISC, big_five.tolist()))
 
-    # Normalizar para escala 0-10
-    for trait in big_five:
-        big_five[trait] = round(min(10, max(0, big_five[trait] * 10)), 1)
 
-    return big_five
+@st.cache_data
+def avaliar_lote(df_respostas):
+    """Pontuação, perfis e Big Five de todos os questionários importados de uma vez"""
+    return avaliar(QUESTIONARIO_DISC, df_respostas, COMBINACOES_DISC)
 
 
 def gerar_insights_claude(pontuacao, dominante, secundario, perfil_combinado, contexto_pessoal):
@@ -358,6 +324,65 @@ nome = st.sidebar.text_input("Nome:", placeholder="Seu nome completo")
 cargo = st.sidebar.text_input("Cargo:", placeholder="Seu cargo atual")
 empresa = st.sidebar.text_input("Empresa:", placeholder="Nome da empresa")
 
+# --- Importação em Lote ---
+with st.expander("📥 Importação em lote de questionários (CSV)"):
+    st.markdown("""
+    Uma linha por participante: `id_funcionario` e, para cada grupo, as colunas
+    `grupo_N.mais` e `grupo_N.menos` com as palavras escolhidas. Os resultados
+    são gravados no bloco `disc` do registro de cada agente.
+    """)
+
+    modelo_csv = pd.DataFrame(
+        columns=['id_funcionario'] + QUESTIONARIO_DISC.colunas_respostas())
+    st.download_button("📄 Baixar modelo CSV", modelo_csv.to_csv(index=False),
+                       file_name="modelo_disc.csv", mime="text/csv")
+
+    arquivo_csv = st.file_uploader("Questionários respondidos (CSV)", type="csv")
+    if arquivo_csv is not None:
+        df_respostas = pd.read_csv(arquivo_csv, dtype=str)
+
+        if 'id_funcionario' not in df_respostas:
+            st.error("❌ O CSV precisa da coluna **id_funcionario**.")
+        else:
+            # Questionário repetido: vale o último
+            df_respostas = df_respostas.drop_duplicates(
+                'id_funcionario', keep='last').set_index('id_funcionario')
+            faltando = [coluna for coluna in QUESTIONARIO_DISC.colunas_respostas()
+                        if coluna not in df_respostas]
+            if faltando:
+                st.warning(
+                    f"⚠️ {len(faltando)} colunas ausentes não pontuam: {', '.join(faltando[:6])}")
+
+            resultados_lote = avaliar_lote(df_respostas)
+            st.success(f"✅ {len(resultados_lote)} questionários pontuados")
+
+            col1, col2 = st.columns([0.4, 0.6])
+
+            with col1:
+                perfis_lote = resultados_lote['perfil_dominante'].value_counts()
+                fig_lote = px.bar(
+                    x=[PERFIS_DISC[dim]["nome"] for dim in perfis_lote.index],
+                    y=perfis_lote.values,
+                    color=list(perfis_lote.index),
+                    color_discrete_map={dim: PERFIS_DISC[dim]["cor"] for dim in DIMENSOES_DISC},
+                    title="Perfis Dominantes",
+                    labels={'x': 'Perfil', 'y': 'Participantes'}
+                )
+                fig_lote.update_layout(showlegend=False, height=300)
+                st.plotly_chart(fig_lote, use_container_width=True)
+
+            with col2:
+                st.dataframe(resultados_lote.head(100), use_container_width=True, height=300)
+
+            if st.button("💾 Gravar nos registros dos agentes", type="primary"):
+                indice = indice_agentes()
+                indice.atualizar(forcar=True)
+                gravados, sem_agente = gravar_disc(resultados_lote, indice)
+                st.success(f"✅ Bloco DISC gravado em {gravados} agentes")
+                if sem_agente:
+                    st.warning(f"⚠️ {len(sem_agente)} ids sem agente correspondente: "
+                               f"{', '.join(map(str, sem_agente[:10]))}")
+
 # --- Questionário DISC ---
 if not st.session_state.teste_completo:
     st.header("📝 Questionário DISC")
@@ -2,11 +2,12 @@ import streamlit as st
 import pandas as pd
 import json
 import os
-import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-import random
+from humaniq.cultura import (FATORES_RESISTENCIA, extrair_caracteristicas, perfis_culturais,
+                             pontuar_influencia, pontuar_resistencia, top_k)
+from humaniq.difusao_cultural import grafo_influencia, simular_cenarios
 
 st.set_page_config(page_title="Cultural Fit Evolution",
                    page_icon="🧭", layout="wide")
@@ -58,6 +59,27 @@ DIMENSOES_HOFSTEDE = {
     }
 }
 
+# Mudança usada na análise de resistências enquanto o perfil alvo não é ajustado
+MUDANCA_PADRAO = {
+    'distancia_poder': 'diminuir',
+    'aversao_incerteza': 'diminuir',
+    'orientacao_temporal': 'aumentar',
+    'indulgencia': 'aumentar'
+}
+
+# Tendências mensais de mercado (cenário "Tendências de mercado")
+TENDENCIAS_CULTURAIS = {
+    'distancia_poder': -0.1,  # Tendência para menos hierarquia
+    'individualismo': 0.05,   # Ligeiro aumento do individualismo
+    'masculinidade': -0.08,   # Menos foco em competição
+    'aversao_incerteza': -0.12,  # Mais tolerância à incerteza
+    'orientacao_temporal': 0.15,  # Mais foco longo prazo
+    'indulgencia': 0.1       # Mais liberdade
+}
+
+# Puxão mensal rumo ao perfil alvo no cenário de transformação
+INTENSIDADE_TRANSFORMACAO = 0.05
+
 VALORES_ORGANIZACIONAIS = [
     'Inovação', 'Colaboração', 'Transparência', 'Diversidade',
     'Sustentabilidade', 'Excelência', 'Agilidade', 'Cliente-centrismo',
@@ -86,27 +108,10 @@ def carregar_agentes():
     return df.set_index('id_funcionario')
 
 
-def mapear_big_five_para_hofstede(funcionario):
-    """Mapeia perfil Big Five para dimensões de Hofstede"""
-
-    # Extrair Big Five
-    abertura = funcionario.get('perfil_big_five.abertura_a_experiencia', 5)
-    conscienciosidade = funcionario.get('perfil_big_five.conscienciosidade', 5)
-    extroversao = funcionario.get('perfil_big_five.extroversao', 5)
-    amabilidade = funcionario.get('perfil_big_five.amabilidade', 5)
-    neuroticismo = funcionario.get('perfil_big_five.neuroticismo', 5)
-
-    # Mapeamentos baseados em pesquisa psicológica cross-cultural
-    hofstede = {
-        'distancia_poder': max(1, min(10, 10 - amabilidade + (10 - extroversao) * 0.5)),
-        'individualismo': max(1, min(10, extroversao + (10 - amabilidade) * 0.3 + abertura * 0.2)),
-        'masculinidade': max(1, min(10, extroversao + conscienciosidade * 0.5 + (10 - amabilidade) * 0.3)),
-        'aversao_incerteza': max(1, min(10, neuroticismo + conscienciosidade * 0.4)),
-        'orientacao_temporal': max(1, min(10, conscienciosidade + abertura * 0.3)),
-        'indulgencia': max(1, min(10, (10 - neuroticismo) + extroversao * 0.4 + abertura * 0.2))
-    }
-
-    return hofstede
+@st.cache_data
+def calcular_perfis_culturais(df_funcionarios):
+    """Colunas Hofstede por funcionário, perfil médio e perfis por departamento/equipe"""
+    return perfis_culturais(df_funcionarios)
 
 
 def calcular_perfil_cultural_organizacional(df_funcionarios):
@@ -114,186 +119,150 @@ def calcular_perfil_cultural_organizacional(df_funcionarios):
     if df_funcionarios.empty:
         return {}
 
-    perfis_hofstede = []
-    for _, funcionario in df_funcionarios.iterrows():
-        perfil = mapear_big_five_para_hofstede(funcionario)
-        perfis_hofstede.append(perfil)
+    _, perfil_medio, _ = calcular_perfis_culturais(df_funcionarios)
+    return perfil_medio.to_dict()
 
-    df_hofstede = pd.DataFrame(perfis_hofstede)
-    perfil_medio = df_hofstede.mean().to_dict()
-
-    return perfil_medio
 
+@st.cache_data
+def calcular_caracteristicas_culturais(df_funcionarios):
+    """Colunas compartilhadas pelos scores de influência e resistência"""
+    hofstede, _, _ = calcular_perfis_culturais(df_funcionarios)
+    return extrair_caracteristicas(df_funcionarios, hofstede)
 
-def simular_evolucao_cultural(perfil_base, meses=12):
-    """Simula a evolução cultural ao longo do tempo"""
-    evolucao = []
-    perfil_atual = perfil_base.copy()
-
-    # Tendências de mudança simuladas
-    tendencias = {
-        'distancia_poder': -0.1,  # Tendência para menos hierarquia
-        'individualismo': 0.05,   # Ligeiro aumento do individualismo
-        'masculinidade': -0.08,   # Menos foco em competição
-        'aversao_incerteza': -0.12,  # Mais tolerância à incerteza
-        'orientacao_temporal': 0.15,  # Mais foco longo prazo
-        'indulgencia': 0.1       # Mais liberdade
-    }
 
-    for mes in range(meses + 1):
-        data = datetime.now() - timedelta(days=30 * (meses - mes))
+def identificar_influenciadores_culturais(df_funcionarios, top=10):
+    """Identifica funcionários com maior influência cultural"""
+    caracteristicas = calcular_caracteristicas_culturais(df_funcionarios)
+    scores = pontuar_influencia(caracteristicas)
 
-        # Adicionar ruído e tendências
-        perfil_mes = {}
-        for dimensao, valor in perfil_atual.items():
-            tendencia = tendencias.get(dimensao, 0)
-            ruido = random.gauss(0, 0.3)  # Variação aleatória
-            novo_valor = valor + tendencia + ruido
-            perfil_mes[dimensao] = max(1, min(10, novo_valor))
-
-        evolucao.append({
-            'data': data,
-            'mes': data.strftime('%Y-%m'),
-            **perfil_mes
+    influenciadores = []
+    for i in top_k(scores, top):
+        funcionario = df_funcionarios.iloc[i]
+        linha = caracteristicas.iloc[i]
+        influenciadores.append({
+            'id': df_funcionarios.index[i],
+            'nome': funcionario['nome'],
+            'cargo': funcionario['cargo'],
+            'departamento': funcionario['departamento'],
+            'score_influencia': round(float(scores[i]), 1),
+            'tempo_casa': linha['tempo_casa'],
+            'performance': linha['nota'],
+            'extroversao': linha['extroversao'],
+            'amabilidade': linha['amabilidade'],
+            'enps': linha['enps']
         })
 
-        # Atualizar perfil para próximo mês
-        perfil_atual = perfil_mes
-
-    return pd.DataFrame(evolucao)
+    return influenciadores
 
 
-def identificar_influenciadores_culturais(df_funcionarios):
-    """Identifica funcionários com maior influência cultural"""
-    influenciadores = []
+@st.cache_resource
+def preparar_difusao_cultural(df_funcionarios):
+    """Perfis Hofstede, grafo de influência (equipes) e suscetibilidade de cada funcionário"""
+    caracteristicas = calcular_caracteristicas_culturais(df_funcionarios)
+    resistencia, _, _ = pontuar_resistencia(caracteristicas, {})
 
-    for idx, funcionario in df_funcionarios.iterrows():
-        # Score de influência baseado em múltiplos fatores
+    grupos = (df_funcionarios['departamento'].astype(str) + ' / ' +
+              df_funcionarios['equipe_atual'].astype(str)).to_numpy()
+    grafo = grafo_influencia(grupos, pontuar_influencia(caracteristicas))
 
-        # Tempo na empresa (influência por senioridade)
-        tempo_casa = funcionario.get('tempo_de_casa_meses', 12)
-        score_senioridade = min(tempo_casa / 36, 1) * 25  # Máximo 25 pts
+    perfis = caracteristicas[list(DIMENSOES_HOFSTEDE)].to_numpy()
+    return perfis, grafo, 1 - resistencia / 100
 
-        # Performance (influência por resultados)
-        ultima_avaliacao = funcionario.get(
-            'performance.avaliacoes_desempenho', [{}])
-        if isinstance(ultima_avaliacao, list) and ultima_avaliacao:
-            nota = ultima_avaliacao[-1].get('nota', 7)
-        else:
-            nota = 7
-        score_performance = (nota / 10) * 20  # Máximo 20 pts
-
-        # Extroversão (influência social)
-        extroversao = funcionario.get('perfil_big_five.extroversao', 5)
-        score_social = (extroversao / 10) * 15  # Máximo 15 pts
-
-        # Amabilidade (influência positiva)
-        amabilidade = funcionario.get('perfil_big_five.amabilidade', 5)
-        score_positivo = (amabilidade / 10) * 10  # Máximo 10 pts
-
-        # Engajamento
-        enps = funcionario.get('engajamento.enps_recente', 5)
-        score_engajamento = (enps / 10) * 15  # Máximo 15 pts
-
-        # Cargo (influência hierárquica)
-        cargo = funcionario.get('cargo', '')
-        if 'Gerente' in cargo:
-            score_hierarquia = 15
-        elif 'Analista' in cargo:
-            score_hierarquia = 5
-        else:
-            score_hierarquia = 10
 
-        score_total = (score_senioridade + score_performance + score_social +
-                       score_positivo + score_engajamento + score_hierarquia)
+# Perfis alvo distintos mantidos em cache (cada ajuste dos sliders é uma entrada)
+MAX_SIMULACOES_CACHE = 16
 
-        influenciadores.append({
-            'id': idx,
-            'nome': funcionario['nome'],
-            'cargo': funcionario['cargo'],
-            'departamento': funcionario['departamento'],
-            'score_influencia': round(score_total, 1),
-            'tempo_casa': tempo_casa,
-            'performance': nota,
-            'extroversao': extroversao,
-            'amabilidade': amabilidade,
-            'enps': enps
-        })
 
-    return sorted(influenciadores, key=lambda x: x['score_influencia'], reverse=True)
+@st.cache_data(max_entries=MAX_SIMULACOES_CACHE)
+def simular_evolucao_cultural(df_funcionarios, perfil_alvo, meses=12, replicas=32):
+    """
+    Projeta a evolução cultural por cenário (faixas P5-P95 da média
+    organizacional), indexada pelo mês a partir de hoje (``mes_offset``)
+    """
+    perfis, grafo, suscetibilidade = preparar_difusao_cultural(df_funcionarios)
+    dimensoes = list(DIMENSOES_HOFSTEDE)
 
+    cenarios = {
+        'Orgânico (influência entre pares)': {},
+        'Tendências de mercado': {'deriva': [TENDENCIAS_CULTURAIS[d] for d in dimensoes]},
+        'Transformação rumo ao perfil alvo': {
+            'alvo': [perfil_alvo[d] for d in dimensoes],
+            'intensidade': INTENSIDADE_TRANSFORMACAO
+        }
+    }
+    faixas = simular_cenarios(perfis, grafo, suscetibilidade, cenarios, meses, replicas)
 
-def detectar_resistencias_mudanca(df_funcionarios, mudanca_cultural_desejada):
+    offsets = range(meses + 1)
+    evolucao = []
+    for cenario, (p5, p50, p95) in faixas.items():
+        for j, dimensao in enumerate(dimensoes):
+            evolucao.append(pd.DataFrame({
+                'cenario': cenario,
+                'dimensao': dimensao,
+                'mes_offset': offsets,
+                'p5': p5[:, j],
+                'p50': p50[:, j],
+                'p95': p95[:, j]
+            }))
+
+    return pd.concat(evolucao, ignore_index=True)
+
+
+def datar_evolucao(df_evolucao, inicio):
+    """Converte ``mes_offset`` em datas a partir de ``inicio`` (fora do cache)"""
+    df_evolucao = df_evolucao.copy()
+    df_evolucao['data'] = [inicio + timedelta(days=30 * mes) for mes in df_evolucao['mes_offset']]
+    df_evolucao['mes'] = df_evolucao['data'].dt.strftime('%Y-%m')
+    return df_evolucao
+
+
+def derivar_mudanca_desejada(perfil_atual, perfil_desejado, tolerancia=0.5):
+    """Direção da mudança por dimensão a partir do perfil alvo"""
+    mudanca = {}
+    for dimensao, alvo in perfil_desejado.items():
+        diferenca = alvo - perfil_atual.get(dimensao, 5)
+        if diferenca > tolerancia:
+            mudanca[dimensao] = 'aumentar'
+        elif diferenca < -tolerancia:
+            mudanca[dimensao] = 'diminuir'
+    return mudanca
+
+
+def detectar_resistencias_mudanca(df_funcionarios, mudanca_cultural_desejada, top=5, limiar=30):
     """Detecta funcionários com possível resistência a mudanças culturais"""
-    resistencias = []
-
-    for idx, funcionario in df_funcionarios.iterrows():
-        perfil_atual = mapear_big_five_para_hofstede(funcionario)
-        score_resistencia = 0
-        fatores_resistencia = []
-
-        # Baixa abertura à experiência = resistência a mudanças
-        abertura = funcionario.get('perfil_big_five.abertura_a_experiencia', 5)
-        if abertura < 4:
-            score_resistencia += 25
-            fatores_resistencia.append("Baixa abertura a experiências")
-
-        # Alto neuroticismo = ansiedade com mudanças
-        neuroticismo = funcionario.get('perfil_big_five.neuroticismo', 5)
-        if neuroticismo > 7:
-            score_resistencia += 20
-            fatores_resistencia.append("Alto nível de ansiedade")
-
-        # Muito tempo na empresa = resistência por hábito
-        tempo_casa = funcionario.get('tempo_de_casa_meses', 12)
-        if tempo_casa > 48:  # Mais de 4 anos
-            score_resistencia += 15
-            fatores_resistencia.append("Funcionário muito experiente")
-
-        # Baixo engajamento = desinteresse em mudanças
-        enps = funcionario.get('engajamento.enps_recente', 5)
-        if enps < 4:
-            score_resistencia += 20
-            fatores_resistencia.append("Baixo engajamento")
-
-        # Performance baixa = foco em sobrevivência vs mudança
-        ultima_avaliacao = funcionario.get(
-            'performance.avaliacoes_desempenho', [{}])
-        if isinstance(ultima_avaliacao, list) and ultima_avaliacao:
-            nota = ultima_avaliacao[-1].get('nota', 7)
-        else:
-            nota = 7
-
-        if nota < 6:
-            score_resistencia += 20
-            fatores_resistencia.append("Performance abaixo da média")
-
-        # Resistência específica baseada na mudança desejada
-        for dimensao, direcao in mudanca_cultural_desejada.items():
-            valor_atual = perfil_atual.get(dimensao, 5)
-            if direcao == 'aumentar' and valor_atual > 8:
-                score_resistencia += 10
-                fatores_resistencia.append(
-                    f"Já tem alto {DIMENSOES_HOFSTEDE[dimensao]['nome']}")
-            elif direcao == 'diminuir' and valor_atual < 3:
-                score_resistencia += 10
+    caracteristicas = calcular_caracteristicas_culturais(df_funcionarios)
+    scores, fatores, extremos = pontuar_resistencia(
+        caracteristicas, mudanca_cultural_desejada)
+    resistentes = scores > limiar  # Threshold para ser considerado resistente
+
+    principais = []
+    for i in top_k(scores, top, resistentes):
+        fatores_resistencia = [rotulo for (rotulo, _), ativo
+                               in zip(FATORES_RESISTENCIA, fatores[i]) if ativo]
+        for dimensao, ativo in extremos.items():
+            if ativo[i]:
+                nivel = 'alto' if mudanca_cultural_desejada[dimensao] == 'aumentar' else 'baixo'
                 fatores_resistencia.append(
-                    f"Já tem baixo {DIMENSOES_HOFSTEDE[dimensao]['nome']}")
+                    f"Já tem {nivel} {DIMENSOES_HOFSTEDE[dimensao]['nome']}")
 
-        if score_resistencia > 30:  # Threshold para ser considerado resistente
-            resistencias.append({
-                'id': idx,
-                'nome': funcionario['nome'],
-                'cargo': funcionario['cargo'],
-                'departamento': funcionario['departamento'],
-                'score_resistencia': score_resistencia,
-                'fatores': fatores_resistencia
-            })
+        funcionario = df_funcionarios.iloc[i]
+        principais.append({
+            'id': df_funcionarios.index[i],
+            'nome': funcionario['nome'],
+            'cargo': funcionario['cargo'],
+            'departamento': funcionario['departamento'],
+            'score_resistencia': float(scores[i]),
+            'fatores': fatores_resistencia
+        })
 
-    return sorted(resistencias, key=lambda x: x['score_resistencia'], reverse=True)
+    return {
+        'total': int(resistentes.sum()),
+        'score_medio': float(scores[resistentes].mean()) if resistentes.any() else 0.0,
+        'principais': principais
+    }
 
 
-def gerar_estrategias_transformacao(perfil_atual, perfil_desejado, influenciadores, resistentes):
+def gerar_estrategias_transformacao(perfil_atual, perfil_desejado, influenciadores, n_resistentes):
     """Gera estratégias personalizadas de transformação cultural"""
     estrategias = []
 
@@ -385,11 +354,11 @@ def gerar_estrategias_transformacao(perfil_atual, perfil_desejado, influenciador
                     })
 
     # Estratégias para lidar com resistências
-    if resistentes:
+    if n_resistentes:
         estrategias.append({
             'dimensao': 'Gestão de Resistências',
             'objetivo': 'Engajar funcionários resistentes',
-            'gap': f'{len(resistentes)} pessoas',
+            'gap': f'{n_resistentes} pessoas',
             'acoes': [
                 'Comunicação transparente sobre mudanças',
                 'Envolvimento na co-criação da nova cultura',
@@ -472,11 +441,44 @@ with col2:
         else:
             st.info("Perfil equilibrado em todas as dimensões.")
 
+# --- Perfis por Grupo ---
+st.subheader("🏢 Perfil Cultural por Grupo")
+
+_, _, perfis_por_grupo = calcular_perfis_culturais(df_agentes)
+agrupamento = st.radio(
+    "Agrupar por:", options=list(perfis_por_grupo),
+    format_func=lambda x: {'departamento': 'Departamento', 'equipe_atual': 'Equipe'}.get(x, x),
+    horizontal=True)
+
+if agrupamento:
+    perfil_grupo = perfis_por_grupo[agrupamento]
+    dimensoes = list(DIMENSOES_HOFSTEDE.keys())
+    fig_grupos = px.imshow(
+        perfil_grupo[dimensoes].rename(
+            columns={d: DIMENSOES_HOFSTEDE[d]['nome'] for d in dimensoes}),
+        color_continuous_scale='RdBu_r',
+        zmin=1, zmax=10,
+        aspect='auto',
+        text_auto='.1f',
+        title="Dimensões Hofstede Médias por Grupo"
+    )
+    st.plotly_chart(fig_grupos, use_container_width=True)
+
 # --- Evolução Temporal ---
-st.header("📈 Evolução Cultural ao Longo do Tempo")
+st.header("📈 Projeção da Evolução Cultural")
+
+# Perfil alvo: sliders da seção de estratégias (session_state), ou o perfil atual
+perfil_alvo = {d: st.session_state.get(f"alvo_{d}", perfil_atual.get(d, 5))
+               for d in DIMENSOES_HOFSTEDE}
 
-# Simular dados históricos
-df_evolucao = simular_evolucao_cultural(perfil_atual)
+col1, col2 = st.columns(2)
+with col1:
+    horizonte_meses = st.slider("Horizonte (meses):", 6, 24, 12, 6)
+with col2:
+    df_evolucao = datar_evolucao(
+        simular_evolucao_cultural(df_agentes, perfil_alvo, horizonte_meses), datetime.now())
+    cenario_selecionado = st.selectbox(
+        "Cenário:", options=df_evolucao['cenario'].unique().tolist())
 
 # Seletor de dimensões para visualizar
 dimensoes_selecionadas = st.multiselect(
@@ -488,19 +490,34 @@ dimensoes_selecionadas = st.multiselect(
 
 if dimensoes_selecionadas:
     fig_evolucao = go.Figure()
+    df_cenario = df_evolucao[df_evolucao['cenario'] == cenario_selecionado]
+    cores = px.colors.qualitative.Plotly
 
-    for dimensao in dimensoes_selecionadas:
+    for i, dimensao in enumerate(dimensoes_selecionadas):
         nome = DIMENSOES_HOFSTEDE[dimensao]['nome']
+        serie = df_cenario[df_cenario['dimensao'] == dimensao]
+        cor = cores[i % len(cores)]
+
+        # Faixa P5-P95 e mediana
+        fig_evolucao.add_trace(go.Scatter(
+            x=serie['data'], y=serie['p95'], mode='lines',
+            line=dict(width=0, color=cor), showlegend=False, hoverinfo='skip'
+        ))
+        fig_evolucao.add_trace(go.Scatter(
+            x=serie['data'], y=serie['p5'], mode='lines',
+            line=dict(width=0, color=cor), fill='tonexty', opacity=0.2,
+            showlegend=False, hoverinfo='skip'
+        ))
         fig_evolucao.add_trace(go.Scatter(
-            x=df_evolucao['data'],
-            y=df_evolucao[dimensao],
+            x=serie['data'],
+            y=serie['p50'],
             mode='lines+markers',
             name=nome,
-            line=dict(width=3)
+            line=dict(width=3, color=cor)
         ))
 
     fig_evolucao.update_layout(
-        title="Evolução das Dimensões Culturais",
+        title=f"Evolução Projetada das Dimensões Culturais - {cenario_selecionado}",
         xaxis_title="Período",
         yaxis_title="Score (0-10)",
         height=400,
@@ -509,6 +526,16 @@ if dimensoes_selecionadas:
 
     st.plotly_chart(fig_evolucao, use_container_width=True)
 
+    # Comparação dos cenários ao fim do horizonte
+    final = df_evolucao[df_evolucao['data'] == df_evolucao['data'].max()]
+    st.dataframe(
+        final.pivot(index='cenario', columns='dimensao', values='p50')[
+            list(DIMENSOES_HOFSTEDE)].rename(
+            columns={d: DIMENSOES_HOFSTEDE[d]['nome'] for d in DIMENSOES_HOFSTEDE}
+        ).style.format('{:.1f}'),
+        use_container_width=True
+    )
+
 # --- Influenciadores Culturais ---
 st.header("🌟 Influenciadores Culturais")
 
@@ -564,35 +591,32 @@ with col2:
 # --- Análise de Resistências ---
 st.header("⚠️ Análise de Resistências")
 
-# Definir mudança cultural desejada (exemplo)
-mudanca_desejada = {
-    'distancia_poder': 'diminuir',
-    'aversao_incerteza': 'diminuir',
-    'orientacao_temporal': 'aumentar',
-    'indulgencia': 'aumentar'
-}
+# Mudança desejada: segue os sliders do perfil alvo quando ajustados
+mudanca_desejada = derivar_mudanca_desejada(perfil_atual, perfil_alvo) or MUDANCA_PADRAO
+st.caption("Mudança considerada: " + ", ".join(
+    f"{direcao} {DIMENSOES_HOFSTEDE[d]['nome']}" for d, direcao in mudanca_desejada.items()))
 
-resistentes = detectar_resistencias_mudanca(df_agentes, mudanca_desejada)
+resistencias = detectar_resistencias_mudanca(df_agentes, mudanca_desejada)
+resistentes = resistencias['principais']
 
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    st.metric("🚨 Funcionários Resistentes", len(resistentes))
+    st.metric("🚨 Funcionários Resistentes", resistencias['total'])
 
 with col2:
-    if resistentes:
-        score_medio = np.mean([r['score_resistencia'] for r in resistentes])
-        st.metric("📊 Score Médio Resistência", f"{score_medio:.1f}")
+    if resistencias['total']:
+        st.metric("📊 Score Médio Resistência", f"{resistencias['score_medio']:.1f}")
 
 with col3:
-    percentual_resistente = len(resistentes) / len(df_agentes) * 100
+    percentual_resistente = resistencias['total'] / len(df_agentes) * 100
     cor_delta = "inverse" if percentual_resistente > 20 else "normal"
     st.metric("📈 % Resistência",
               f"{percentual_resistente:.1f}%", delta_color=cor_delta)
 
 if resistentes:
     with st.expander("🔍 Detalhes dos Funcionários Resistentes", expanded=False):
-        for resistente in resistentes[:5]:  # Mostrar top 5
+        for resistente in resistentes:  # Top 5
             st.write(
                 f"**{resistente['nome']}** ({resistente['cargo']}) - Score: {resistente['score_resistencia']:.1f}")
             st.write(f"Fatores: {', '.join(resistente['fatores'])}")
@@ -618,14 +642,15 @@ with st.expander("⚙️ Configurar Perfil Alvo", expanded=False):
             valor_desejado = st.slider(
                 f"{nome}:",
                 0.0, 10.0, float(valor_atual), 0.1,
-                help=DIMENSOES_HOFSTEDE[dimensao]['descricao']
+                help=DIMENSOES_HOFSTEDE[dimensao]['descricao'],
+                key=f"alvo_{dimensao}"
             )
             perfil_desejado[dimensao] = valor_desejado
 
 # Gerar estratégias
 if st.button("🔮 Gerar Estratégias de Transformação", type="primary"):
     estrategias = gerar_estrategias_transformacao(
-        perfil_atual, perfil_desejado, influenciadores, resistentes
+        perfil_atual, perfil_desejado, influenciadores, resistencias['total']
     )
 
     st.success(f"✅ {len(estrategias)} estratégias geradas!")
@@ -7,6 +7,8 @@ import plotly.graph_objects as go
 import plotly.express as px
 from collections import Counter
 import random
+from humaniq.mobilidade import alocar_remanejamentos
+from humaniq.skill_gap import AgregadoGaps, MotorSkillGap, decodificar_conjuntos
 
 st.set_page_config(page_title="Skill Gap Intelligence",
                    page_icon="🔍", layout="wide")
@@ -103,206 +105,156 @@ def carregar_agentes():
     return df.set_index('id_funcionario')
 
 
+@st.cache_resource
+def preparar_motor_skills(df_funcionarios):
+    """Codifica competências e requisitos dos cargos em bitsets (uma vez por base)"""
+    motor = MotorSkillGap(CARGOS_SKILLS_NECESSARIAS)
+    base = motor.base(df_funcionarios.index, df_funcionarios['competencias'])
+    analise = motor.analisar_cargo_atual(base, df_funcionarios['cargo'])
+    impacto = np.array([SKILLS_CATALOGO.get(skill, {}).get('salario_impacto', 0)
+                        for skill in motor.vocabulario])
+    return motor, base, analise, impacto
+
+
+@st.cache_resource
+def agregado_gaps():
+    """Contadores de gaps mantidos entre reruns"""
+    return AgregadoGaps()
+
+
 def mapear_skills_atuais_vs_necessarias(df_funcionarios):
     """Mapeia skills atuais vs necessárias por cargo"""
-    analise_skills = []
-
-    for idx, funcionario in df_funcionarios.iterrows():
-        cargo = funcionario.get('cargo', '')
-        skills_atuais = set(funcionario.get('competencias', []))
-
-        if cargo in CARGOS_SKILLS_NECESSARIAS:
-            skills_necessarias = CARGOS_SKILLS_NECESSARIAS[cargo]
-
-            # Skills obrigatórias
-            obrigatorias = set(skills_necessarias['obrigatorias'])
-            gap_obrigatorias = obrigatorias - skills_atuais
-            match_obrigatorias = len(obrigatorias.intersection(
-                skills_atuais)) / len(obrigatorias) * 100
-
-            # Skills desejáveis
-            desejaveis = set(skills_necessarias['desejaveis'])
-            gap_desejaveis = desejaveis - skills_atuais
-            match_desejaveis = len(desejaveis.intersection(
-                skills_atuais)) / len(desejaveis) * 100 if desejaveis else 100
-
-            # Skills futuras
-            futuras = set(skills_necessarias['futuras'])
-            gap_futuras = futuras - skills_atuais
-            match_futuras = len(futuras.intersection(
-                skills_atuais)) / len(futuras) * 100 if futuras else 100
-
-            # Skills extras
-            todas_necessarias = obrigatorias.union(desejaveis).union(futuras)
-            skills_extras = skills_atuais - todas_necessarias
-
-            # Score geral
-            score_geral = (match_obrigatorias * 0.6 +
-                           match_desejaveis * 0.3 + match_futuras * 0.1)
-
-            analise_skills.append({
-                'id': idx,
-                'nome': funcionario['nome'],
-                'cargo': cargo,
-                'departamento': funcionario.get('departamento', ''),
-                'skills_atuais': skills_atuais,
-                'gap_obrigatorias': gap_obrigatorias,
-                'gap_desejaveis': gap_desejaveis,
-                'gap_futuras': gap_futuras,
-                'skills_extras': skills_extras,
-                'match_obrigatorias': match_obrigatorias,
-                'match_desejaveis': match_desejaveis,
-                'match_futuras': match_futuras,
-                'score_geral': score_geral
-            })
-
-    return analise_skills
-
-
-def identificar_talentos_ocultos(df_funcionarios):
-    """Identifica funcionários com skills subutilizadas"""
-    talentos_ocultos = []
-
-    for idx, funcionario in df_funcionarios.iterrows():
-        cargo_atual = funcionario.get('cargo', '')
-        skills_atuais = set(funcionario.get('competencias', []))
-
-        # Verificar se tem skills para outros cargos
-        for cargo_alternativo, skills_necessarias in CARGOS_SKILLS_NECESSARIAS.items():
-            if cargo_alternativo != cargo_atual:
-                obrigatorias = set(skills_necessarias['obrigatorias'])
-                desejaveis = set(skills_necessarias['desejaveis'])
-
-                match_obrigatorias = len(obrigatorias.intersection(
-                    skills_atuais)) / len(obrigatorias) * 100
-                match_desejaveis = len(desejaveis.intersection(
-                    skills_atuais)) / len(desejaveis) * 100 if desejaveis else 100
-
-                # Se tem bom match com outro cargo
-                if match_obrigatorias >= 60 and (match_obrigatorias + match_desejaveis) / 2 >= 70:
-                    # Calcular potencial de crescimento salarial
-                    skills_valiosas = obrigatorias.union(
-                        desejaveis).intersection(skills_atuais)
-                    impacto_salarial = sum([SKILLS_CATALOGO.get(skill, {}).get(
-                        'salario_impacto', 0) for skill in skills_valiosas])
-
-                    talentos_ocultos.append({
-                        'id': idx,
-                        'nome': funcionario['nome'],
-                        'cargo_atual': cargo_atual,
-                        'cargo_sugerido': cargo_alternativo,
-                        'match_obrigatorias': match_obrigatorias,
-                        'match_desejaveis': match_desejaveis,
-                        'score_total': (match_obrigatorias + match_desejaveis) / 2,
-                        'impacto_salarial': impacto_salarial,
-                        'skills_relevantes': list(skills_valiosas)
-                    })
-
-    # Remover duplicatas e ordenar por score
-    talentos_unicos = {}
-    for talento in talentos_ocultos:
-        key = talento['id']
-        if key not in talentos_unicos or talento['score_total'] > talentos_unicos[key]['score_total']:
-            talentos_unicos[key] = talento
-
-    return sorted(talentos_unicos.values(), key=lambda x: x['score_total'], reverse=True)
-
-
-def analisar_gaps_organizacionais(analise_skills):
-    """Analisa gaps de skills a nível organizacional"""
-    if not analise_skills:
-        return {}
-
-    # Contar gaps por skill
-    gaps_skills = Counter()
-    pessoas_com_gaps = Counter()
-
-    for pessoa in analise_skills:
-        todas_gaps = pessoa['gap_obrigatorias'].union(
-            pessoa['gap_desejaveis']).union(pessoa['gap_futuras'])
-        for skill in todas_gaps:
-            gaps_skills[skill] += 1
-            pessoas_com_gaps[skill] += 1
-
-    # Skills mais críticas
-    total_pessoas = len(analise_skills)
-    gaps_criticos = []
-
-    for skill, count in gaps_skills.most_common():
-        percentual = count / total_pessoas * 100
-        demanda_mercado = SKILLS_CATALOGO.get(
-            skill, {}).get('demanda_mercado', 50)
-        impacto_salarial = SKILLS_CATALOGO.get(
-            skill, {}).get('salario_impacto', 0)
-
-        # Score de criticidade
-        criticidade = percentual * 0.4 + demanda_mercado * 0.4 + impacto_salarial * 0.2
-
-        gaps_criticos.append({
-            'skill': skill,
-            'pessoas_afetadas': count,
-            'percentual_organizacao': percentual,
-            'demanda_mercado': demanda_mercado,
-            'impacto_salarial': impacto_salarial,
-            'criticidade': criticidade,
-            'categoria': SKILLS_CATALOGO.get(skill, {}).get('categoria', 'Outros')
-        })
+    motor, base, analise, _ = preparar_motor_skills(df_funcionarios)
+
+    linhas = np.flatnonzero(analise['indice_cargo'] >= 0)
+    vocabulario = motor.vocabulario
+    conjuntos = {
+        chave: decodificar_conjuntos(vocabulario, bits[linhas])
+        for chave, bits in [('skills_atuais', base.bits),
+                            ('gap_obrigatorias', analise['gap_obrigatorias']),
+                            ('gap_desejaveis', analise['gap_desejaveis']),
+                            ('gap_futuras', analise['gap_futuras']),
+                            ('skills_extras', analise['extras'])]
+    }
+
+    ids = df_funcionarios.index[linhas]
+    nomes = df_funcionarios['nome'].to_numpy()[linhas]
+    cargos = df_funcionarios['cargo'].to_numpy()[linhas]
+    departamentos = df_funcionarios['departamento'].fillna('').to_numpy()[linhas] \
+        if 'departamento' in df_funcionarios else [''] * len(linhas)
 
-    return sorted(gaps_criticos, key=lambda x: x['criticidade'], reverse=True)
+    return [
+        {
+            'id': ids[i],
+            'nome': nomes[i],
+            'cargo': cargos[i],
+            'departamento': departamentos[i],
+            'skills_atuais': conjuntos['skills_atuais'][i],
+            'gap_obrigatorias': conjuntos['gap_obrigatorias'][i],
+            'gap_desejaveis': conjuntos['gap_desejaveis'][i],
+            'gap_futuras': conjuntos['gap_futuras'][i],
+            'skills_extras': conjuntos['skills_extras'][i],
+            'match_obrigatorias': float(analise['match_obrigatorias'][linha]),
+            'match_desejaveis': float(analise['match_desejaveis'][linha]),
+            'match_futuras': float(analise['match_futuras'][linha]),
+            'score_geral': float(analise['score_geral'][linha])
+        }
+        for i, linha in enumerate(linhas)
+    ]
+
+
+def identificar_talentos_ocultos(df_funcionarios, top_k=1):
+    """Identifica funcionários com skills subutilizadas (top-k cargos por pessoa)"""
+    motor, base, _, impacto = preparar_motor_skills(df_funcionarios)
+    talentos = motor.talentos_ocultos(
+        base, df_funcionarios['cargo'], limiar_obrigatorias=60, limiar_score=70,
+        top_k=top_k)
+
+    if talentos.empty:
+        return []
+
+    relevantes = motor.skills_relevantes(
+        base, talentos['linha'].to_numpy(), talentos['indice_cargo'].to_numpy())
+    indicadores = motor.vocabulario.para_indicadores(relevantes)
+    impacto_salarial = indicadores @ impacto
+    skills_relevantes = decodificar_conjuntos(motor.vocabulario, relevantes)
+
+    ids = df_funcionarios.index.to_numpy()
+    nomes = df_funcionarios['nome'].to_numpy()
+    cargos = df_funcionarios['cargo'].to_numpy()
+
+    return [
+        {
+            'id': ids[talento.linha],
+            'nome': nomes[talento.linha],
+            'cargo_atual': cargos[talento.linha],
+            'cargo_sugerido': talento.cargo_sugerido,
+            'match_obrigatorias': talento.match_obrigatorias,
+            'match_desejaveis': talento.match_desejaveis,
+            'score_total': talento.score_total,
+            'impacto_salarial': int(impacto_salarial[i]),
+            'skills_relevantes': list(skills_relevantes[i])
+        }
+        for i, talento in enumerate(talentos.itertuples(index=False))
+    ]
+
+
+def analisar_gaps_organizacionais(df_funcionarios):
+    """Analisa gaps de skills a nível organizacional
+
+    Sincroniza o agregado incremental com a base atual (só as diferenças são
+    aplicadas) e lê os totais pré-calculados.
+    """
+    motor, base, analise, _ = preparar_motor_skills(df_funcionarios)
+    agregado = agregado_gaps()
+
+    linhas = np.flatnonzero(analise['indice_cargo'] >= 0)
+    gaps = (analise['gap_obrigatorias'] | analise['gap_desejaveis'] |
+            analise['gap_futuras'])[linhas]
+    departamentos = df_funcionarios['departamento'].fillna('').to_numpy()[linhas]
+    agregado.sincronizar(df_funcionarios.index[linhas], departamentos, gaps,
+                         motor.vocabulario, origem=base)
+
+    return agregado.gaps_criticos(SKILLS_CATALOGO)
 
 
 def sugerir_remanejamentos(talentos_ocultos, analise_skills):
-    """Sugere remanejamentos internos baseados em skills match"""
-    remanejamentos = []
+    """Sugere remanejamentos internos baseados em skills match
 
+    As vagas de cada cargo são as pessoas com gaps significativos (score < 80);
+    a alocação maximiza o benefício total com no máximo um movimento por pessoa.
+    """
     # Criar mapa de necessidades por cargo
-    necessidades_por_cargo = {}
-    for pessoa in analise_skills:
-        cargo = pessoa['cargo']
-        if cargo not in necessidades_por_cargo:
-            necessidades_por_cargo[cargo] = []
-
-        if pessoa['score_geral'] < 80:  # Pessoa com gaps significativos
-            necessidades_por_cargo[cargo].append({
-                'pessoa': pessoa['nome'],
-                'score': pessoa['score_geral'],
-                'gaps': pessoa['gap_obrigatorias'].union(pessoa['gap_desejaveis'])
-            })
-
-    # Identificar oportunidades de remanejamento
-    for talento in talentos_ocultos[:10]:  # Top 10 talentos
-        cargo_sugerido = talento['cargo_sugerido']
-
-        # Verificar se existe necessidade no cargo sugerido
-        if cargo_sugerido in necessidades_por_cargo and len(necessidades_por_cargo[cargo_sugerido]) > 0:
-            beneficio_estimado = talento['score_total'] - 50  # Baseline score
-            impacto_time = len(necessidades_por_cargo[cargo_sugerido])
-
-            remanejamentos.append({
-                'funcionario': talento['nome'],
-                'cargo_atual': talento['cargo_atual'],
-                'cargo_sugerido': cargo_sugerido,
-                'score_match': talento['score_total'],
-                'beneficio_estimado': beneficio_estimado,
-                'impacto_time': impacto_time,
-                'skills_relevantes': talento['skills_relevantes'],
-                'prioridade': 'Alta' if beneficio_estimado > 25 else 'Média' if beneficio_estimado > 15 else 'Baixa'
-            })
-
-    return sorted(remanejamentos, key=lambda x: x['beneficio_estimado'], reverse=True)
+    necessidades_por_cargo = Counter(
+        pessoa['cargo'] for pessoa in analise_skills if pessoa['score_geral'] < 80)
+
+    if not talentos_ocultos or not necessidades_por_cargo:
+        return []
+
+    candidatos = pd.DataFrame(talentos_ocultos)
+    candidatos['beneficio_estimado'] = candidatos['score_total'] - 50  # Baseline score
+
+    alocacao = alocar_remanejamentos(candidatos, necessidades_por_cargo)
+
+    return [
+        {
+            'funcionario': talento.nome,
+            'cargo_atual': talento.cargo_atual,
+            'cargo_sugerido': talento.cargo_sugerido,
+            'score_match': talento.score_total,
+            'beneficio_estimado': talento.beneficio_estimado,
+            'impacto_time': necessidades_por_cargo[talento.cargo_sugerido],
+            'skills_relevantes': talento.skills_relevantes,
+            'prioridade': 'Alta' if talento.beneficio_estimado > 25 else 'Média' if talento.beneficio_estimado > 15 else 'Baixa'
+        }
+        for talento in alocacao.itertuples(index=False)
+    ]
 
 
 def planejar_contratacoes_estrategicas(gaps_organizacionais, df_funcionarios):
     """Planeja contratações baseadas em gaps críticos"""
     contratacoes = []
 
-    # Analisar departamentos com mais gaps
-    gaps_por_dept = {}
-    for idx, funcionario in df_funcionarios.iterrows():
-        dept = funcionario.get('departamento', '')
-        if dept not in gaps_por_dept:
-            gaps_por_dept[dept] = []
-
     # Priorizar skills mais críticas
     for gap in gaps_organizacionais[:8]:  # Top 8 gaps
         skill = gap['skill']
@@ -419,7 +371,7 @@ if df_agentes.empty:
 
 # Análise inicial
 analise_skills = mapear_skills_atuais_vs_necessarias(df_agentes)
-gaps_organizacionais = analisar_gaps_organizacionais(analise_skills)
+gaps_organizacionais = analisar_gaps_organizacionais(df_agentes)
 talentos_ocultos = identificar_talentos_ocultos(df_agentes)
 
 # --- Dashboard Principal ---
@@ -519,6 +471,19 @@ if gaps_organizacionais:
 
     st.plotly_chart(fig_gaps, use_container_width=True)
 
+    # Gaps por departamento (totais mantidos pelo agregado)
+    gaps_dept = agregado_gaps().por_departamento()
+    skills_top = [g['skill'] for g in top_gaps if g['skill'] in gaps_dept.columns]
+    if not gaps_dept.empty and skills_top:
+        fig_dept = px.imshow(
+            gaps_dept[skills_top],
+            color_continuous_scale='Reds',
+            aspect='auto',
+            title="% de Pessoas com Gap por Departamento",
+            labels={'x': 'Skill', 'y': 'Departamento', 'color': '% com gap'}
+        )
+        st.plotly_chart(fig_dept, use_container_width=True)
+
     # Detalhamento dos gaps
     st.subheader("🔍 Análise Detalhada dos Gaps")
 
@@ -588,10 +553,15 @@ if talentos_ocultos:
 # --- Sugestões de Remanejamento ---
 st.header("🔄 Sugestões de Remanejamento")
 
-remanejamentos = sugerir_remanejamentos(talentos_ocultos, analise_skills)
+# Até 3 cargos candidatos por pessoa para o solver de alocação
+remanejamentos = sugerir_remanejamentos(
+    identificar_talentos_ocultos(df_agentes, top_k=3), analise_skills)
 
 if remanejamentos:
     st.subheader("🎯 Remanejamentos Estratégicos Recomendados")
+    st.caption(
+        f"Alocação ótima: {len(remanejamentos)} movimentos, benefício total "
+        f"+{sum(r['beneficio_estimado'] for r in remanejamentos):.1f}")
 
     for remanejamento in remanejamentos[:5]:  # Top 5
         cor_prioridade = 'error' if remanejamento[
@@ -6,7 +6,10 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-import random
+from humaniq.competencias import IndiceSkills
+from humaniq.mercado import (SALARIO_MERCADO_PADRAO, benchmark_salarial,
+                             custo_substituicao, variacao_estavel)
+from humaniq.provedores_mercado import RECURSOS, CacheMercado, provedor_de_fonte
 
 st.set_page_config(page_title="Market Intelligence",
                    page_icon="🌍", layout="wide")
@@ -18,98 +21,26 @@ st.markdown("""
 Sistema que monitora tendências salariais, demanda de competências, análise competitiva de talentos e insights de employer branding em tempo real.
 """)
 
-# --- Dados de Mercado (Simulados) ---
-DADOS_MERCADO = {
-    'salarios_por_cargo': {
-        'Analista de Dados': {
-            'junior': {'min': 4500, 'max': 7000, 'medio': 5750, 'crescimento_anual': 12},
-            'pleno': {'min': 7000, 'max': 12000, 'medio': 9500, 'crescimento_anual': 15},
-            'senior': {'min': 12000, 'max': 20000, 'medio': 16000, 'crescimento_anual': 18}
-        },
-        'Engenheiro de Software': {
-            'junior': {'min': 5000, 'max': 8000, 'medio': 6500, 'crescimento_anual': 14},
-            'pleno': {'min': 8000, 'max': 15000, 'medio': 11500, 'crescimento_anual': 16},
-            'senior': {'min': 15000, 'max': 25000, 'medio': 20000, 'crescimento_anual': 20}
-        },
-        'Cientista de Dados': {
-            'junior': {'min': 6000, 'max': 10000, 'medio': 8000, 'crescimento_anual': 25},
-            'pleno': {'min': 10000, 'max': 18000, 'medio': 14000, 'crescimento_anual': 28},
-            'senior': {'min': 18000, 'max': 35000, 'medio': 26500, 'crescimento_anual': 30}
-        },
-        'Designer UX/UI': {
-            'junior': {'min': 3500, 'max': 6000, 'medio': 4750, 'crescimento_anual': 10},
-            'pleno': {'min': 6000, 'max': 11000, 'medio': 8500, 'crescimento_anual': 12},
-            'senior': {'min': 11000, 'max': 18000, 'medio': 14500, 'crescimento_anual': 15}
-        },
-        'Gerente de Produto': {
-            'junior': {'min': 8000, 'max': 12000, 'medio': 10000, 'crescimento_anual': 8},
-            'pleno': {'min': 12000, 'max': 20000, 'medio': 16000, 'crescimento_anual': 10},
-            'senior': {'min': 20000, 'max': 35000, 'medio': 27500, 'crescimento_anual': 12}
-        },
-        'Gerente de Marketing': {
-            'junior': {'min': 6000, 'max': 10000, 'medio': 8000, 'crescimento_anual': 6},
-            'pleno': {'min': 10000, 'max': 16000, 'medio': 13000, 'crescimento_anual': 8},
-            'senior': {'min': 16000, 'max': 28000, 'medio': 22000, 'crescimento_anual': 10}
-        },
-        'Analista de RH': {
-            'junior': {'min': 3000, 'max': 5000, 'medio': 4000, 'crescimento_anual': 5},
-            'pleno': {'min': 5000, 'max': 8500, 'medio': 6750, 'crescimento_anual': 7},
-            'senior': {'min': 8500, 'max': 15000, 'medio': 11750, 'crescimento_anual': 9}
-        }
-    },
+# --- Dados de Mercado ---
+# Fonte: diretório com CSV/Parquet (padrão) ou URL de um feed HTTP
+FONTE_MERCADO = os.getenv('HUMANIQ_MERCADO_FONTE', 'data/mercado')
+DIRETORIO_CACHE_MERCADO = "data/cache/mercado"
+TTL_MERCADO_SEGUNDOS = 6 * 3600
 
-    'demanda_skills': {
-        'Python': {'demanda_atual': 95, 'crescimento_6m': 8, 'escassez': 'Alta', 'salario_premium': 25},
-        'JavaScript': {'demanda_atual': 90, 'crescimento_6m': 5, 'escassez': 'Média', 'salario_premium': 15},
-        'Machine Learning': {'demanda_atual': 98, 'crescimento_6m': 15, 'escassez': 'Crítica', 'salario_premium': 40},
-        'SQL': {'demanda_atual': 85, 'crescimento_6m': 3, 'escassez': 'Baixa', 'salario_premium': 8},
-        'React': {'demanda_atual': 88, 'crescimento_6m': 10, 'escassez': 'Média', 'salario_premium': 18},
-        'AWS': {'demanda_atual': 92, 'crescimento_6m': 12, 'escassez': 'Alta', 'salario_premium': 30},
-        'Liderança': {'demanda_atual': 95, 'crescimento_6m': 4, 'escassez': 'Alta', 'salario_premium': 35},
-        'Comunicação': {'demanda_atual': 90, 'crescimento_6m': 2, 'escassez': 'Média', 'salario_premium': 10}
-    },
 
-    'employer_branding': {
-        'nossa_empresa': {
-            'glassdoor_rating': 4.2,
-            'linkedin_followers': 15680,
-            'mentions_positivas': 78,
-            'employee_satisfaction': 82,
-            'cultura_score': 4.1,
-            'beneficios_score': 3.9,
-            'crescimento_score': 4.3
-        },
-        'concorrentes': {
-            'Empresa A': {
-                'glassdoor_rating': 4.5,
-                'linkedin_followers': 25000,
-                'mentions_positivas': 85,
-                'employee_satisfaction': 88,
-                'cultura_score': 4.4,
-                'beneficios_score': 4.2,
-                'crescimento_score': 4.1
-            },
-            'Empresa B': {
-                'glassdoor_rating': 3.8,
-                'linkedin_followers': 12000,
-                'mentions_positivas': 65,
-                'employee_satisfaction': 75,
-                'cultura_score': 3.9,
-                'beneficios_score': 3.7,
-                'crescimento_score': 3.8
-            },
-            'Empresa C': {
-                'glassdoor_rating': 4.1,
-                'linkedin_followers': 18500,
-                'mentions_positivas': 72,
-                'employee_satisfaction': 80,
-                'cultura_score': 4.0,
-                'beneficios_score': 3.8,
-                'crescimento_score': 4.2
-            }
-        }
-    }
-}
+@st.cache_resource
+def conectar_mercado(fonte):
+    """Cache em disco (com atualização em segundo plano) da fonte de mercado"""
+    return CacheMercado(provedor_de_fonte(fonte), DIRETORIO_CACHE_MERCADO,
+                        TTL_MERCADO_SEGUNDOS)
+
+
+try:
+    mercado = conectar_mercado(FONTE_MERCADO)
+    DADOS_MERCADO = {recurso: mercado.obter(recurso) for recurso in RECURSOS}
+except (OSError, ValueError, KeyError) as erro:
+    st.error(f"❌ Não foi possível carregar os dados de mercado de '{FONTE_MERCADO}': {erro}")
+    st.stop()
 
 TENDENCIAS_MERCADO = [
     {
@@ -168,113 +99,87 @@ def carregar_agentes():
     return df.set_index('id_funcionario')
 
 
-def simular_salarios_internos(df_funcionarios):
-    """Simula salários internos baseados em cargo e senioridade"""
-    salarios_internos = []
-
-    for idx, funcionario in df_funcionarios.iterrows():
-        cargo = funcionario.get('cargo', '')
-        tempo_casa = funcionario.get('tempo_de_casa_meses', 12)
-
-        # Determinar senioridade baseada no tempo
-        if tempo_casa <= 12:
-            senioridade = 'junior'
-        elif tempo_casa <= 36:
-            senioridade = 'pleno'
-        else:
-            senioridade = 'senior'
-
-        # Buscar dados de mercado
-        if cargo in DADOS_MERCADO['salarios_por_cargo']:
-            dados_cargo = DADOS_MERCADO['salarios_por_cargo'][cargo][senioridade]
-
-            # Simular salário interno (variação de ±15% do mercado)
-            salario_mercado = dados_cargo['medio']
-            variacao = random.uniform(-0.15, 0.15)
-            salario_interno = salario_mercado * (1 + variacao)
-
-            salarios_internos.append({
-                'id': idx,
-                'nome': funcionario['nome'],
-                'cargo': cargo,
-                'senioridade': senioridade,
-                'salario_interno': round(salario_interno, 0),
-                'salario_mercado': salario_mercado,
-                'gap_salarial': round((salario_interno - salario_mercado) / salario_mercado * 100, 1),
-                'min_mercado': dados_cargo['min'],
-                'max_mercado': dados_cargo['max'],
-                'crescimento_anual': dados_cargo['crescimento_anual']
-            })
-
-    return salarios_internos
-
-
-def analisar_competitividade_salarial(salarios_internos):
+@st.cache_data
+def simular_salarios_internos(df_funcionarios, salarios):
+    """Benchmark de salários internos por cargo e senioridade (index = id_funcionario)"""
+    tempo_casa = (df_funcionarios['tempo_de_casa_meses'].fillna(12)
+                  if 'tempo_de_casa_meses' in df_funcionarios
+                  else pd.Series(12, index=df_funcionarios.index))
+    cargos = df_funcionarios['cargo'] if 'cargo' in df_funcionarios \
+        else pd.Series('', index=df_funcionarios.index)
+
+    # Salário interno: do registro, se houver; senão ±15% estável em torno do mercado
+    if 'salario_mensal' in df_funcionarios:
+        salario_interno = df_funcionarios['salario_mensal']
+    else:
+        referencia = benchmark_salarial(cargos, tempo_casa, salarios,
+                                        np.zeros(len(df_funcionarios)))
+        salario_interno = referencia['salario_mercado'].reindex(df_funcionarios.index) * \
+            (1 + variacao_estavel(df_funcionarios.index, 0.15))
+
+    df_salarios = benchmark_salarial(cargos, tempo_casa, salarios, salario_interno)
+    df_salarios.insert(0, 'nome', df_funcionarios.loc[df_salarios.index, 'nome'])
+    df_salarios.insert(0, 'id', df_salarios.index)
+    return df_salarios
+
+
+def analisar_competitividade_salarial(df_salarios):
     """Analisa competitividade salarial da empresa"""
-    if not salarios_internos:
+    if df_salarios.empty:
         return {}
 
-    gaps_positivos = [s for s in salarios_internos if s['gap_salarial'] > 0]
-    gaps_negativos = [s for s in salarios_internos if s['gap_salarial'] < 0]
-
-    gap_medio = np.mean([s['gap_salarial'] for s in salarios_internos])
-
-    # Risco de turnover baseado em gap salarial
-    alto_risco = [s for s in salarios_internos if s['gap_salarial'] < -15]
-
-    # Análise por cargo
-    gaps_por_cargo = {}
-    for salario in salarios_internos:
-        cargo = salario['cargo']
-        if cargo not in gaps_por_cargo:
-            gaps_por_cargo[cargo] = []
-        gaps_por_cargo[cargo].append(salario['gap_salarial'])
-
-    gaps_cargo_medio = {cargo: np.mean(gaps)
-                        for cargo, gaps in gaps_por_cargo.items()}
+    gaps = df_salarios['gap_salarial']
+    alto_risco = df_salarios[gaps < -15]  # Risco de turnover baseado em gap salarial
 
     return {
-        'gap_medio_geral': gap_medio,
-        'funcionarios_acima_mercado': len(gaps_positivos),
-        'funcionarios_abaixo_mercado': len(gaps_negativos),
+        'gap_medio_geral': gaps.mean(),
+        'funcionarios_acima_mercado': int((gaps > 0).sum()),
+        'funcionarios_abaixo_mercado': int((gaps < 0).sum()),
         'alto_risco_turnover': len(alto_risco),
-        'gaps_por_cargo': gaps_cargo_medio,
-        'pessoas_alto_risco': [s['nome'] for s in alto_risco]
+        'gaps_por_cargo': gaps.groupby(df_salarios['cargo'], sort=False).mean().to_dict(),
+        'pessoas_alto_risco': alto_risco['nome'].tolist()
     }
 
 
-def identificar_talentos_escassos(df_funcionarios):
+@st.cache_resource
+def indexar_skills(df_funcionarios):
+    """Índice invertido competência -> funcionários (linhas de df_funcionarios)"""
+    competencias = df_funcionarios['competencias'] if 'competencias' in df_funcionarios else []
+    return IndiceSkills(df_funcionarios.index, competencias)
+
+
+def identificar_talentos_escassos(df_funcionarios, indice_skills):
     """Identifica funcionários com skills escassas no mercado"""
-    talentos_escassos = []
-
-    for idx, funcionario in df_funcionarios.iterrows():
-        skills = funcionario.get('competencias', [])
-        score_escassez = 0
-        skills_escassas = []
-
-        for skill in skills:
-            if skill in DADOS_MERCADO['demanda_skills']:
-                dados_skill = DADOS_MERCADO['demanda_skills'][skill]
-                if dados_skill['escassez'] in ['Alta', 'Crítica']:
-                    score_escassez += dados_skill['demanda_atual']
-                    skills_escassas.append({
-                        'skill': skill,
-                        'escassez': dados_skill['escassez'],
-                        'demanda': dados_skill['demanda_atual'],
-                        'premium': dados_skill['salario_premium']
-                    })
-
-        if skills_escassas:
-            talentos_escassos.append({
-                'id': idx,
-                'nome': funcionario['nome'],
-                'cargo': funcionario['cargo'],
-                'score_escassez': score_escassez,
-                'skills_escassas': skills_escassas,
-                'risco_recrutamento': 'Alto' if score_escassez > 180 else 'Médio' if score_escassez > 90 else 'Baixo'
+    skills_escassas = {skill: dados for skill, dados in DADOS_MERCADO['demanda_skills'].items()
+                       if dados['escassez'] in ['Alta', 'Crítica']}
+
+    # Score e skills escassas de cada titular, percorrendo só os titulares
+    score_escassez = indice_skills.pontuar(
+        {skill: dados['demanda_atual'] for skill, dados in skills_escassas.items()})
+    skills_por_posicao = {}
+    for skill, dados in skills_escassas.items():
+        for posicao in indice_skills.posicoes(skill):
+            skills_por_posicao.setdefault(int(posicao), []).append({
+                'skill': skill,
+                'escassez': dados['escassez'],
+                'demanda': dados['demanda_atual'],
+                'premium': dados['salario_premium']
             })
 
-    return sorted(talentos_escassos, key=lambda x: x['score_escassez'], reverse=True)
+    posicoes = np.fromiter(skills_por_posicao, dtype=np.int64, count=len(skills_por_posicao))
+    posicoes = posicoes[np.lexsort((posicoes, -score_escassez[posicoes]))]
+    nomes = df_funcionarios['nome'].to_numpy()
+    cargos = df_funcionarios['cargo'].to_numpy()
+
+    return [{
+        'id': indice_skills.ids[posicao],
+        'nome': nomes[posicao],
+        'cargo': cargos[posicao],
+        'score_escassez': float(score_escassez[posicao]),
+        'skills_escassas': skills_por_posicao[posicao],
+        'risco_recrutamento': 'Alto' if score_escassez[posicao] > 180
+        else 'Médio' if score_escassez[posicao] > 90 else 'Baixo'
+    } for posicao in posicoes.tolist()]
 
 
 def gerar_relatorio_employer_branding():
@@ -302,66 +207,35 @@ def gerar_relatorio_employer_branding():
     return comparacoes
 
 
-def calcular_custo_substituicao(funcionario_info, salarios_mercado):
+def calcular_custo_substituicao(id_funcionario, df_salarios):
     """Calcula custo de substituição de um funcionário"""
-    cargo = funcionario_info.get('cargo', '')
-
-    # Buscar salário de mercado
-    salario_mercado = 0
-    for sal in salarios_mercado:
-        if sal['nome'] == funcionario_info.get('nome', ''):
-            salario_mercado = sal['salario_mercado']
-            break
-
-    if salario_mercado == 0:
-        salario_mercado = 8000  # Default
-
-    # Componentes do custo de substituição
-    custos = {
-        'recrutamento': salario_mercado * 0.5,  # 0.5x salário mensal
-        'onboarding': salario_mercado * 1.0,    # 1x salário mensal
-        'treinamento': salario_mercado * 0.8,   # 0.8x salário mensal
-        'produtividade_perdida': salario_mercado * 2.0,  # 2x salário mensal
-        'knowledge_loss': salario_mercado * 0.7  # 0.7x salário mensal
-    }
+    salario_mercado = df_salarios['salario_mercado'].get(id_funcionario, SALARIO_MERCADO_PADRAO)
+    if not salario_mercado or pd.isna(salario_mercado):
+        salario_mercado = SALARIO_MERCADO_PADRAO
+    salario_mercado = float(salario_mercado)
 
-    custo_total = sum(custos.values())
+    # Componentes do custo de substituição (múltiplos do salário mensal)
+    custos, custo_total = custo_substituicao(salario_mercado)
+    custos = {componente: float(valor) for componente, valor in custos.items()}
 
     return {
-        'custo_total': custo_total,
+        'custo_total': float(custo_total),
         'breakdown': custos,
-        'meses_payback': round(custo_total / salario_mercado, 1)
+        'meses_payback': round(float(custo_total) / salario_mercado, 1)
     }
 
 
-def simular_dados_temporais():
-    """Simula evolução temporal de métricas de mercado"""
-    dates = pd.date_range(start='2024-01-01', end='2025-01-01', freq='M')
-
-    # Simular evolução do Glassdoor rating
-    nossa_rating = []
-    rating_base = 4.2
-    for i, date in enumerate(dates):
-        # Simulação de melhoria gradual
-        rating = rating_base + (i * 0.02) + random.gauss(0, 0.05)
-        rating = max(1, min(5, rating))  # Entre 1 e 5
-        nossa_rating.append(rating)
-
-    # Simular market share de talentos
-    market_share = []
-    share_base = 15
-    for i, date in enumerate(dates):
-        share = share_base + (i * 0.5) + random.gauss(0, 1)
-        share = max(5, min(30, share))  # Entre 5% e 30%
-        market_share.append(share)
-
-    return pd.DataFrame({
-        'data': dates,
-        'glassdoor_rating': nossa_rating,
-        'market_share_talentos': market_share,
-        # % em relação ao mercado
-        'competitividade_salarial': [random.gauss(95, 5) for _ in dates]
-    })
+def carregar_historico_mercado(mercado, meses=24):
+    """Últimos meses do histórico de mercado (sincronizado em segundo plano)"""
+    return mercado.historico(meses=meses).reset_index()
+
+
+def series_por_prefixo(df_temporal, prefixo, nome):
+    """Colunas ``<prefixo>.<item>`` do histórico em formato longo (data, nome, valor)"""
+    colunas = [coluna for coluna in df_temporal.columns if coluna.startswith(prefixo + '.')]
+    longo = df_temporal.melt(id_vars='data', value_vars=colunas, var_name=nome, value_name='valor')
+    longo[nome] = longo[nome].str[len(prefixo) + 1:]
+    return longo.dropna(subset=['valor'])
 
 
 # --- Interface Principal ---
@@ -373,9 +247,10 @@ if df_agentes.empty:
     st.stop()
 
 # Análises iniciais
-salarios_internos = simular_salarios_internos(df_agentes)
-competitividade = analisar_competitividade_salarial(salarios_internos)
-talentos_escassos = identificar_talentos_escassos(df_agentes)
+df_salarios = simular_salarios_internos(df_agentes, DADOS_MERCADO['salarios_por_cargo'])
+competitividade = analisar_competitividade_salarial(df_salarios)
+indice_skills = indexar_skills(df_agentes)
+talentos_escassos = identificar_talentos_escassos(df_agentes, indice_skills)
 employer_branding = gerar_relatorio_employer_branding()
 
 # --- Dashboard Principal ---
@@ -418,10 +293,8 @@ with col4:
 # --- Benchmarking Salarial ---
 st.header("💰 Benchmarking Salarial")
 
-if salarios_internos:
+if not df_salarios.empty:
     # Gráfico de comparação salarial por cargo
-    df_salarios = pd.DataFrame(salarios_internos)
-
     fig_salarios = px.scatter(
         df_salarios,
         x='salario_mercado',
@@ -478,10 +351,11 @@ if salarios_internos:
     if competitividade.get('pessoas_alto_risco'):
         st.subheader("🚨 Funcionários em Alto Risco (Gap > -15%)")
 
-        funcionarios_risco = [
-            s for s in salarios_internos if s['gap_salarial'] < -15]
+        funcionarios_risco = df_salarios[df_salarios['gap_salarial'] < -15]
+        if len(funcionarios_risco) > 10:
+            st.caption(f"Mostrando os 10 maiores gaps de {len(funcionarios_risco)} funcionários em risco.")
 
-        for funcionario in funcionarios_risco:
+        for _, funcionario in funcionarios_risco.nsmallest(10, 'gap_salarial').iterrows():
             with st.container():
                 col1, col2, col3, col4 = st.columns(4)
 
@@ -501,13 +375,10 @@ if salarios_internos:
 
                 with col4:
                     # Calcular custo de substituição
-                    custo_substituicao = calcular_custo_substituicao(
-                        {'nome': funcionario['nome'],
-                            'cargo': funcionario['cargo']},
-                        salarios_internos
-                    )
+                    substituicao = calcular_custo_substituicao(
+                        funcionario['id'], df_salarios)
                     st.metric("Custo Substituição",
-                              f"R$ {custo_substituicao['custo_total']:,.0f}")
+                              f"R$ {substituicao['custo_total']:,.0f}")
 
                     if st.button(f"💰 Ajustar Salário", key=f"ajuste_{funcionario['id']}"):
                         st.success("✅ Proposta de ajuste salarial criada!")
@@ -577,20 +448,11 @@ with col2:
 # Skills gap vs mercado
 st.subheader("🔍 Nossos Skills vs Demanda de Mercado")
 
-# Analisar quais skills em alta demanda temos/não temos
-all_skills_funcionarios = set()
-for _, funcionario in df_agentes.iterrows():
-    all_skills_funcionarios.update(funcionario.get('competencias', []))
-
+# Analisar quais skills em alta demanda temos/não temos (contagens do índice)
 skills_analysis = []
 for skill, dados in skills_mercado.items():
-    temos_skill = skill in all_skills_funcionarios
-    pessoas_com_skill = 0
-
-    if temos_skill:
-        for _, funcionario in df_agentes.iterrows():
-            if skill in funcionario.get('competencias', []):
-                pessoas_com_skill += 1
+    pessoas_com_skill = indice_skills.contagem(skill)
+    temos_skill = pessoas_com_skill > 0
 
     skills_analysis.append({
         'Skill': skill,
@@ -648,12 +510,10 @@ if talentos_escassos:
                 st.metric("Score Escassez", f"{talento['score_escassez']:.0f}")
 
                 # Calcular custo de substituição
-                custo_substituicao = calcular_custo_substituicao(
-                    {'nome': talento['nome'], 'cargo': talento['cargo']},
-                    salarios_internos
-                )
+                substituicao = calcular_custo_substituicao(
+                    talento['id'], df_salarios)
                 st.metric("Custo Substituição",
-                          f"R$ {custo_substituicao['custo_total']:,.0f}")
+                          f"R$ {substituicao['custo_total']:,.0f}")
 
                 if st.button(f"🛡️ Criar Plano Retenção", key=f"retencao_{talento['id']}"):
                     st.success("✅ Plano de retenção criado!")
@@ -762,7 +622,7 @@ for tendencia in TENDENCIAS_MERCADO:
         skills_que_faltam = []
 
         for skill in tendencia['skills_relacionadas']:
-            if skill in all_skills_funcionarios:
+            if skill in indice_skills:
                 skills_que_temos.append(skill)
             else:
                 skills_que_faltam.append(skill)
@@ -778,36 +638,79 @@ for tendencia in TENDENCIAS_MERCADO:
 # --- Evolução Temporal ---
 st.header("📊 Evolução Temporal")
 
-df_temporal = simular_dados_temporais()
+df_temporal = carregar_historico_mercado(mercado)
+if mercado.ultimo_erro is not None:
+    st.warning(f"⚠️ Última atualização da fonte de mercado falhou: {mercado.ultimo_erro}. "
+               + ("Exibindo os dados em cache." if not df_temporal.empty else "Não há histórico em cache."))
 
-col1, col2 = st.columns(2)
+if df_temporal.empty:
+    st.info("Sem histórico de mercado na fonte configurada.")
+else:
+    st.caption(f"Histórico de {df_temporal['data'].min():%m/%Y} a "
+               f"{df_temporal['data'].max():%m/%Y} — fonte: {FONTE_MERCADO}")
 
-with col1:
-    # Evolução do Glassdoor Rating
-    fig_rating = px.line(
-        df_temporal,
-        x='data',
-        y='glassdoor_rating',
-        title="Evolução do Glassdoor Rating",
-        labels={'glassdoor_rating': 'Rating', 'data': 'Período'}
-    )
+    col1, col2 = st.columns(2)
 
-    fig_rating.add_hline(y=4.5, line_dash="dash", line_color="green",
-                         annotation_text="Meta: 4.5")
+    with col1:
+        # Evolução do Glassdoor Rating
+        if 'glassdoor_rating' in df_temporal:
+            fig_rating = px.line(
+                df_temporal,
+                x='data',
+                y='glassdoor_rating',
+                title="Evolução do Glassdoor Rating",
+                labels={'glassdoor_rating': 'Rating', 'data': 'Período'}
+            )
 
-    st.plotly_chart(fig_rating, use_container_width=True)
+            fig_rating.add_hline(y=4.5, line_dash="dash", line_color="green",
+                                 annotation_text="Meta: 4.5")
 
-with col2:
-    # Market share de talentos
-    fig_share = px.line(
-        df_temporal,
-        x='data',
-        y='market_share_talentos',
-        title="Market Share de Talentos (%)",
-        labels={'market_share_talentos': 'Market Share (%)', 'data': 'Período'}
-    )
+            st.plotly_chart(fig_rating, use_container_width=True)
+
+    with col2:
+        # Market share de talentos
+        if 'market_share_talentos' in df_temporal:
+            fig_share = px.line(
+                df_temporal,
+                x='data',
+                y='market_share_talentos',
+                title="Market Share de Talentos (%)",
+                labels={'market_share_talentos': 'Market Share (%)', 'data': 'Período'}
+            )
+
+            st.plotly_chart(fig_share, use_container_width=True)
 
-    st.plotly_chart(fig_share, use_container_width=True)
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Demanda histórica das skills monitoradas
+        df_demanda_historica = series_por_prefixo(df_temporal, 'demanda', 'Skill')
+        if not df_demanda_historica.empty:
+            fig_demanda_historica = px.line(
+                df_demanda_historica,
+                x='data',
+                y='valor',
+                color='Skill',
+                title="Demanda de Skills no Mercado",
+                labels={'valor': 'Demanda', 'data': 'Período'}
+            )
+
+            st.plotly_chart(fig_demanda_historica, use_container_width=True)
+
+    with col2:
+        # Salário médio de mercado (pleno) por cargo
+        df_salario_historico = series_por_prefixo(df_temporal, 'salario_pleno', 'Cargo')
+        if not df_salario_historico.empty:
+            fig_salario_historico = px.line(
+                df_salario_historico,
+                x='data',
+                y='valor',
+                color='Cargo',
+                title="Salário Médio de Mercado (Pleno)",
+                labels={'valor': 'Salário (R$)', 'data': 'Período'}
+            )
+
+            st.plotly_chart(fig_salario_historico, use_container_width=True)
 
 # --- Recomendações Estratégicas ---
 st.header("💡 Recomendações Estratégicas")
@@ -820,7 +723,7 @@ if competitividade.get('alto_risco_turnover', 0) > 2:
         'categoria': 'Retenção Salarial',
         'prioridade': 'Alta',
         'acao': 'Ajustar salários dos funcionários em risco',
-        'investimento': f"R$ {len(salarios_internos) * 2000:,.0f}",
+        'investimento': f"R$ {len(df_salarios) * 2000:,.0f}",
         'roi': 'Evitar custos de substituição 5x maiores'
     })
 
@@ -1,10 +1,9 @@
 import streamlit as st
-import pandas as pd
 import os
-import json
 from datetime import datetime
 from dotenv import load_dotenv
 import anthropic
+from humaniq.ui import busca_agentes, indice_agentes, selecionar_funcionario
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -84,26 +83,8 @@ ESPECIALISTAS = {
     }
 }
 
-# --- Funções ---
-
-@st.cache_data
-def carregar_agentes():
-    AGENT_DIR = "data/agents"
-    if not os.path.exists(AGENT_DIR):
-        return pd.DataFrame()
-
-    agent_files = [f for f in os.listdir(AGENT_DIR) if f.endswith('.json')]
-    if not agent_files:
-        return pd.DataFrame()
-
-    all_agents_data = []
-    for f in agent_files:
-        with open(os.path.join(AGENT_DIR, f), 'r', encoding='utf-8') as file:
-            all_agents_data.append(json.load(file))
-
-    df = pd.json_normalize(all_agents_data)
-    return df.set_index('id_funcionario')
 
+# --- Funções ---
 
 def get_mentor_response(prompt, mentor_name, funcionario_context):
     """Gera resposta usando Claude AI com perfil do mentor selecionado"""
@@ -200,22 +181,23 @@ def get_mentor_response(prompt, mentor_name, funcionario_context):
 # --- Interface Principal ---
 st.sidebar.header("🔧 Configurações")
 
-# Carregar dados dos agentes
-df_agentes = carregar_agentes()
+# Índice leve para o seletor (só arquivos novos/alterados são relidos)
+indice = indice_agentes()
+indice.atualizar()
 
-if df_agentes.empty:
+if not len(indice):
     st.warning(
         "⚠️ Nenhum agente encontrado. Execute o script generate_agents.py primeiro.")
     st.stop()
 
 # Seleção do funcionário
-id_selecionado = st.sidebar.selectbox(
-    "👤 Funcionário:",
-    options=df_agentes.index.tolist(),
-    format_func=lambda x: f"{df_agentes.loc[x, 'nome']} ({df_agentes.loc[x, 'cargo']})"
-)
+id_selecionado = selecionar_funcionario(
+    busca_agentes(indice.versao), "👤 Funcionário:", "funcionario", st.sidebar)
+if id_selecionado is None:
+    st.stop()
 
-agente_atual = df_agentes.loc[id_selecionado].to_dict()
+# Registro completo (aninhado, como no JSON) lido só para o selecionado
+agente_atual = indice.carregar(id_selecionado)
 
 # --- Interface de Seleção de Mentores ---
 st.subheader("🎯 Escolha seu Mentor")
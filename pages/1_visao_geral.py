@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
-import json
+from humaniq.embedding import EmbeddingAgentes
+from humaniq.graficos import grafico_dispersao
+from humaniq.ui import busca_agentes, indice_agentes, selecionar_funcionario
 
 # Configuração da página
 st.set_page_config(
@@ -17,16 +19,29 @@ st.subheader("Análise de Perfil de Funcionário")
 import os
 
 AGENT_DIR = "data/agents"
+
+
+@st.cache_resource
+def embedding_agentes(diretorio):
+    """PCA ajustado uma vez e mantido incrementalmente entre reruns"""
+    return EmbeddingAgentes(diretorio)
+
+
 try:
-    agent_files = [f for f in os.listdir(AGENT_DIR) if f.endswith('.json')]
-    agent_ids = sorted([f.split('.')[0] for f in agent_files])
+    if not os.path.isdir(AGENT_DIR):
+        raise FileNotFoundError(AGENT_DIR)
+    indice = indice_agentes(AGENT_DIR)
+    indice.atualizar()
 
-    selected_agent_id = st.sidebar.selectbox("Selecione um Agente", options=agent_ids)
+    selected_agent_id = selecionar_funcionario(
+        busca_agentes(indice.versao, AGENT_DIR), "Selecione um Agente", "agente", st.sidebar)
+    if selected_agent_id is None:
+        st.stop()
 
-    # Carregar dados do agente selecionado
-    file_path = os.path.join(AGENT_DIR, f"{selected_agent_id}.json")
-    with open(file_path, 'r', encoding='utf-8') as f:
-        dados_agente = json.load(f)
+    # Carregar só o registro do agente selecionado
+    dados_agente = indice.carregar(selected_agent_id)
+    # O embedding é indexado pelo nome do arquivo
+    arquivo_selecionado = os.path.splitext(os.path.basename(indice.arquivo(selected_agent_id)))[0]
 
     # --- EXIBIÇÃO DOS DADOS ---
     # Extrair informações
@@ -88,56 +103,18 @@ try:
     perfis de funcionários em um gráfico 2D. Pontos próximos representam funcionários com características semelhantes.
     """)
 
-    # Carregar todos os agentes para a análise
-    all_agents_data = []
-    for agent_file in agent_files:
-        fp = os.path.join(AGENT_DIR, agent_file)
-        with open(fp, 'r', encoding='utf-8') as f:
-            all_agents_data.append(json.load(f))
-
-    # Criar DataFrame com todos os agentes
-    df_all = pd.json_normalize(all_agents_data)
-
-    # Selecionar features numéricas para a PCA
-    features = [
-        'tempo_de_casa_meses',
-        'perfil_big_five.abertura_a_experiencia',
-        'perfil_big_five.conscienciosidade',
-        'perfil_big_five.extroversao',
-        'perfil_big_five.amabilidade',
-        'perfil_big_five.neuroticismo',
-        'performance.metas_atingidas_percentual',
-        'engajamento.enps_recente',
-        'engajamento.feedback_360_media'
-    ]
-    df_features = df_all[features]
-
-    # Normalizar os dados
-    from sklearn.preprocessing import StandardScaler
-    scaler = StandardScaler()
-    scaled_features = scaler.fit_transform(df_features)
-
-    # Aplicar PCA
-    from sklearn.decomposition import PCA
-    pca = PCA(n_components=2)
-    principal_components = pca.fit_transform(scaled_features)
-
-    # Criar DataFrame com os resultados da PCA
-    df_pca = pd.DataFrame(data=principal_components, columns=['PC1', 'PC2'])
-    df_pca['nome'] = df_all['nome']
-    df_pca['cargo'] = df_all['cargo']
-    df_pca['pais_origem'] = df_all['demografia.pais_origem']
-
-    # Criar gráfico com Plotly
-    import plotly.express as px
-
-    fig = px.scatter(
+    # Coordenadas em cache: só arquivos novos/alterados são relidos e projetados
+    df_pca = embedding_agentes(AGENT_DIR).atualizar()
+
+    # SVG, WebGL ou densidade agregada conforme o tamanho; o selecionado vai por cima
+    fig = grafico_dispersao(
         df_pca,
         x='PC1',
         y='PC2',
         color='cargo',
         hover_name='nome',
         hover_data={'pais_origem': True, 'cargo': True},
+        destaque=df_pca.loc[df_pca.index.intersection([arquivo_selecionado])],
         title='Visualização de Perfis de Funcionários via PCA'
     )
     fig.update_layout(
@@ -8,6 +8,7 @@ import numpy as np
 from datetime import datetime
 import anthropic
 from dotenv import load_dotenv
+from humaniq.ui import indice_busca
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -38,6 +39,9 @@ claude_client = init_claude()
 # --- Funções de Carregamento ---
 AGENT_DIR = "data/agents"
 
+# Funcionários oferecidos de cada vez no seletor (os mais relevantes da busca)
+LIMITE_COORTE = 50
+
 
 @st.cache_data
 def carregar_agentes():
@@ -247,44 +251,58 @@ def main():
     # --- Sidebar: Filtros e Configurações ---
     st.sidebar.header("🔧 Configurações")
 
-    # Filtro por departamento
-    departamentos = ['Todos'] + \
-        sorted(df_all['departamento'].unique().tolist())
-    dept_selecionado = st.sidebar.selectbox(
-        "Filtrar por departamento:", departamentos)
+    busca = indice_busca(df_all)
+    consulta = st.sidebar.text_input(
+        "🔎 Buscar funcionários:", placeholder="Nome, cargo, equipe, competência...")
 
-    if dept_selecionado != 'Todos':
-        df_filtrado = df_all[df_all['departamento'] == dept_selecionado]
-    else:
-        df_filtrado = df_all
+    # Filtros da execução anterior (guardados pelos widgets): a coorte e as
+    # contagens de cada filtro saem do índice, sem filtrar o DataFrame
+    dept_selecionado = st.session_state.get('filtro_departamento', 'Todos')
+    cargo_selecionado = st.session_state.get('filtro_cargo', 'Todos')
+    filtros = {'departamento': [] if dept_selecionado == 'Todos' else [dept_selecionado],
+               'cargo': [] if cargo_selecionado == 'Todos' else [cargo_selecionado]}
+    coorte = busca.buscar(consulta, filtros, LIMITE_COORTE)
 
-    # Filtro por cargo
-    cargos = ['Todos'] + sorted(df_filtrado['cargo'].unique().tolist())
-    cargo_selecionado = st.sidebar.selectbox("Filtrar por cargo:", cargos)
+    # Filtro por departamento
+    por_departamento = coorte['facetas']['departamento']
+    departamentos = ['Todos'] + sorted(set(por_departamento) | set(filtros['departamento']))
+    st.sidebar.selectbox(
+        "Filtrar por departamento:", departamentos, key='filtro_departamento',
+        format_func=lambda d: d if d == 'Todos' else f"{d} ({por_departamento.get(d, 0)})")
 
-    if cargo_selecionado != 'Todos':
-        df_filtrado = df_filtrado[df_filtrado['cargo'] == cargo_selecionado]
+    # Filtro por cargo
+    por_cargo = coorte['facetas']['cargo']
+    cargos = ['Todos'] + sorted(set(por_cargo) | set(filtros['cargo']))
+    st.sidebar.selectbox(
+        "Filtrar por cargo:", cargos, key='filtro_cargo',
+        format_func=lambda c: c if c == 'Todos' else f"{c} ({por_cargo.get(c, 0)})")
 
     st.sidebar.divider()
     st.sidebar.markdown("**🎯 Funcionários disponíveis:**")
-    st.sidebar.write(f"📊 Total: {len(df_filtrado)}")
+    st.sidebar.write(f"📊 Total: {coorte['total']}")
 
     # --- Seleção de Funcionários ---
     st.header("👥 Seleção de Funcionários para Comparação")
 
+    # Selecionados continuam disponíveis mesmo fora da busca atual
+    selecionados = st.session_state.get('funcionarios_comparacao', [])
     funcionarios_selecionados = st.multiselect(
         "Escolha 2 ou mais funcionários para comparar:",
-        options=df_filtrado.index.tolist(),
-        format_func=lambda x: f"{df_filtrado.loc[x, 'nome']} ({df_filtrado.loc[x, 'cargo']})",
+        options=list(dict.fromkeys([*selecionados, *coorte['ids']])),
+        format_func=busca.rotulo,
+        key='funcionarios_comparacao',
         help="Selecione pelo menos 2 funcionários para ver análise comparativa"
     )
+    if coorte['total'] > len(coorte['ids']):
+        st.caption(f"Mostrando os {len(coorte['ids'])} mais relevantes de {coorte['total']} — "
+                   "use a busca e os filtros da barra lateral para refinar.")
 
     if len(funcionarios_selecionados) < 2:
         st.info("👆 Selecione pelo menos **2 funcionários** para iniciar a comparação.")
         return
 
     # Dados dos funcionários selecionados
-    df_selected = df_filtrado.loc[funcionarios_selecionados]
+    df_selected = df_all.loc[funcionarios_selecionados]
 
     # --- Análise de Compatibilidade ---
     st.header("🧮 Análise de Compatibilidade")
@@ -10,6 +10,8 @@ import anthropic
 import matplotlib
 import matplotlib.pyplot as plt
 from dotenv import load_dotenv
+from humaniq.competencias import BaseSkills
+from humaniq.funcionario import funcionarios_de_dataframe
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -185,11 +187,36 @@ def calcular_fit_tecnico(candidato, vaga):
     return round(score_tecnico, 1), analise_detalhada
 
 
-def calcular_score_final(candidato, vaga, peso_cultural=0.4, peso_tecnico=0.6):
-    """Calcula score final combinando fit cultural e técnico"""
+def calcular_fit_tecnico_lote(base_skills, vaga):
+    """Calcula o fit técnico de todos os candidatos de uma vez (AND + popcount)"""
+    score_obrigatorias = base_skills.percentual_match(
+        vaga.get('competencias_obrigatorias', []))
+    score_desejaveis = base_skills.percentual_match(
+        vaga.get('competencias_desejaveis', []))
+    score_diferenciais = base_skills.percentual_match(
+        vaga.get('competencias_diferenciais', []))
+
+    score_tecnico = (
+        score_obrigatorias * 0.6 +
+        score_desejaveis * 0.3 +
+        score_diferenciais * 0.1
+    )
+
+    return np.round(score_tecnico, 1)
+
+
+def calcular_score_final(candidato, vaga, peso_cultural=0.4, peso_tecnico=0.6, fit_tecnico=None):
+    """Calcula score final combinando fit cultural e técnico
+
+    Se ``fit_tecnico`` vier pré-calculado (ranking em lote), o detalhamento
+    técnico é omitido (``detalhes_tecnico`` = None).
+    """
 
     fit_cultural, detalhes_cultural = calcular_fit_cultural(candidato, vaga)
-    fit_tecnico, detalhes_tecnico = calcular_fit_tecnico(candidato, vaga)
+    if fit_tecnico is None:
+        fit_tecnico, detalhes_tecnico = calcular_fit_tecnico(candidato, vaga)
+    else:
+        fit_tecnico, detalhes_tecnico = float(fit_tecnico), None
 
     # Score final ponderado
     score_final = (fit_cultural * peso_cultural) + (fit_tecnico * peso_tecnico)
@@ -368,9 +395,16 @@ def main():
     resultados_fit = []
 
     with st.spinner("🧮 Calculando fit para todos os candidatos..."):
-        for idx, candidato in df_agentes.iterrows():
+        base_skills = BaseSkills.de_listas(
+            df_agentes.index, df_agentes['competencias'])
+        fits_tecnicos = calcular_fit_tecnico_lote(
+            base_skills, vaga_selecionada)
+
+        candidatos = funcionarios_de_dataframe(df_agentes)
+        for idx, candidato, fit_tecnico in zip(df_agentes.index, candidatos, fits_tecnicos):
             analise = calcular_score_final(
-                candidato, vaga_selecionada, peso_cultural, peso_tecnico
+                candidato, vaga_selecionada, peso_cultural, peso_tecnico,
+                fit_tecnico=fit_tecnico
             )
 
             resultados_fit.append({
@@ -447,9 +481,9 @@ def main():
 
     # Dados do candidato selecionado
     candidato_dados = df_agentes.loc[candidato_selecionado_id]
-    resultado_candidato = next(
-        r for r in resultados_fit if r['id'] == candidato_selecionado_id)
-    analise_completa = resultado_candidato['analise_completa']
+    # Detalhamento completo (inclui análise técnica) só para o selecionado
+    analise_completa = calcular_score_final(
+        candidato_dados, vaga_selecionada, peso_cultural, peso_tecnico)
 
     # Layout em colunas
     col1, col2 = st.columns([0.6, 0.4])
@@ -654,7 +688,11 @@ def main():
                 "tecnico": peso_tecnico
             },
             "total_candidatos": len(resultados_fit),
-            "top_candidatos": resultados_fit[:10],  # Top 10
+            "top_candidatos": [  # Top 10
+                dict(r, analise_completa=calcular_score_final(
+                    df_agentes.loc[r['id']], vaga_selecionada, peso_cultural, peso_tecnico))
+                for r in resultados_fit[:10]
+            ],
             "candidato_analisado": {
                 "id": candidato_selecionado_id,
                 "dados": candidato_dados.to_dict(),
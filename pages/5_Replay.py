@@ -7,6 +7,10 @@ import plotly.graph_objects as go
 import plotly.express as px
 from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
+from humaniq.dna_sucesso import atualizar_dna, extrair_dna, gaps_para_dna
+from humaniq.performance import (COLUNA_ULTIMA_NOTA, calcular_score_performance,
+                                 extrair_ultima_nota, top_por_grupo)
+from humaniq.ui import indice_busca, selecionar_funcionario
 
 st.set_page_config(page_title="Agent REPLAY", page_icon="🎯", layout="wide")
 
@@ -17,6 +21,7 @@ st.markdown("""
 O Agent REPLAY usa IA para mapear top performers e descobrir o "DNA do sucesso" que pode ser replicado em outros funcionários.
 """)
 
+
 # --- Funções de Carregamento ---
 
 
@@ -35,110 +40,53 @@ def carregar_agentes():
         with open(os.path.join(AGENT_DIR, f), 'r', encoding='utf-8') as file:
             all_agents_data.append(json.load(file))
 
-    df = pd.json_normalize(all_agents_data)
-    return df.set_index('id_funcionario')
-
-
-def calcular_score_performance(row):
-    """Calcula score de performance baseado em múltiplos fatores"""
-    # Última avaliação (peso 30%)
-    ultima_avaliacao = row.get('performance.avaliacoes_desempenho', [{}])
-    if ultima_avaliacao:
-        nota_avaliacao = ultima_avaliacao[-1].get(
-            'nota', 5) if isinstance(ultima_avaliacao, list) else 5
-    else:
-        nota_avaliacao = 5
-
-    # Metas atingidas (peso 25%)
-    metas = row.get('performance.metas_atingidas_percentual', 75) / 100
-
-    # Engajamento (peso 20%)
-    enps = row.get('engajamento.enps_recente', 5) / 10
-    feedback_360 = row.get('engajamento.feedback_360_media', 3) / 5
-
-    # Baixo risco burnout (peso 15%)
-    risco_burnout = 1 - (row.get('kpis_ia.risco_burnout', 5) / 10)
+    df = pd.json_normalize(all_agents_data).set_index('id_funcionario')
 
-    # Tempo de casa (peso 10% - estabilidade)
-    tempo_casa = min(row.get('tempo_de_casa_meses', 12) /
-                     36, 1)  # Normalizado para 3 anos
+    # Última nota e score calculados uma vez, como colunas
+    df[COLUNA_ULTIMA_NOTA] = extrair_ultima_nota(df)
+    df['score_performance'] = calcular_score_performance(df)
+    return df
 
-    score = (
-        (nota_avaliacao / 10) * 0.30 +
-        metas * 0.25 +
-        enps * 0.15 +
-        (feedback_360 / 5) * 0.05 +
-        risco_burnout * 0.15 +
-        tempo_casa * 0.10
-    ) * 100
 
-    return round(score, 2)
+@st.cache_data
+def top_performers_por_cargo(df, top_n):
+    """Scores dos top performers de cada cargo (índice cargo, id_funcionario)"""
+    return top_por_grupo(df['score_performance'], df['cargo'], top_n)
 
 
 def identificar_funcionarios_modelo(df, cargo_filtro=None, top_n=3):
     """Identifica top performers por cargo"""
     if cargo_filtro:
-        df_filtrado = df[df['cargo'] == cargo_filtro].copy()
+        top_por_cargo = top_performers_por_cargo(df, top_n)
+        if cargo_filtro not in top_por_cargo.index.get_level_values(0):
+            return df.iloc[:0]
+        ids = top_por_cargo.loc[cargo_filtro].index
     else:
-        df_filtrado = df.copy()
+        ids = df['score_performance'].nlargest(top_n).index
 
-    if df_filtrado.empty:
-        return df_filtrado
+    return df.loc[ids]
 
-    # Calcular score de performance
-    df_filtrado['score_performance'] = df_filtrado.apply(
-        calcular_score_performance, axis=1)
 
-    # Ordenar por performance
-    df_top = df_filtrado.nlargest(top_n, 'score_performance')
+def extrair_dna_sucesso(df_top_performers):
+    """Extrai padrões comportamentais dos top performers"""
+    return extrair_dna(df_top_performers)
 
-    return df_top
 
+@st.cache_data
+def carregar_dna_sucesso(df, top_n):
+    """DNA de todos os cargos e departamentos (persistido, recalcula só grupos alterados)"""
+    return atualizar_dna(df, top_n)
 
-def extrair_dna_sucesso(df_top_performers):
-    """Extrai padrões comportamentais dos top performers"""
-    if df_top_performers.empty:
-        return {}
 
-    # Perfil Big Five médio
-    big_five_cols = [
-        'perfil_big_five.abertura_a_experiencia',
-        'perfil_big_five.conscienciosidade',
-        'perfil_big_five.extroversao',
-        'perfil_big_five.amabilidade',
-        'perfil_big_five.neuroticismo'
-    ]
-
-    perfil_medio = df_top_performers[big_five_cols].mean()
-
-    # Competências mais comuns
-    todas_competencias = []
-    for competencias in df_top_performers['competencias']:
-        if isinstance(competencias, list):
-            todas_competencias.extend(competencias)
-
-    from collections import Counter
-    competencias_comuns = Counter(todas_competencias).most_common(5)
-
-    # Características de performance
-    performance_stats = {
-        'avaliacao_media': df_top_performers.apply(
-            lambda x: x.get('performance.avaliacoes_desempenho', [
-                            {}])[-1].get('nota', 5)
-            if isinstance(x.get('performance.avaliacoes_desempenho'), list) else 5, axis=1
-        ).mean(),
-        'metas_media': df_top_performers['performance.metas_atingidas_percentual'].mean(),
-        'enps_medio': df_top_performers['engajamento.enps_recente'].mean(),
-        'feedback_360_medio': df_top_performers['engajamento.feedback_360_media'].mean(),
-        'risco_burnout_medio': df_top_performers['kpis_ia.risco_burnout'].mean()
-    }
+@st.cache_data
+def calcular_gaps_dna(df, top_n, coluna_grupo):
+    """Gaps de toda a força de trabalho contra o DNA do próprio grupo"""
+    return gaps_para_dna(df, carregar_dna_sucesso(df, top_n)[coluna_grupo], coluna_grupo)
 
-    return {
-        'perfil_big_five': perfil_medio.to_dict(),
-        'competencias_chave': competencias_comuns,
-        'performance_stats': performance_stats,
-        'tamanho_amostra': len(df_top_performers)
-    }
+
+def formatar_estatistica(valor, sufixo=''):
+    """Estatística do DNA para exibição (None: sem dados no grupo)"""
+    return 'N/A' if valor is None else f"{valor:.1f}{sufixo}"
 
 
 def comparar_com_dna(funcionario, dna_sucesso):
@@ -149,6 +97,9 @@ def comparar_com_dna(funcionario, dna_sucesso):
     # Comparação Big Five
     gaps_big_five = {}
     for trait, valor_ideal in dna_sucesso['perfil_big_five'].items():
+        # Trait sem dados no grupo (média NaN, persistida como None)
+        if valor_ideal is None:
+            continue
         valor_atual = funcionario.get(trait, 5)
         gap = valor_ideal - valor_atual
         gaps_big_five[trait] = {
@@ -226,7 +177,9 @@ st.dataframe(
 # --- DNA do Sucesso ---
 st.header("🧬 DNA do Sucesso")
 
-dna = extrair_dna_sucesso(df_top)
+# DNA do cargo pré-calculado; "Todos" usa os top performers gerais
+dna = (carregar_dna_sucesso(df_agentes, top_n)['cargo'].get(cargo_filtro, {})
+       if cargo_filtro else extrair_dna_sucesso(df_top))
 
 if dna:
     col1, col2 = st.columns(2)
@@ -276,21 +229,43 @@ if dna:
 
         col_a, col_b = st.columns(2)
         with col_a:
-            st.metric("Avaliação Média", f"{stats['avaliacao_media']:.1f}/10")
-            st.metric("Metas Atingidas", f"{stats['metas_media']:.1f}%")
+            st.metric("Avaliação Média", formatar_estatistica(stats['avaliacao_media'], '/10'))
+            st.metric("Metas Atingidas", formatar_estatistica(stats['metas_media'], '%'))
         with col_b:
-            st.metric("eNPS Médio", f"{stats['enps_medio']:.1f}/10")
+            st.metric("eNPS Médio", formatar_estatistica(stats['enps_medio'], '/10'))
             st.metric("Risco Burnout",
-                      f"{stats['risco_burnout_medio']:.1f}/10")
+                      formatar_estatistica(stats['risco_burnout_medio'], '/10'))
+
+# --- Distância do DNA de Sucesso ---
+st.header("📏 Distância do DNA de Sucesso")
+
+referencia_dna = st.radio("Comparar cada funcionário com o DNA do seu:",
+                          options=['cargo', 'departamento'],
+                          format_func=str.title, horizontal=True)
+df_gaps_dna = calcular_gaps_dna(df_agentes, top_n, referencia_dna)
+
+mais_distantes = df_gaps_dna.nlargest(10, 'distancia_big_five')
+df_distantes = df_agentes.loc[mais_distantes.index, ['nome', 'cargo', 'departamento']].join(
+    mais_distantes[['distancia_big_five', 'competencias_faltam', 'cobertura_competencias']])
+
+st.dataframe(
+    df_distantes.style.format({'distancia_big_five': '{:.2f}',
+                               'competencias_faltam': '{:.0f}',
+                               'cobertura_competencias': '{:.0f}%'})
+    .background_gradient(subset=['distancia_big_five'], cmap='Reds'),
+    use_container_width=True
+)
+st.caption("Distância euclidiana entre o Big Five do funcionário e o perfil médio "
+           f"dos top {top_n} performers do {referencia_dna}.")
 
 # --- Análise de Gap Individual ---
 st.header("🎯 Análise de Gap Individual")
 
-funcionario_selecionado = st.selectbox(
-    "👤 Selecione um funcionário para análise:",
-    options=df_agentes.index.tolist(),
-    format_func=lambda x: f"{df_agentes.loc[x, 'nome']} ({df_agentes.loc[x, 'cargo']})"
-)
+funcionario_selecionado = selecionar_funcionario(
+    indice_busca(df_agentes), "👤 Selecione um funcionário para análise:", "gap_funcionario")
+if funcionario_selecionado is None:
+    # Busca sem resultados: a seção segue com o primeiro funcionário
+    funcionario_selecionado = df_agentes.index[0]
 
 funcionario_data = df_agentes.loc[funcionario_selecionado].to_dict()
 gaps = comparar_com_dna(funcionario_data, dna)
@@ -301,7 +276,8 @@ if gaps:
     with col1:
         st.subheader("🎭 Gaps de Personalidade")
 
-        gaps_df = pd.DataFrame.from_dict(gaps['gaps_big_five'], orient='index')
+        gaps_df = pd.DataFrame.from_dict(gaps['gaps_big_five'], orient='index',
+                                         columns=['atual', 'ideal', 'gap', 'status'])
 
         # Gráfico de comparação
         fig_gap = go.Figure()
@@ -362,7 +338,7 @@ if gaps:
                 st.write(f"• {comp}")
 
         # Score atual do funcionário
-        score_atual = calcular_score_performance(funcionario_data)
+        score_atual = df_agentes.at[funcionario_selecionado, 'score_performance']
         st.metric("📊 Score Performance Atual", f"{score_atual:.1f}%")
 
         # Recomendações
@@ -403,8 +379,7 @@ with col1:
     )
 
 with col2:
-    score_medio_geral = df_agentes.apply(
-        calcular_score_performance, axis=1).mean()
+    score_medio_geral = df_agentes['score_performance'].mean()
     score_medio_top = df_top['score_performance'].mean()
     st.metric(
         "Score Médio Top vs Geral",
@@ -414,10 +389,8 @@ with col2:
 
 with col3:
     # Calcular potencial de melhoria
-    funcionarios_com_potencial = len(df_agentes[
-        df_agentes.apply(calcular_score_performance,
-                         axis=1) < score_medio_top - 10
-    ])
+    funcionarios_com_potencial = int(
+        (df_agentes['score_performance'] < score_medio_top - 10).sum())
     st.metric(
         "Funcionários com Potencial",
         funcionarios_com_potencial,
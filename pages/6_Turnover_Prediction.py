@@ -2,11 +2,14 @@ import streamlit as st
 import pandas as pd
 import json
 import os
-import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 import warnings
+from humaniq.funcionario import funcionarios_de_dataframe
+from humaniq.historico_kpi import (COLUNAS_TURNOVER, SERIE_TURNOVER, registrar_snapshot,
+                                   serie_kpi, snapshot_pendente, tendencia)
+from humaniq.turnover import calcular_risco_turnover, indicadores_turnover_agentes
 warnings.filterwarnings('ignore')
 
 st.set_page_config(page_title="Predictive Turnover",
@@ -41,86 +44,6 @@ def carregar_agentes():
     return df.set_index('id_funcionario')
 
 
-def calcular_risco_turnover(funcionario):
-    """
-    Calcula score de risco de turnover (0-100) baseado em múltiplos fatores
-    Score alto = maior risco de saída
-    """
-    risk_score = 0
-    fatores_risco = []
-
-    # 1. ENGAJAMENTO (peso 25%)
-    enps = funcionario.get('engajamento.enps_recente', 5)
-    if enps <= 3:
-        risk_score += 25
-        fatores_risco.append("eNPS muito baixo")
-    elif enps <= 5:
-        risk_score += 15
-        fatores_risco.append("eNPS baixo")
-    elif enps <= 7:
-        risk_score += 5
-
-    # 2. PERFORMANCE (peso 20%)
-    ultima_avaliacao = funcionario.get(
-        'performance.avaliacoes_desempenho', [{}])
-    if isinstance(ultima_avaliacao, list) and ultima_avaliacao:
-        nota = ultima_avaliacao[-1].get('nota', 7)
-    else:
-        nota = 7
-
-    metas = funcionario.get('performance.metas_atingidas_percentual', 85)
-
-    if nota <= 6 or metas <= 70:
-        risk_score += 20
-        fatores_risco.append("Performance abaixo da média")
-    elif nota <= 7 or metas <= 80:
-        risk_score += 10
-        fatores_risco.append("Performance em declínio")
-
-    # 3. BURNOUT E STRESS (peso 20%)
-    burnout_risk = funcionario.get('kpis_ia.risco_burnout', 5)
-    if burnout_risk >= 8:
-        risk_score += 20
-        fatores_risco.append("Alto risco de burnout")
-    elif burnout_risk >= 6:
-        risk_score += 12
-        fatores_risco.append("Sinais de stress")
-    elif burnout_risk >= 4:
-        risk_score += 5
-
-    # 4. TEMPO DE CASA (peso 15%)
-    tempo_casa = funcionario.get('tempo_de_casa_meses', 12)
-    if tempo_casa <= 6:
-        risk_score += 15
-        fatores_risco.append("Funcionário muito novo")
-    elif tempo_casa >= 48:
-        risk_score += 10
-        fatores_risco.append("Funcionário muito experiente")
-
-    # 5. SENTIMENTO GERAL (peso 10%)
-    sentimento = funcionario.get(
-        'engajamento.comentarios_sentimento', 'neutro')
-    if sentimento == 'negativo':
-        risk_score += 10
-        fatores_risco.append("Sentimento negativo")
-    elif sentimento == 'neutro':
-        risk_score += 3
-
-    # 6. FEEDBACK 360 (peso 10%)
-    feedback_360 = funcionario.get('engajamento.feedback_360_media', 3.5)
-    if feedback_360 <= 2.5:
-        risk_score += 10
-        fatores_risco.append("Feedback 360 muito baixo")
-    elif feedback_360 <= 3.0:
-        risk_score += 5
-        fatores_risco.append("Feedback 360 baixo")
-
-    # Capear o score em 100
-    risk_score = min(risk_score, 100)
-
-    return risk_score, fatores_risco
-
-
 def classificar_risco(score):
     """Classifica o nível de risco baseado no score"""
     if score >= 70:
@@ -213,13 +136,13 @@ if df_agentes.empty:
 
 # Calcular riscos para todos os funcionários
 resultados = []
-for idx, funcionario in df_agentes.iterrows():
+for funcionario in funcionarios_de_dataframe(df_agentes):
     score, fatores = calcular_risco_turnover(funcionario)
     nivel, cor = classificar_risco(score)
     timeline = estimar_timeline_saida(score)
 
     resultados.append({
-        'id': idx,
+        'id': funcionario.id,
         'nome': funcionario['nome'],
         'cargo': funcionario['cargo'],
         'departamento': funcionario['departamento'],
@@ -232,6 +155,14 @@ for idx, funcionario in df_agentes.iterrows():
 
 df_riscos = pd.DataFrame(resultados)
 
+# Snapshot do dia no histórico de risco, se o job snapshot_kpis.py ainda não gravou.
+# Os indicadores vêm dos arquivos atuais, não de carregar_agentes (cache sem TTL)
+historico_turnover = serie_kpi(SERIE_TURNOVER, COLUNAS_TURNOVER)
+if snapshot_pendente(historico_turnover):
+    indicadores_atuais = indicadores_turnover_agentes()
+    if indicadores_atuais is not None:
+        registrar_snapshot(historico_turnover, indicadores_atuais)
+
 # --- Dashboard de Alertas ---
 st.header("🚨 Dashboard de Alertas")
 
@@ -438,18 +369,20 @@ st.dataframe(
     use_container_width=True
 )
 
-# --- Tendências (Simulado) ---
+# --- Tendências ---
 st.header("📈 Tendências de Risco")
 
-# Simular dados históricos
-dates = pd.date_range(start='2024-01-01', end='2025-01-01', freq='M')
-tendencia = np.random.normal(35, 5, len(dates))  # Score médio variando
-tendencia = np.cumsum(np.random.normal(0, 2, len(dates))) + 35
+# Último ano do histórico de snapshots, reamostrado para poucos pontos
+historico = tendencia(historico_turnover,
+                      inicio=pd.Timestamp.now().normalize() - pd.DateOffset(years=1))
+if len(historico) < 2:
+    st.info("📅 Histórico ainda curto: um snapshot do score médio é gravado por dia "
+            "pelo job snapshot_kpis.py (ou quando a página é aberta).")
 
 fig_tendencia = go.Figure()
 fig_tendencia.add_trace(go.Scatter(
-    x=dates,
-    y=tendencia,
+    x=historico.index,
+    y=historico['score_medio'],
     mode='lines+markers',
     name='Score Médio de Risco',
     line=dict(color='red', width=3)
@@ -1,12 +1,14 @@
 import streamlit as st
 import pandas as pd
-import json
-import os
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 import warnings
+from humaniq.agregados_kpi import AgregadosKPI
+from humaniq.graficos import grafico_classes
+from humaniq.historico_kpi import (COLUNAS_EXECUTIVO, SERIE_EXECUTIVO, registrar_snapshot,
+                                   serie_kpi, tendencia)
 warnings.filterwarnings('ignore')
 
 st.set_page_config(page_title="Executive Dashboard",
@@ -19,64 +21,44 @@ st.markdown("""
 Visão consolidada do capital humano com foco em ROI, riscos e oportunidades de otimização.
 """)
 
-# --- Funções Auxiliares ---
+# Janelas do gráfico de tendências (meses; None = histórico inteiro)
+PERIODOS_TENDENCIA = {'12 meses': 12, '3 anos': 36, 'Todo o histórico': None}
 
+# --- Funções Auxiliares ---
 
-@st.cache_data
-def carregar_agentes():
-    AGENT_DIR = "data/agents"
-    if not os.path.exists(AGENT_DIR):
-        return pd.DataFrame()
 
-    agent_files = [f for f in os.listdir(AGENT_DIR) if f.endswith('.json')]
-    if not agent_files:
-        return pd.DataFrame()
+@st.cache_resource
+def agregados_kpi():
+    """KPIs por departamento/cargo mantidos incrementalmente entre reruns"""
+    return AgregadosKPI()
 
-    all_agents_data = []
-    for f in agent_files:
-        with open(os.path.join(AGENT_DIR, f), 'r', encoding='utf-8') as file:
-            all_agents_data.append(json.load(file))
 
-    df = pd.json_normalize(all_agents_data)
-    return df.set_index('id_funcionario')
+def calcular_roi(performance_media, engajamento_medio):
+    """ROI simulado (%) a partir de performance e engajamento médios (escala 0-10)"""
+    return (performance_media / 10 * 0.6 + engajamento_medio / 10 * 0.4) * 847  # Base: 847% ROI
 
 
-def calcular_metricas_principais(df):
-    """Calcula as métricas principais do dashboard"""
-    total_funcionarios = len(df)
+def calcular_metricas_principais(geral):
+    """Calcula as métricas principais do dashboard a partir dos agregados gerais"""
+    total_funcionarios = int(geral['total'])
 
     # ROI simulado baseado em performance e engajamento
-    performance_media = df.apply(lambda x:
-                                 x.get('performance.avaliacoes_desempenho', [
-                                       {}])[-1].get('nota', 7)
-                                 if isinstance(x.get('performance.avaliacoes_desempenho'), list) else 7, axis=1
-                                 ).mean()
-
-    engajamento_medio = df['engajamento.enps_recente'].mean()
-    roi_estimado = (performance_media / 10 * 0.6 +
-                    engajamento_medio / 10 * 0.4) * 847  # Base: 847% ROI
+    performance_media = geral['performance']
+    engajamento_medio = geral['engajamento']
+    roi_estimado = calcular_roi(performance_media, engajamento_medio)
 
     # Redução de turnover simulada
-    funcionarios_risco = len(
-        df[df.apply(calcular_risco_turnover_exec, axis=1) >= 50])
-    reducao_turnover = max(
-        0, 70 - (funcionarios_risco / total_funcionarios * 100))
+    funcionarios_risco = int(geral['em_risco'])
+    reducao_turnover = max(0, 70 - geral['percentual_risco'])
 
     # Fit cultural médio
-    big_five_cols = [
-        'perfil_big_five.abertura_a_experiencia',
-        'perfil_big_five.conscienciosidade',
-        'perfil_big_five.extroversao',
-        'perfil_big_five.amabilidade',
-        'perfil_big_five.neuroticismo'
-    ]
-    fit_cultural = (df[big_five_cols].mean().mean() / 10 * 100)
+    fit_cultural = geral['fit_cultural']
 
     # Payback simulado
     payback_meses = max(2, 6 - (roi_estimado / 847 * 4))
 
     # Aumento de produtividade
-    metas_media = df['performance.metas_atingidas_percentual'].mean()
+    metas_media = geral['metas']
     produtividade = min(35, metas_media / 100 * 40)
 
     return {
@@ -90,40 +72,6 @@ def calcular_metricas_principais(df):
     }
 
 
-def calcular_risco_turnover_exec(funcionario):
-    """Versão simplificada do cálculo de risco para o executive dashboard"""
-    risk_score = 0
-
-    # Engajamento
-    enps = funcionario.get('engajamento.enps_recente', 5)
-    if enps <= 3:
-        risk_score += 25
-    elif enps <= 5:
-        risk_score += 15
-
-    # Performance
-    metas = funcionario.get('performance.metas_atingidas_percentual', 85)
-    if metas <= 70:
-        risk_score += 20
-    elif metas <= 80:
-        risk_score += 10
-
-    # Burnout
-    burnout_risk = funcionario.get('kpis_ia.risco_burnout', 5)
-    if burnout_risk >= 8:
-        risk_score += 20
-    elif burnout_risk >= 6:
-        risk_score += 12
-
-    # Sentimento
-    sentimento = funcionario.get(
-        'engajamento.comentarios_sentimento', 'neutro')
-    if sentimento == 'negativo':
-        risk_score += 10
-
-    return min(risk_score, 100)
-
-
 def calcular_fit_vaga_simples(funcionario, vaga_perfil):
     """Calcula fit simplificado entre funcionário e perfil ideal"""
     perfil_func = np.array([
@@ -141,15 +89,22 @@ def calcular_fit_vaga_simples(funcionario, vaga_perfil):
 
 
 # --- Interface Principal ---
-df_agentes = carregar_agentes()
+# Só arquivos de agentes novos/alterados são relidos; o resto vem dos agregados
+agregados = agregados_kpi()
+agregados.atualizar()
 
-if df_agentes.empty:
+if not agregados.total():
     st.warning(
         "⚠️ Nenhum agente encontrado. Execute o script generate_agents.py primeiro.")
     st.stop()
 
 # Calcular métricas principais
-metricas = calcular_metricas_principais(df_agentes)
+geral = agregados.metricas().iloc[0]
+metricas = calcular_metricas_principais(geral)
+
+# Snapshot do dia no histórico, se o job snapshot_kpis.py ainda não gravou
+historico_kpi = serie_kpi(SERIE_EXECUTIVO, COLUNAS_EXECUTIVO)
+registrar_snapshot(historico_kpi, geral)
 
 # --- SEÇÃO 1: KPIs PRINCIPAIS ---
 st.header("📊 KPIs Principais")
@@ -256,46 +211,15 @@ for i, alerta in enumerate(alertas):
 # --- SEÇÃO 3: ANÁLISE POR DEPARTAMENTO ---
 st.header("🏢 Performance por Departamento")
 
-# Calcular métricas por departamento
-dept_metrics = []
-for dept in df_agentes['departamento'].unique():
-    dept_df = df_agentes[df_agentes['departamento'] == dept]
-
-    # Performance média
-    perf_media = dept_df.apply(lambda x:
-                               x.get('performance.avaliacoes_desempenho',
-                                     [{}])[-1].get('nota', 7)
-                               if isinstance(x.get('performance.avaliacoes_desempenho'), list) else 7, axis=1
-                               ).mean()
-
-    # Engajamento médio
-    eng_medio = dept_df['engajamento.enps_recente'].mean()
-
-    # Funcionários em risco
-    em_risco = len(dept_df[dept_df.apply(
-        calcular_risco_turnover_exec, axis=1) >= 50])
-
-    # Fit cultural
-    big_five_cols = [
-        'perfil_big_five.abertura_a_experiencia',
-        'perfil_big_five.conscienciosidade',
-        'perfil_big_five.extroversao',
-        'perfil_big_five.amabilidade',
-        'perfil_big_five.neuroticismo'
-    ]
-    fit_cultural_dept = (dept_df[big_five_cols].mean().mean() / 10 * 100)
-
-    dept_metrics.append({
-        'Departamento': dept,
-        'Total': len(dept_df),
-        'Performance': perf_media,
-        'Engajamento': eng_medio,
-        'Em Risco': em_risco,
-        '% Risco': em_risco / len(dept_df) * 100,
-        'Fit Cultural': fit_cultural_dept
-    })
-
-df_dept = pd.DataFrame(dept_metrics)
+# Métricas por departamento direto dos agregados materializados
+df_dept = agregados.metricas('departamento').rename_axis('Departamento').reset_index().rename(columns={
+    'total': 'Total',
+    'performance': 'Performance',
+    'engajamento': 'Engajamento',
+    'em_risco': 'Em Risco',
+    'percentual_risco': '% Risco',
+    'fit_cultural': 'Fit Cultural'
+})[['Departamento', 'Total', 'Performance', 'Engajamento', 'Em Risco', '% Risco', 'Fit Cultural']]
 
 # Gráfico de performance por departamento
 fig_dept = px.scatter(
@@ -339,30 +263,8 @@ col1, col2 = st.columns(2)
 with col1:
     st.subheader("🏆 Top Performers por Cargo")
 
-    # Identificar top performers
-    top_performers = []
-    for cargo in df_agentes['cargo'].unique():
-        cargo_df = df_agentes[df_agentes['cargo'] == cargo]
-        if len(cargo_df) > 0:
-            # Score baseado em performance e engajamento
-            cargo_df_scored = cargo_df.copy()
-            cargo_df_scored['score'] = (
-                cargo_df.apply(lambda x:
-                               x.get('performance.avaliacoes_desempenho',
-                                     [{}])[-1].get('nota', 7)
-                               if isinstance(x.get('performance.avaliacoes_desempenho'), list) else 7, axis=1
-                               ) * 0.6 +
-                cargo_df['engajamento.enps_recente'] * 0.4
-            )
-            top_performer = cargo_df_scored.nlargest(1, 'score')
-            if not top_performer.empty:
-                top_performers.append({
-                    'cargo': cargo,
-                    'nome': top_performer.iloc[0]['nome'],
-                    'score': top_performer.iloc[0]['score']
-                })
-
-    top_df = pd.DataFrame(top_performers).sort_values('score', ascending=False)
+    # Melhor de cada cargo mantido nos agregados (nota * 0.6 + eNPS * 0.4)
+    top_df = agregados.top_performers()
 
     for _, row in top_df.head(5).iterrows():
         st.metric(
@@ -374,27 +276,18 @@ with col1:
 with col2:
     st.subheader("📊 Distribuição de Fit Cultural")
 
-    # Calcular fit cultural para todos
-    big_five_cols = [
-        'perfil_big_five.abertura_a_experiencia',
-        'perfil_big_five.conscienciosidade',
-        'perfil_big_five.extroversao',
-        'perfil_big_five.amabilidade',
-        'perfil_big_five.neuroticismo'
-    ]
-
-    fits_culturais = (df_agentes[big_five_cols].mean(axis=1) / 10 * 100)
-
-    fig_hist = px.histogram(
-        x=fits_culturais,
-        nbins=20,
+    # Classes de fit já agregadas: o navegador recebe 20 barras, não N valores
+    contagens_fit, bordas_fit = agregados.histograma_fit()
+    fit_medio = agregados.fit_medio()
+    fig_hist = grafico_classes(
+        contagens_fit,
+        bordas_fit,
         title="Distribuição de Fit Cultural",
-        labels={'x': 'Fit Cultural (%)', 'y': 'Número de Funcionários'},
-        color_discrete_sequence=['#1f77b4']
+        rotulo_x='Fit Cultural (%)'
     )
 
-    fig_hist.add_vline(x=fits_culturais.mean(), line_dash="dash", line_color="red",
-                       annotation_text=f"Média: {fits_culturais.mean():.1f}%")
+    fig_hist.add_vline(x=fit_medio, line_dash="dash", line_color="red",
+                       annotation_text=f"Média: {fit_medio:.1f}%")
 
     st.plotly_chart(fig_hist, use_container_width=True)
 
@@ -405,7 +298,7 @@ recomendacoes = []
 
 # Análise automática e geração de recomendações
 # Mais de 15% em risco
-if metricas['funcionarios_risco'] > len(df_agentes) * 0.15:
+if metricas['funcionarios_risco'] > metricas['total_funcionarios'] * 0.15:
     recomendacoes.append({
         'prioridade': 'ALTA',
         'categoria': 'Retenção',
@@ -469,21 +362,23 @@ for i, rec in enumerate(recomendacoes):
 # --- SEÇÃO 6: TENDÊNCIAS E PROJEÇÕES ---
 st.header("📈 Tendências e Projeções")
 
-# Simular dados históricos dos últimos 12 meses
-dates = pd.date_range(start='2024-02-01', end='2025-01-01', freq='M')
-np.random.seed(42)  # Para resultados consistentes
+periodo_tendencia = st.radio("Período:", list(PERIODOS_TENDENCIA), horizontal=True)
+meses = PERIODOS_TENDENCIA[periodo_tendencia]
+inicio = pd.Timestamp.now().normalize() - pd.DateOffset(months=meses) if meses else None
+
+# Faixa lida do histórico de snapshots e reamostrada para poucos pontos
+historico = tendencia(historico_kpi, inicio=inicio)
+dates = historico.index
 
 # ROI histórico
-roi_historico = np.random.normal(850, 30, len(dates))
-roi_historico = np.cumsum(np.random.normal(0, 10, len(dates))) + 820
+roi_historico = calcular_roi(historico['performance'], historico['engajamento'])
 
-# Turnover histórico
-turnover_historico = np.random.normal(15, 3, len(dates))
-turnover_historico = np.abs(np.cumsum(np.random.normal(0, 1, len(dates))) + 18)
+# Turnover histórico: % de funcionários em risco alto de saída
+turnover_historico = historico['percentual_risco']
 
-# Engajamento histórico
-engajamento_historico = np.random.normal(7, 0.5, len(dates))
-engajamento_historico = np.cumsum(np.random.normal(0, 0.2, len(dates))) + 6.8
+if len(historico) < 2:
+    st.info("📅 Histórico ainda curto: um snapshot é gravado por dia. "
+            "Agende `python snapshot_kpis.py` (ex.: cron diário) para acompanhar a evolução.")
 
 fig_trends = go.Figure()
 
@@ -500,14 +395,14 @@ fig_trends.add_trace(go.Scatter(
 fig_trends.add_trace(go.Scatter(
     x=dates, y=turnover_historico,
     mode='lines+markers',
-    name='Taxa Turnover (%)',
+    name='Em Risco de Saída (%)',
     line=dict(color='red', width=2),
     yaxis='y2'
 ))
 
 # Configurar eixos
 fig_trends.update_layout(
-    title="Evolução de Métricas Chave (12 meses)",
+    title=f"Evolução de Métricas Chave ({periodo_tendencia})",
     xaxis_title="Período",
     yaxis=dict(
         title="ROI (%)",
@@ -515,7 +410,7 @@ fig_trends.update_layout(
         color="green"
     ),
     yaxis2=dict(
-        title="Taxa de Turnover (%)",
+        title="Em Risco de Saída (%)",
         side="right",
         overlaying="y",
         color="red"
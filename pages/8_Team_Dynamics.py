@@ -9,6 +9,7 @@ from itertools import combinations
 import networkx as nx
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import StandardScaler
+from humaniq.funcionario import funcionarios_de_dataframe
 
 st.set_page_config(page_title="Team Dynamics Optimizer",
                    page_icon="🔥", layout="wide")
@@ -136,14 +137,12 @@ def analisar_dinamica_equipe(df_equipe):
     compatibilidades = []
     conflitos_totais = []
 
-    for i, (idx1, pessoa1) in enumerate(df_equipe.iterrows()):
-        for j, (idx2, pessoa2) in enumerate(df_equipe.iterrows()):
-            if i < j:  # Evitar duplicatas
-                compat = calcular_compatibilidade(pessoa1, pessoa2)
-                conflitos = detectar_conflitos_potenciais(pessoa1, pessoa2)
+    for pessoa1, pessoa2 in combinations(funcionarios_de_dataframe(df_equipe), 2):
+        compat = calcular_compatibilidade(pessoa1, pessoa2)
+        conflitos = detectar_conflitos_potenciais(pessoa1, pessoa2)
 
-                compatibilidades.append(compat)
-                conflitos_totais.extend(conflitos)
+        compatibilidades.append(compat)
+        conflitos_totais.extend(conflitos)
 
     # Métricas da equipe
     compat_media = np.mean(compatibilidades) if compatibilidades else 0
@@ -209,17 +208,18 @@ def calcular_network_metrics(df_funcionarios):
     """Calcula métricas de rede social baseadas em compatibilidade"""
     G = nx.Graph()
 
+    registros = funcionarios_de_dataframe(df_funcionarios)
+
     # Adicionar nós
-    for idx, funcionario in df_funcionarios.iterrows():
-        G.add_node(idx, nome=funcionario['nome'], cargo=funcionario['cargo'])
+    for funcionario in registros:
+        G.add_node(funcionario.id, nome=funcionario.nome,
+                   cargo=funcionario.cargo)
 
     # Adicionar arestas baseadas em compatibilidade
-    for i, (idx1, pessoa1) in enumerate(df_funcionarios.iterrows()):
-        for j, (idx2, pessoa2) in enumerate(df_funcionarios.iterrows()):
-            if i < j:
-                compat = calcular_compatibilidade(pessoa1, pessoa2)
-                if compat > 70:  # Só conectar se alta compatibilidade
-                    G.add_edge(idx1, idx2, weight=compat)
+    for pessoa1, pessoa2 in combinations(registros, 2):
+        compat = calcular_compatibilidade(pessoa1, pessoa2)
+        if compat > 70:  # Só conectar se alta compatibilidade
+            G.add_edge(pessoa1.id, pessoa2.id, weight=compat)
 
     # Calcular métricas
     if len(G.edges()) > 0:
@@ -339,8 +339,9 @@ if not df_equipe_detalhe.empty:
                 (len(df_equipe_detalhe), len(df_equipe_detalhe)))
             nomes = df_equipe_detalhe['nome'].tolist()
 
-            for i, (idx1, pessoa1) in enumerate(df_equipe_detalhe.iterrows()):
-                for j, (idx2, pessoa2) in enumerate(df_equipe_detalhe.iterrows()):
+            registros_equipe = funcionarios_de_dataframe(df_equipe_detalhe)
+            for i, pessoa1 in enumerate(registros_equipe):
+                for j, pessoa2 in enumerate(registros_equipe):
                     if i != j:
                         matriz_compat[i, j] = calcular_compatibilidade(
                             pessoa1, pessoa2)
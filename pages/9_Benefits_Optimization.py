@@ -6,7 +6,12 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-import random
+from humaniq.beneficios import calcular_matriz_relevancia, otimizar_pacotes_lote
+from humaniq.eventos_vida import (probabilidade_no_horizonte, resumir_percentis,
+                                  simular_demanda, taxa_mensal)
+from humaniq.lifestyle import carregar_lifestyle
+from humaniq.marketplace import casar_trocas, listar_ofertas, matriz_posse
+from humaniq.ui import indice_busca, selecionar_funcionario
 
 st.set_page_config(page_title="Benefits Optimization",
                    page_icon="💎", layout="wide")
@@ -18,6 +23,7 @@ st.markdown("""
 Sistema que mapeia preferências individuais, prediz necessidades futuras e otimiza custos através de marketplace interno e ajustes automáticos.
 """)
 
+
 # --- Dados de Benefícios ---
 CATALOGO_BENEFICIOS = {
     'VR': {'custo_mensal': 600, 'categoria': 'Alimentação', 'flexivel': True},
@@ -37,6 +43,70 @@ CATALOGO_BENEFICIOS = {
     'Massagem_Corporativa': {'custo_mensal': 120, 'categoria': 'Bem-estar', 'flexivel': True}
 }
 
+# Máximo de itens flexíveis por categoria no pacote otimizado
+LIMITES_CATEGORIA = {'Bem-estar': 1}
+
+BENEFICIOS_FLEXIVEIS = [b for b, dados in CATALOGO_BENEFICIOS.items() if dados['flexivel']]
+BENEFICIOS_OBRIGATORIOS = [b for b, dados in CATALOGO_BENEFICIOS.items() if not dados['flexivel']]
+CUSTO_OBRIGATORIO = sum(CATALOGO_BENEFICIOS[b]['custo_mensal'] for b in BENEFICIOS_OBRIGATORIOS)
+
+# Marketplace: o benefício recebido custa no máximo 50% a mais que o cedido
+TOLERANCIA_CUSTO_TROCA = 0.5
+
+# Eventos de vida: janela em que a probabilidade estimada se aplica e mudanças
+# nos benefícios ("-" = benefício deixa de ser necessário)
+EVENTOS_VIDA = {
+    'Casamento': {
+        'timeline': '6-12 meses', 'janela_meses': 12,
+        'mudancas_beneficios': ['Plano_Saude (família)', 'Auxilio_Transporte (parceiro)']
+    },
+    'Nascimento de filho': {
+        'timeline': '1-2 anos', 'janela_meses': 24,
+        'mudancas_beneficios': ['Auxilio_Creche', 'Auxilio_Educacao', 'Day_Off_Extra']
+    },
+    'Migração para trabalho remoto': {
+        'timeline': '3-6 meses', 'janela_meses': 6,
+        'mudancas_beneficios': ['Auxilio_Internet', 'Coworking', '-Auxilio_Transporte']
+    },
+    'Necessidade de bem-estar intensivo': {
+        'timeline': '1-3 meses', 'janela_meses': 3,
+        'mudancas_beneficios': ['Auxilio_Psicologico', 'Massagem_Corporativa', 'Day_Off_Extra']
+    }
+}
+
+
+def custo_mensal_evento(mudancas):
+    """Variação do custo mensal do pacote causada pelas mudanças de um evento"""
+    total = 0
+    for mudanca in mudancas:
+        beneficio = mudanca.lstrip('-').split(' ')[0]
+        sinal = -1 if mudanca.startswith('-') else 1
+        total += sinal * CATALOGO_BENEFICIOS[beneficio]['custo_mensal']
+    return total
+
+
+CUSTOS_EVENTOS = [custo_mensal_evento(dados['mudancas_beneficios'])
+                  for dados in EVENTOS_VIDA.values()]
+
+# Regras de relevância: (condição sobre os perfis de lifestyle, benefícios, ajuste)
+REGRAS_RELEVANCIA = [
+    (lambda p: p['tem_filhos'], ['Auxilio_Creche'], 40),
+    (lambda p: ~p['tem_filhos'], ['Auxilio_Creche'], -30),
+    (lambda p: p['modalidade_trabalho'] == 'Remoto', ['Auxilio_Internet', 'Coworking'], 30),
+    (lambda p: p['modalidade_trabalho'] == 'Remoto', ['Auxilio_Transporte'], -20),
+    (lambda p: p['transporte'] == 'Transporte Público', ['Auxilio_Transporte'], 25),
+    (lambda p: p['transporte'] == 'Carro', ['Auxilio_Transporte'], -10),
+    (lambda p: p['prefere_fitness'], ['Gympass'], 20),
+    (lambda p: p['prefere_saude_mental'], ['Auxilio_Psicologico', 'Massagem_Corporativa'], 25),
+    (lambda p: p['prefere_desenvolvimento'], ['Auxilio_Educacao'], 20),
+    (lambda p: p['risco_burnout'] > 7, ['Day_Off_Extra'], 30),
+    # Ajustes por idade
+    (lambda p: p['idade'] > 40, ['Plano_Saude', 'Previdencia_Privada'], 15),
+    (lambda p: p['idade'] > 40, ['Gympass'], -5),
+    (lambda p: p['idade'] < 30, ['Auxilio_Educacao', 'Gympass'], 10),
+    (lambda p: p['idade'] < 30, ['Previdencia_Privada'], -10),
+]
+
 # --- Funções Auxiliares ---
 
 
@@ -59,217 +129,176 @@ def carregar_agentes():
     return df.set_index('id_funcionario')
 
 
-def gerar_lifestyle_profile(funcionario):
-    """Gera perfil de lifestyle baseado nos dados do funcionário"""
+@st.cache_data
+def gerar_perfis_lifestyle(df_funcionarios):
+    """Perfis de lifestyle de todos os funcionários (persistidos e reprodutíveis)"""
+    n = len(df_funcionarios)
+    base = carregar_lifestyle(df_funcionarios)
 
-    # Fatores que influenciam preferências de benefícios
-    idade_simulada = random.randint(22, 55)  # Simular idade
-    tem_filhos = random.choice([True, False])
-    modalidade_trabalho = random.choice(['Presencial', 'Híbrido', 'Remoto'])
-    transporte = random.choice(
-        ['Carro', 'Transporte Público', 'Bicicleta', 'Caminhada'])
+    def coluna(nome, padrao):
+        if nome in df_funcionarios:
+            return df_funcionarios[nome].fillna(padrao).to_numpy(dtype=float)
+        return np.full(n, float(padrao))
 
     # Estilo de vida baseado em personalidade
-    extroversao = funcionario.get('perfil_big_five.extroversao', 5)
-    conscienciosidade = funcionario.get('perfil_big_five.conscienciosidade', 5)
-    abertura = funcionario.get('perfil_big_five.abertura_a_experiencia', 5)
-    neuroticismo = funcionario.get('perfil_big_five.neuroticismo', 5)
-
-    # Preferências derivadas da personalidade
-    prefere_saude_mental = neuroticismo > 6
-    prefere_desenvolvimento = abertura > 7 and conscienciosidade > 6
-    prefere_fitness = extroversao > 6
-    prefere_flexibilidade = abertura > 7
-
-    return {
-        'idade': idade_simulada,
-        'tem_filhos': tem_filhos,
-        'modalidade_trabalho': modalidade_trabalho,
-        'transporte': transporte,
-        'prefere_saude_mental': prefere_saude_mental,
-        'prefere_desenvolvimento': prefere_desenvolvimento,
-        'prefere_fitness': prefere_fitness,
-        'prefere_flexibilidade': prefere_flexibilidade,
-        'risco_burnout': funcionario.get('kpis_ia.risco_burnout', 5)
-    }
-
+    extroversao = coluna('perfil_big_five.extroversao', 5)
+    conscienciosidade = coluna('perfil_big_five.conscienciosidade', 5)
+    abertura = coluna('perfil_big_five.abertura_a_experiencia', 5)
+    neuroticismo = coluna('perfil_big_five.neuroticismo', 5)
+
+    return pd.DataFrame({
+        # Fatores que influenciam preferências de benefícios
+        'idade': base['idade'],
+        'tem_filhos': base['tem_filhos'].astype(bool),
+        'modalidade_trabalho': base['modalidade_trabalho'],
+        'transporte': base['transporte'],
+        # Preferências derivadas da personalidade
+        'prefere_saude_mental': neuroticismo > 6,
+        'prefere_desenvolvimento': (abertura > 7) & (conscienciosidade > 6),
+        'prefere_fitness': extroversao > 6,
+        'prefere_flexibilidade': abertura > 7,
+        'risco_burnout': coluna('kpis_ia.risco_burnout', 5)
+    }, index=df_funcionarios.index)
 
-def calcular_relevancia_beneficio(funcionario, lifestyle, beneficio):
-    """Calcula relevância de um benefício para um funcionário específico"""
-    relevancia = 50  # Base
 
-    # Ajustes baseados no lifestyle
-    if beneficio == 'Auxilio_Creche' and lifestyle['tem_filhos']:
-        relevancia += 40
-    elif beneficio == 'Auxilio_Creche' and not lifestyle['tem_filhos']:
-        relevancia -= 30
+@st.cache_data
+def calcular_relevancias(perfis_lifestyle):
+    """Matriz funcionários × benefícios do catálogo (relevância 0-100)"""
+    return calcular_matriz_relevancia(
+        perfis_lifestyle, CATALOGO_BENEFICIOS, REGRAS_RELEVANCIA)
 
-    if beneficio in ['Auxilio_Internet', 'Coworking'] and lifestyle['modalidade_trabalho'] == 'Remoto':
-        relevancia += 30
-    elif beneficio == 'Auxilio_Transporte' and lifestyle['modalidade_trabalho'] == 'Remoto':
-        relevancia -= 20
 
-    if beneficio == 'Auxilio_Transporte' and lifestyle['transporte'] == 'Transporte Público':
-        relevancia += 25
-    elif beneficio == 'Auxilio_Transporte' and lifestyle['transporte'] == 'Carro':
-        relevancia -= 10
+def otimizar_pacotes(relevancia_flexiveis, budget_limite=2000):
+    """Pacote ótimo (mochila 0/1) para cada linha de relevância dos flexíveis"""
+    custos = [CATALOGO_BENEFICIOS[b]['custo_mensal'] for b in BENEFICIOS_FLEXIVEIS]
+    categorias = [CATALOGO_BENEFICIOS[b]['categoria'] for b in BENEFICIOS_FLEXIVEIS]
+    selecao, _, custo_flexivel = otimizar_pacotes_lote(
+        relevancia_flexiveis, custos, budget_limite - CUSTO_OBRIGATORIO,
+        categorias, LIMITES_CATEGORIA)
+    return selecao, custo_flexivel + CUSTO_OBRIGATORIO
 
-    if beneficio == 'Gympass' and lifestyle['prefere_fitness']:
-        relevancia += 20
 
-    if beneficio in ['Auxilio_Psicologico', 'Massagem_Corporativa'] and lifestyle['prefere_saude_mental']:
-        relevancia += 25
+def otimizar_pacote_beneficios(relevancia_funcionario, budget_limite=2000):
+    """Otimiza pacote de benefícios dentro do budget"""
+    relevancias = relevancia_funcionario[BENEFICIOS_FLEXIVEIS].to_numpy(dtype=float)
+    selecao, custos_totais = otimizar_pacotes(relevancias[None, :], budget_limite)
 
-    if beneficio == 'Auxilio_Educacao' and lifestyle['prefere_desenvolvimento']:
-        relevancia += 20
+    # Sempre incluir obrigatórios
+    pacote_otimo = [
+        {
+            'beneficio': beneficio,
+            'relevancia': 100,  # Obrigatório
+            'custo': CATALOGO_BENEFICIOS[beneficio]['custo_mensal'],
+            'categoria': CATALOGO_BENEFICIOS[beneficio]['categoria'],
+            'tipo': 'Obrigatório'
+        }
+        for beneficio in BENEFICIOS_OBRIGATORIOS
+    ]
 
-    if beneficio == 'Day_Off_Extra' and lifestyle['risco_burnout'] > 7:
-        relevancia += 30
+    for i in np.flatnonzero(selecao[0]):
+        dados = CATALOGO_BENEFICIOS[BENEFICIOS_FLEXIVEIS[i]]
+        pacote_otimo.append({
+            'beneficio': BENEFICIOS_FLEXIVEIS[i],
+            'relevancia': relevancias[i],
+            'custo': dados['custo_mensal'],
+            'roi': relevancias[i] / dados['custo_mensal'],
+            'categoria': dados['categoria'],
+            'tipo': 'Recomendado'
+        })
 
-    # Ajustes por idade
-    if lifestyle['idade'] > 40:
-        if beneficio in ['Plano_Saude', 'Previdencia_Privada']:
-            relevancia += 15
-        if beneficio == 'Gympass':
-            relevancia -= 5
+    return pacote_otimo, int(custos_totais[0])
 
-    if lifestyle['idade'] < 30:
-        if beneficio in ['Auxilio_Educacao', 'Gympass']:
-            relevancia += 10
-        if beneficio == 'Previdencia_Privada':
-            relevancia -= 10
 
-    return max(0, min(100, relevancia))
+@st.cache_data
+def calcular_taxas_life_events(perfis_lifestyle, df_funcionarios):
+    """Taxa mensal de cada evento de vida por funcionário (0 = não elegível)"""
+    def coluna(nome, padrao):
+        if nome in df_funcionarios:
+            return df_funcionarios[nome].fillna(padrao).to_numpy(dtype=float)
+        return np.full(len(df_funcionarios), float(padrao))
+
+    idade = perfis_lifestyle['idade'].to_numpy()
+    tem_filhos = perfis_lifestyle['tem_filhos'].to_numpy(dtype=bool)
+    remoto = perfis_lifestyle['modalidade_trabalho'].to_numpy() == 'Remoto'
+    burnout = perfis_lifestyle['risco_burnout'].to_numpy(dtype=float)
+    neuroticismo = coluna('perfil_big_five.neuroticismo', 5)
+    abertura = coluna('perfil_big_five.abertura_a_experiencia', 5)
+
+    # Probabilidade de ocorrer dentro da janela de cada evento
+    probabilidades = {
+        'Casamento': np.where((idade < 35) & ~tem_filhos,
+                              (15 + (10 - neuroticismo) * 2) / 100, 0.0),
+        'Nascimento de filho': np.where(idade < 40, 0.20, 0.0),
+        'Migração para trabalho remoto': np.where(~remoto & (abertura > 6), abertura / 10, 0.0),
+        'Necessidade de bem-estar intensivo': np.where(burnout > 6, burnout / 10, 0.0)
+    }
 
+    return pd.DataFrame({
+        evento: taxa_mensal(probabilidades[evento], dados['janela_meses'])
+        for evento, dados in EVENTOS_VIDA.items()
+    }, index=perfis_lifestyle.index)
 
-def otimizar_pacote_beneficios(funcionario, lifestyle, budget_limite=2000):
-    """Otimiza pacote de benefícios dentro do budget"""
-    beneficios_relevancia = []
-
-    for beneficio, dados in CATALOGO_BENEFICIOS.items():
-        if dados['flexivel']:  # Só otimizar benefícios flexíveis
-            relevancia = calcular_relevancia_beneficio(
-                funcionario, lifestyle, beneficio)
-            # ROI = relevância por custo
-            roi = relevancia / dados['custo_mensal']
-
-            beneficios_relevancia.append({
-                'beneficio': beneficio,
-                'relevancia': relevancia,
-                'custo': dados['custo_mensal'],
-                'roi': roi,
-                'categoria': dados['categoria']
-            })
-
-    # Ordenar por ROI (relevância/custo)
-    beneficios_relevancia.sort(key=lambda x: x['roi'], reverse=True)
-
-    # Seleção gulosa respeitando budget
-    pacote_otimo = []
-    custo_total = 0
 
-    # Sempre incluir obrigatórios
-    for beneficio, dados in CATALOGO_BENEFICIOS.items():
-        if not dados['flexivel']:
-            pacote_otimo.append({
-                'beneficio': beneficio,
-                'relevancia': 100,  # Obrigatório
-                'custo': dados['custo_mensal'],
-                'categoria': dados['categoria'],
-                'tipo': 'Obrigatório'
-            })
-            custo_total += dados['custo_mensal']
-
-    # Adicionar flexíveis por ROI
-    for item in beneficios_relevancia:
-        if custo_total + item['custo'] <= budget_limite:
-            item['tipo'] = 'Recomendado'
-            pacote_otimo.append(item)
-            custo_total += item['custo']
-
-    return pacote_otimo, custo_total
-
-
-def predizer_life_events(funcionario, lifestyle):
+def predizer_life_events(taxas_funcionario, horizonte_meses=12):
     """Prediz eventos de vida e mudanças futuras nas necessidades"""
     eventos = []
-
-    # Casamento (baseado em idade e perfil)
-    if lifestyle['idade'] < 35 and not lifestyle['tem_filhos']:
-        prob_casamento = 15 + \
-            (10 - funcionario.get('perfil_big_five.neuroticismo', 5)) * 2
-        if random.randint(0, 100) < prob_casamento:
-            eventos.append({
-                'evento': 'Casamento',
-                'timeline': '6-12 meses',
-                'mudancas_beneficios': ['Plano_Saude (família)', 'Auxilio_Transporte (parceiro)'],
-                'probabilidade': f"{prob_casamento:.0f}%"
-            })
-
-    # Filhos
-    if lifestyle['idade'] < 40 and random.randint(0, 100) < 20:
+    for evento, dados in EVENTOS_VIDA.items():
+        taxa = taxas_funcionario[evento]
+        if taxa <= 0:
+            continue
+        probabilidade = probabilidade_no_horizonte(taxa, horizonte_meses)
         eventos.append({
-            'evento': 'Nascimento de filho',
-            'timeline': '1-2 anos',
-            'mudancas_beneficios': ['Auxilio_Creche', 'Auxilio_Educacao', 'Day_Off_Extra'],
-            'probabilidade': '20%'
+            'evento': evento,
+            'timeline': dados['timeline'],
+            'mudancas_beneficios': dados['mudancas_beneficios'],
+            'probabilidade': f"{probabilidade * 100:.0f}%",
+            'prob_valor': float(probabilidade)
         })
 
-    # Mudança para remoto
-    abertura = funcionario.get('perfil_big_five.abertura_a_experiencia', 5)
-    if lifestyle['modalidade_trabalho'] != 'Remoto' and abertura > 6:
-        eventos.append({
-            'evento': 'Migração para trabalho remoto',
-            'timeline': '3-6 meses',
-            'mudancas_beneficios': ['Auxilio_Internet', 'Coworking', '-Auxilio_Transporte'],
-            'probabilidade': f"{abertura * 10:.0f}%"
-        })
+    return sorted(eventos, key=lambda x: x['prob_valor'], reverse=True)
 
-    # Burnout prevention
-    if lifestyle['risco_burnout'] > 6:
-        eventos.append({
-            'evento': 'Necessidade de bem-estar intensivo',
-            'timeline': '1-3 meses',
-            'mudancas_beneficios': ['Auxilio_Psicologico', 'Massagem_Corporativa', 'Day_Off_Extra'],
-            'probabilidade': f"{lifestyle['risco_burnout'] * 10:.0f}%"
-        })
 
-    return eventos
+@st.cache_data
+def projetar_demanda_life_events(taxas, horizonte_meses=12, n_trajetorias=2000):
+    """Distribuição (percentis) do custo extra de benefícios via Monte Carlo"""
+    custo_mensal, eventos = simular_demanda(
+        taxas.to_numpy(), CUSTOS_EVENTOS, horizonte_meses, n_trajetorias)
+    return resumir_percentis(custo_mensal, eventos)
 
 
-def simular_marketplace_trocas(df_funcionarios):
-    """Simula trocas no marketplace interno de benefícios"""
+@st.cache_data
+def simular_marketplace_trocas(df_funcionarios, relevancias):
+    """Casa trocas de benefícios (pares e rodas de 3) em toda a força de trabalho"""
+    ids = df_funcionarios.index.tolist()
+    atuais = (df_funcionarios['beneficios_atuais'].to_dict()
+              if 'beneficios_atuais' in df_funcionarios else None)
+    posse = matriz_posse(ids, BENEFICIOS_FLEXIVEIS, atuais)
+    custos = [CATALOGO_BENEFICIOS[b]['custo_mensal'] for b in BENEFICIOS_FLEXIVEIS]
+
+    ofertas = listar_ofertas(
+        posse, relevancias.loc[ids, BENEFICIOS_FLEXIVEIS].to_numpy(),
+        custos, TOLERANCIA_CUSTO_TROCA)
+
+    nomes = df_funcionarios['nome'].tolist()
     trocas_sugeridas = []
+    for ciclo in casar_trocas(ofertas):
+        participantes = [{
+            'id': ids[pessoa],
+            'nome': nomes[pessoa],
+            'oferece': BENEFICIOS_FLEXIVEIS[da],
+            'recebe': BENEFICIOS_FLEXIVEIS[recebe],
+            'ganho': ganho
+        } for pessoa, da, recebe, ganho in ciclo]
+
+        trocas_sugeridas.append({
+            'participantes': participantes,
+            'ganho_relevancia': sum(p['ganho'] for p in participantes),
+            'valor_realocado': sum(custos[da] for _, da, _, _ in ciclo),
+            'match_score': float(np.mean([relevancias.loc[p['id'], p['recebe']]
+                                          for p in participantes]))
+        })
 
-    for i, (id1, func1) in enumerate(df_funcionarios.sample(min(5, len(df_funcionarios))).iterrows()):
-        for j, (id2, func2) in enumerate(df_funcionarios.sample(min(5, len(df_funcionarios))).iterrows()):
-            if i >= j:
-                continue
-
-            lifestyle1 = gerar_lifestyle_profile(func1)
-            lifestyle2 = gerar_lifestyle_profile(func2)
-
-            # Simular que func1 tem VR alto mas prefere VA
-            # e func2 tem Gympass mas não usa
-
-            if random.random() < 0.3:  # 30% chance de match
-                beneficio1 = random.choice(
-                    ['VR', 'Gympass', 'Auxilio_Transporte'])
-                beneficio2 = random.choice(
-                    ['VA', 'Auxilio_Internet', 'Day_Off_Extra'])
-
-                economia_mutual = random.randint(50, 200)
-
-                trocas_sugeridas.append({
-                    'pessoa1': func1['nome'],
-                    'pessoa2': func2['nome'],
-                    'oferece1': beneficio1,
-                    'oferece2': beneficio2,
-                    'economia_mensal': economia_mutual,
-                    'match_score': random.randint(70, 95)
-                })
-
-    return sorted(trocas_sugeridas, key=lambda x: x['match_score'], reverse=True)[:3]
+    return sorted(trocas_sugeridas, key=lambda x: x['ganho_relevancia'], reverse=True)
 
 
 # --- Interface Principal ---
@@ -309,14 +338,17 @@ with col4:
 # --- Lifestyle Profiler ---
 st.header("👤 Lifestyle Profiler")
 
-funcionario_selecionado = st.selectbox(
-    "Selecione um funcionário para análise de lifestyle:",
-    options=df_agentes.index.tolist(),
-    format_func=lambda x: f"{df_agentes.loc[x, 'nome']} ({df_agentes.loc[x, 'cargo']})"
-)
+funcionario_selecionado = selecionar_funcionario(
+    indice_busca(df_agentes), "Selecione um funcionário para análise de lifestyle:", "lifestyle_funcionario")
+if funcionario_selecionado is None:
+    # Busca sem resultados: a seção segue com o primeiro funcionário
+    funcionario_selecionado = df_agentes.index[0]
+
+perfis_lifestyle = gerar_perfis_lifestyle(df_agentes)
+relevancias = calcular_relevancias(perfis_lifestyle)
 
 funcionario_data = df_agentes.loc[funcionario_selecionado].to_dict()
-lifestyle = gerar_lifestyle_profile(funcionario_data)
+lifestyle = perfis_lifestyle.loc[funcionario_selecionado].to_dict()
 
 col1, col2 = st.columns([0.6, 0.4])
 
@@ -375,7 +407,7 @@ budget_slider = st.slider(
 
 if st.button("🔮 Otimizar Pacote de Benefícios", type="primary"):
     pacote_otimo, custo_total = otimizar_pacote_beneficios(
-        funcionario_data, lifestyle, budget_slider)
+        relevancias.loc[funcionario_selecionado], budget_slider)
 
     st.success(
         f"✅ Pacote otimizado gerado! Custo total: R$ {custo_total:,.0f}")
@@ -420,10 +452,11 @@ if st.button("🔮 Otimizar Pacote de Benefícios", type="primary"):
 # --- Life Events Predictor ---
 st.header("🔮 Life Events Predictor")
 
-eventos_previstos = predizer_life_events(funcionario_data, lifestyle)
+taxas_life_events = calcular_taxas_life_events(perfis_lifestyle, df_agentes)
+eventos_previstos = predizer_life_events(taxas_life_events.loc[funcionario_selecionado])
 
 if eventos_previstos:
-    st.subheader(f"📅 Eventos Previstos para {funcionario_data['nome']}")
+    st.subheader(f"📅 Eventos Previstos para {funcionario_data['nome']} (12 meses)")
 
     for evento in eventos_previstos:
         with st.expander(f"🎯 {evento['evento']} ({evento['probabilidade']} prob.)", expanded=True):
@@ -443,31 +476,83 @@ if eventos_previstos:
 else:
     st.info("Nenhum evento significativo previsto nos próximos 12 meses.")
 
+# Projeção para toda a força de trabalho
+st.subheader("📈 Projeção de Demanda de Benefícios (Monte Carlo)")
+
+col1, col2 = st.columns(2)
+with col1:
+    horizonte_meses = st.select_slider(
+        "Horizonte (meses):", options=[12, 24, 36], value=12)
+with col2:
+    n_trajetorias = st.select_slider(
+        "Trajetórias simuladas:", options=[1000, 2000, 5000], value=2000)
+
+projecao = projetar_demanda_life_events(
+    taxas_life_events, horizonte_meses, n_trajetorias)
+p5, p50, p95 = projecao['custo_total']
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric("🟢 Custo Extra P5", f"R$ {p5:,.0f}")
+with col2:
+    st.metric("🟡 Custo Extra P50", f"R$ {p50:,.0f}")
+with col3:
+    st.metric("🔴 Custo Extra P95", f"R$ {p95:,.0f}")
+
+meses = list(range(1, horizonte_meses + 1))
+faixa_p5, faixa_p50, faixa_p95 = projecao['custo_mensal']
+fig_projecao = go.Figure([
+    go.Scatter(x=meses, y=faixa_p95, mode='lines', line=dict(width=0),
+               name='P95', showlegend=False),
+    go.Scatter(x=meses, y=faixa_p5, mode='lines', line=dict(width=0),
+               fill='tonexty', fillcolor='rgba(99, 110, 250, 0.2)', name='P5-P95'),
+    go.Scatter(x=meses, y=faixa_p50, mode='lines', name='Mediana')
+])
+fig_projecao.update_layout(
+    title=f"Custo Mensal Adicional Projetado ({n_trajetorias} trajetórias)",
+    xaxis_title="Mês", yaxis_title="R$ / mês")
+st.plotly_chart(fig_projecao, use_container_width=True)
+
+st.dataframe(pd.DataFrame({
+    'Evento': list(EVENTOS_VIDA),
+    'Custo Mensal (R$)': CUSTOS_EVENTOS,
+    'Eventos Esperados': projecao['eventos_medios'],
+    'P5': projecao['eventos'][0],
+    'P95': projecao['eventos'][2]
+}).style.format({'Eventos Esperados': '{:.1f}', 'P5': '{:.0f}', 'P95': '{:.0f}'}),
+    use_container_width=True)
+
 # --- Benefits Marketplace ---
 st.header("🏪 Benefits Marketplace")
 
 st.markdown("Sistema de troca inteligente de benefícios entre funcionários:")
 
-trocas_sugeridas = simular_marketplace_trocas(df_agentes)
+trocas_sugeridas = simular_marketplace_trocas(df_agentes, relevancias)
 
 if trocas_sugeridas:
     st.subheader("🔄 Trocas Recomendadas")
+    pessoas_envolvidas = sum(len(troca['participantes']) for troca in trocas_sugeridas)
+    st.caption(
+        f"{len(trocas_sugeridas)} trocas viáveis envolvendo {pessoas_envolvidas} funcionários "
+        f"(R$ {sum(t['valor_realocado'] for t in trocas_sugeridas):,.0f}/mês realocados)")
 
-    for i, troca in enumerate(trocas_sugeridas):
+    for i, troca in enumerate(trocas_sugeridas[:5]):
         with st.container():
             col1, col2, col3 = st.columns([0.4, 0.3, 0.3])
 
             with col1:
-                st.write(f"**{troca['pessoa1']}** ↔️ **{troca['pessoa2']}**")
-                st.write(f"Match Score: {troca['match_score']}%")
+                st.write(" → ".join(f"**{p['nome']}**" for p in troca['participantes'])
+                         + " ↩️")
+                st.write(f"Match Score: {troca['match_score']:.0f}%")
 
             with col2:
-                st.write(f"Oferece: {troca['oferece1']}")
-                st.write(f"Recebe: {troca['oferece2']}")
+                for p in troca['participantes']:
+                    st.write(f"{p['nome']}: cede {p['oferece']}, recebe {p['recebe']} "
+                             f"(+{p['ganho']:.0f})")
 
             with col3:
-                st.metric("💰 Economia Mútua",
-                          f"R$ {troca['economia_mensal']}/mês")
+                st.metric("💰 Valor Realocado",
+                          f"R$ {troca['valor_realocado']:,.0f}/mês")
                 if st.button(f"✅ Aprovar", key=f"troca_{i}"):
                     st.success("Troca aprovada! Notificações enviadas.")
 
@@ -478,20 +563,27 @@ else:
 # --- Cost Optimization Dashboard ---
 st.header("📊 Cost Optimization Dashboard")
 
-# Simular dados de otimização organizacional
-np.random.seed(42)
-departamentos = df_agentes['departamento'].unique()
+# Pacotes ótimos de toda a força de trabalho (mochila em lote)
+relevancia_flexiveis = relevancias[BENEFICIOS_FLEXIVEIS].to_numpy()
+selecao_pacotes, custo_pacotes = otimizar_pacotes(relevancia_flexiveis, budget_slider)
+
+# Satisfação ~ relevância média dos flexíveis recebidos; utilização ~ itens relevantes (>= 50)
+por_funcionario = pd.DataFrame({
+    'Departamento': df_agentes['departamento'].to_numpy(),
+    'custo_otimizado': custo_pacotes,
+    'satisfacao_atual': relevancia_flexiveis.mean(axis=1),
+    'satisfacao_projetada': np.where(
+        selecao_pacotes.any(axis=1),
+        (relevancia_flexiveis * selecao_pacotes).sum(axis=1) /
+        np.maximum(selecao_pacotes.sum(axis=1), 1),
+        0.0),
+    'utilizacao': (relevancia_flexiveis >= 50).mean(axis=1) * 100
+})
 
 dados_otimizacao = []
-for dept in departamentos:
-    dept_df = df_agentes[df_agentes['departamento'] == dept]
-
-    # Simular custos e economias
+for dept, dept_df in por_funcionario.groupby('Departamento'):
     custo_atual = len(dept_df) * custo_padrao_mensal
-    economia_potencial = custo_atual * random.uniform(0.15, 0.35)
-    satisfacao_atual = random.uniform(60, 80)
-    satisfacao_pos = satisfacao_atual + random.uniform(5, 15)
-    utilizacao = random.uniform(65, 85)
+    economia_potencial = custo_atual - dept_df['custo_otimizado'].sum()
 
     dados_otimizacao.append({
         'Departamento': dept,
@@ -499,9 +591,9 @@ for dept in departamentos:
         'Custo Atual': custo_atual,
         'Economia Potencial': economia_potencial,
         '% Economia': economia_potencial / custo_atual * 100,
-        'Satisfação Atual': satisfacao_atual,
-        'Satisfação Projetada': satisfacao_pos,
-        'Utilização %': utilizacao
+        'Satisfação Atual': dept_df['satisfacao_atual'].mean(),
+        'Satisfação Projetada': dept_df['satisfacao_projetada'].mean(),
+        'Utilização %': dept_df['utilizacao'].mean()
     })
 
 df_otimizacao = pd.DataFrame(dados_otimizacao)
@@ -535,6 +627,18 @@ fig_dept = px.bar(
 
 st.plotly_chart(fig_dept, use_container_width=True)
 
+# Relevância média por benefício e departamento
+relevancia_dept = relevancias.groupby(df_agentes['departamento']).mean()
+fig_relevancia = px.imshow(
+    relevancia_dept[BENEFICIOS_FLEXIVEIS],
+    color_continuous_scale='viridis',
+    aspect='auto',
+    title="Relevância Média dos Benefícios por Departamento",
+    labels={'x': 'Benefício', 'y': 'Departamento', 'color': 'Relevância'}
+)
+
+st.plotly_chart(fig_relevancia, use_container_width=True)
+
 # Tabela detalhada
 st.subheader("📋 Análise Detalhada por Departamento")
 st.dataframe(
@@ -0,0 +1,63 @@
+import pandas as pd
+
+from humaniq.agregados_kpi import AgregadosKPI, DIRETORIO_AGENTES
+from humaniq.historico_kpi import (COLUNAS_EXECUTIVO, COLUNAS_TURNOVER, DIRETORIO_HISTORICO_KPI,
+                                   PERIODO_PADRAO, SERIE_EXECUTIVO, SERIE_TURNOVER,
+                                   registrar_snapshot, serie_kpi)
+from humaniq.turnover import indicadores_turnover_agentes
+
+
+def registrar_kpis(diretorio_agentes=DIRETORIO_AGENTES, diretorio_historico=DIRETORIO_HISTORICO_KPI,
+                   periodo=PERIODO_PADRAO, instante=None):
+    """
+    Atualiza os agregados executivos e grava o snapshot do período das
+    séries ``executivo`` e ``turnover``, se faltar.
+    """
+    agregados = AgregadosKPI(diretorio_agentes)
+    mudancas = agregados.atualizar()
+    if not agregados.total():
+        print(f"⚠️ Nenhum agente encontrado em '{diretorio_agentes}'. Execute generate_agents.py primeiro.")
+        return False
+
+    serie = serie_kpi(SERIE_EXECUTIVO, COLUNAS_EXECUTIVO, diretorio_historico)
+    geral = agregados.metricas().iloc[0]
+    gravou = registrar_snapshot(serie, geral, instante, periodo)
+
+    print(f"🔄 Agregados atualizados ({mudancas} arquivos relidos)")
+    if gravou:
+        print(f"✅ Snapshot gravado em '{serie.diretorio}' ({serie.ultimo_tempo():%Y-%m-%d})")
+    else:
+        print(f"ℹ️ Período já registrado (último snapshot: {serie.ultimo_tempo():%Y-%m-%d})")
+    print(f"   • Funcionários: {geral['total']:.0f} | Em risco: {geral['em_risco']:.0f} "
+          f"| Engajamento: {geral['engajamento']:.1f} | Fit cultural: {geral['fit_cultural']:.1f}%")
+
+    # Indicadores da página de Turnover: o histórico não depende de visitas à página
+    turnover = indicadores_turnover_agentes(diretorio_agentes)
+    serie_turnover = serie_kpi(SERIE_TURNOVER, COLUNAS_TURNOVER, diretorio_historico)
+    gravou_turnover = registrar_snapshot(serie_turnover, turnover, instante, periodo)
+    print(f"{'✅' if gravou_turnover else 'ℹ️'} Turnover: score médio {turnover['score_medio']:.1f} "
+          f"| Críticos: {turnover['criticos']} | Alto+: {turnover['alto_mais']}")
+    return gravou or gravou_turnover
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Grava o snapshot periódico dos KPIs executivos (agendar diariamente, ex.: cron)')
+    parser.add_argument('--periodo', default=PERIODO_PADRAO,
+                        help="Período de cada snapshot: 'D' (diário, padrão) ou 'W' (semanal)")
+    parser.add_argument('--agentes', default=DIRETORIO_AGENTES,
+                        help=f"Diretório dos agentes (padrão: {DIRETORIO_AGENTES})")
+    parser.add_argument('--historico', default=DIRETORIO_HISTORICO_KPI,
+                        help=f"Diretório do histórico (padrão: {DIRETORIO_HISTORICO_KPI})")
+    parser.add_argument('--data', default=None,
+                        help='Data do snapshot (AAAA-MM-DD); padrão: hoje')
+
+    args = parser.parse_args()
+
+    print("🧠 HumaniQ AI - Snapshot de KPIs")
+    print("=" * 50)
+
+    registrar_kpis(args.agentes, args.historico, args.periodo,
+                   pd.Timestamp(args.data) if args.data else None)